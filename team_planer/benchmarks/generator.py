@@ -0,0 +1,140 @@
+import sys
+import random
+import itertools
+import argparse
+import datetime as dt
+from team_planer.core.config_manager import DEFAULT_CONFIG
+from team_planer.core.migrations import migrate
+
+BATCH = 500   # entries per transaction
+ENTRIES_PER_DAY = (2, 10)
+# Share of each input type among the generated entries
+TYPE_WEIGHTS = {"Tour": 5, "Termin": 3, "Lieferung": 2}
+
+_PLACES = ("Nord", "Süd", "Ost", "West", "Zentrum", "Hafen", "Altstadt", "Gewerbegebiet")
+_VEHICLES = ("Sprinter 1", "Sprinter 2", "Crafter", "LKW 7,5t", "Caddy")
+_WORKERS = ("Anna", "Ben", "Carla", "Deniz", "Emil", "Fatma", "Georg", "Hanna", "Ilja", "Jana")
+_CUSTOMERS = ("Müller", "Meier", "Schulz", "Becker", "Hoffmann", "Koch", "Wagner", "Schröder", "Neumann", "Krüger")
+_GOODS = ("Palette Holz", "Fliesen", "Dämmung", "Kleinteile", "Sanitär", "Fenster", "Türen")
+
+
+def settings_of(input_type: str) -> list:
+	"""Settings of an input type from the default config."""
+	return list(DEFAULT_CONFIG["input_types"][input_type][0])
+
+
+def make_entry(rng: random.Random, input_type: str) -> list[list[str]]:
+	"""
+	One entry of an input type as the input window stores it.
+
+	Args:
+		rng (Random): Source of the content.
+		input_type (str): "Tour", "Termin" or "Lieferung".
+
+	Returns:
+		list[list[str]]: The entry's text_memory.
+	"""
+	if input_type == "Tour":
+		orders = [
+			f"{rng.choice(_CUSTOMERS)}#{rng.randrange(50, 2500)}.{rng.randrange(100):02d}"
+			for _ in range(rng.randint(1, 6))
+		]
+		return [
+			["text", f"Tour {rng.choice(_PLACES)}"],
+			["text", "*Fahrzeug", rng.choice(_VEHICLES)],
+			["text", "*Monteure", *rng.sample(_WORKERS, rng.randint(1, 3))],
+			["calc#1000", "*Aufträge", *orders],
+		]
+	if input_type == "Termin":
+		return [
+			["text", f"Kunde {rng.choice(_CUSTOMERS)} {rng.choice(_PLACES)}"],
+			["text", "*Mitarbeiter", rng.choice(_WORKERS)],
+			["text", "*Zeit", f"{rng.randint(7, 17):02d}:{rng.choice((0, 15, 30, 45)):02d}"],
+		]
+	return [["text", "*Lieferung", *rng.sample(_GOODS, rng.randint(1, 3))]]
+
+
+def workdays(start: dt.date, end: dt.date):
+	"""Monday to Friday from start to end (inclusive)."""
+	day = start
+	while day <= end:
+		if day.weekday() < 5:
+			yield day
+		day += dt.timedelta(1)
+
+
+def entries(rng: random.Random, start: dt.date, end: dt.date, per_day: tuple[int, int] = ENTRIES_PER_DAY):
+	"""
+	Yields:
+		tuple: (date, text_memory, settings) of each generated entry, as
+			StorageManager.insert_entry takes them.
+	"""
+	types = list(TYPE_WEIGHTS)
+	weights = list(TYPE_WEIGHTS.values())
+	for day in workdays(start, end):
+		date = day.strftime("%d.%m.%Y")
+		for input_type in rng.choices(types, weights, k=rng.randint(*per_day)):
+			yield date, make_entry(rng, input_type), settings_of(input_type)
+
+
+def generate(storage_manager: object, years: float, end: dt.date | None = None, seed: int = 0,
+			 per_day: tuple[int, int] = ENTRIES_PER_DAY) -> int:
+	"""
+	Fill a database with realistic entries.
+
+	Entries go through StorageManager.insert_entry, so the search index,
+	report summaries and change log are built as in real use; the undo
+	journal is skipped.
+
+	Args:
+		storage_manager (StorageManager): Target storage, already migrated.
+		years (float): Number of years of workdays up to `end`.
+		end (date, optional): Last generated day, defaults to today.
+		seed (int, optional): Same seed, same data.
+		per_day (tuple[int, int], optional): Range of entries per workday.
+
+	Returns:
+		int: Number of generated entries.
+	"""
+	end = end or dt.date.today()
+	start = end - dt.timedelta(round(365.25 * years) - 1)
+	generated = entries(random.Random(seed), start, end, per_day)
+	count = 0
+	while batch := list(itertools.islice(generated, BATCH)):
+		with storage_manager.db.transaction():
+			for date, text_memory, settings in batch:
+				storage_manager.insert_entry(date, text_memory, settings, journal=False)
+		count += len(batch)
+	storage_manager.week_cache.clear()
+	return count
+
+
+def main(argv: list[str] | None = None) -> int:
+	"""
+	Command line generator, e.g.
+
+		python -m team_planer.benchmarks.generator --years 5 bench.db
+
+	Returns:
+		int: Exit code.
+	"""
+	from team_planer.core.storage_manager import StorageManager
+
+	parser = argparse.ArgumentParser(
+		prog="python -m team_planer.benchmarks.generator",
+		description="Fill a database with synthetic Tour, Termin and Lieferung entries."
+	)
+	parser.add_argument("db", help="database file, created if missing")
+	parser.add_argument("--years", type=float, default=3, help="years of workdays up to today")
+	parser.add_argument("--seed", type=int, default=0, help="random seed")
+	args = parser.parse_args(argv)
+
+	storage_manager = StorageManager(db_file=args.db, shared=False)
+	migrate(storage_manager.db)
+	count = generate(storage_manager, args.years, seed=args.seed)
+	print(f"{count} entries written to {args.db}")
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,369 @@
+import os
+import sys
+import json
+import time
+import random
+import sqlite3
+import argparse
+import platform
+import tempfile
+import subprocess
+import datetime as dt
+from PySide6.QtCore import QCoreApplication
+from team_planer.core.migrations import migrate
+from team_planer.core.storage_manager import StorageManager
+from team_planer.core.week_cache import WeekCache
+from team_planer.core.week_loader import WeekLoader
+from team_planer.core.entry_writer import EntryWriter
+from team_planer.core.reports import ReportEngine
+from team_planer.core.exporter import export
+from team_planer.benchmarks.generator import generate, make_entry, settings_of
+
+RESULT_VERSION = 1
+# Fixed, so databases generated on different days hold the same data
+END_DATE = dt.date(2025, 12, 31)
+REGRESSION_RATIO = 1.25   # slower by this factor counts as a regression
+NOISE_MS = 0.05           # smaller p50 differences are never a regression
+WEEKS_SHOWN = 2
+WRITES = 200
+SEARCHES = ("Mül", "Tour Nord", "Sprinter", "Palette Holz", "Kunde Koch", "an")
+
+
+def _percentile(samples: list[float], fraction: float) -> float:
+	ordered = sorted(samples)
+	return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summarize(samples: list[float], items: int | None = None) -> dict:
+	"""
+	Args:
+		samples (list[float]): Seconds per run.
+		items (int, optional): Items processed over all runs, for throughput.
+
+	Returns:
+		dict: runs, total_s, mean_ms, p50_ms, p95_ms, max_ms and, with
+			`items`, items_per_s.
+	"""
+	total = sum(samples)
+	result = {
+		"runs": len(samples),
+		"total_s": round(total, 6),
+		"mean_ms": round(total / len(samples) * 1000, 4),
+		"p50_ms": round(_percentile(samples, 0.5) * 1000, 4),
+		"p95_ms": round(_percentile(samples, 0.95) * 1000, 4),
+		"max_ms": round(max(samples) * 1000, 4),
+	}
+	if items is not None:
+		result["items"] = items
+		result["items_per_s"] = round(items / total, 1) if total else None
+	return result
+
+
+def _timed(function, *args) -> tuple[float, object]:
+	start = time.perf_counter()
+	result = function(*args)
+	return time.perf_counter() - start, result
+
+
+class Suite:
+	"""
+	Benchmarks of the storage hot paths against one generated database.
+
+	Read benchmarks run before the write benchmarks, which change the data.
+	Every benchmark is a bench_<name> method returning a summarize() dict.
+	"""
+
+	def __init__(self, storage_manager: StorageManager, workdir: str, seed: int = 0):
+		"""
+		Args:
+			storage_manager (StorageManager): Storage with generated data.
+			workdir (str): Folder for export files.
+			seed (int, optional): Seed of the random ranges and contents.
+		"""
+		self.storage_manager = storage_manager
+		self.workdir = workdir
+		self.rng = random.Random(seed)
+		first, last = storage_manager.db.execute(
+			"SELECT MIN(iso_date), MAX(iso_date) FROM user_inputs"
+		).fetchone()
+		self.first = dt.date.fromisoformat(first)
+		self.last = dt.date.fromisoformat(last)
+		self.entries = storage_manager.db.execute("SELECT COUNT(*) FROM user_inputs").fetchone()[0]
+		# Ids stored by bench_store, changed and deleted by the benchmarks after it
+		self.written = []
+
+	@classmethod
+	def names(cls) -> list[str]:
+		"""Benchmark names in run order."""
+		return [name[len("bench_"):] for name in cls.__dict__ if name.startswith("bench_")]
+
+	def _monday(self) -> dt.date:
+		"""A random Monday within the data."""
+		day = self.first + dt.timedelta(self.rng.randrange((self.last - self.first).days - 7))
+		return day - dt.timedelta(day.weekday())
+
+	def _day(self) -> str:
+		return (self._monday() + dt.timedelta(self.rng.randrange(5))).strftime("%d.%m.%Y")
+
+	def bench_range_week(self, runs: int = 100) -> dict:
+		"""One displayed week read with iter_entries, without the cache."""
+		samples, items = [], 0
+		for _ in range(runs):
+			monday = self._monday()
+			seconds, entries = _timed(lambda: list(self.storage_manager.iter_entries(monday, monday + dt.timedelta(6))))
+			samples.append(seconds)
+			items += len(entries)
+		return summarize(samples, items)
+
+	def bench_range_year(self, runs: int = 3) -> dict:
+		"""A whole year read with iter_entries."""
+		samples, items = [], 0
+		for _ in range(runs):
+			start = self._monday()
+			seconds, entries = _timed(lambda: list(self.storage_manager.iter_entries(start, start + dt.timedelta(364))))
+			samples.append(seconds)
+			items += len(entries)
+		return summarize(samples, items)
+
+	def _navigate(self, steps: int, prefetch: bool) -> list[float]:
+		"""Step week by week like the arrow keys; time what the user waits for."""
+		loader = WeekLoader(self.storage_manager)
+		cache = self.storage_manager.week_cache
+		cache.clear()
+		monday = self._monday().isoformat()
+		samples = []
+		for _ in range(steps):
+			weeks = [WeekCache.shift(monday, i) for i in range(WEEKS_SHOWN)]
+			end = (dt.date.fromisoformat(weeks[-1]) + dt.timedelta(6)).isoformat()
+			if not prefetch:
+				cache.clear()
+			start = time.perf_counter()
+			loaded = {week: cache.get(week) for week in weeks}
+			missing = [week for week, entries in loaded.items() if entries is None]
+			if missing:
+				loaded.update(loader._fetch(missing, None))
+			WeekLoader._select(loaded, weeks[0], end)
+			samples.append(time.perf_counter() - start)
+			if prefetch:
+				# Runs on the pool while the user looks at the week
+				around = [WeekCache.shift(weeks[-1], 1), WeekCache.shift(weeks[0], -1)]
+				missing = sorted(week for week in around if not cache.contains(week))
+				if missing:
+					loader._fetch(missing, None)
+			monday = WeekCache.shift(monday, 1)
+		cache.clear()
+		return samples
+
+	def bench_week_navigation(self, steps: int = 100) -> dict:
+		"""Week changes served by the week cache with prefetching."""
+		return summarize(self._navigate(steps, prefetch=True))
+
+	def bench_week_navigation_cold(self, steps: int = 100) -> dict:
+		"""Week changes that always go to the database."""
+		return summarize(self._navigate(steps, prefetch=False))
+
+	def bench_search(self, runs: int = 10) -> dict:
+		"""Full-text search as typed, including one-word prefixes."""
+		samples = []
+		for _ in range(runs):
+			for text in SEARCHES:
+				samples.append(_timed(self.storage_manager.search, text)[0])
+		return summarize(samples)
+
+	def bench_day_totals(self, runs: int = 100) -> dict:
+		"""Day totals of the displayed weeks from the report summaries."""
+		reports = ReportEngine(self.storage_manager.db)
+		samples = []
+		for _ in range(runs):
+			monday = self._monday()
+			samples.append(_timed(reports.day_totals, monday, monday + dt.timedelta(13))[0])
+		return summarize(samples)
+
+	def bench_export_csv(self) -> dict:
+		"""Everything exported as CSV."""
+		path = os.path.join(self.workdir, "export.csv")
+		seconds, count = _timed(export, self.storage_manager, self.first, self.last, path)
+		return summarize([seconds], count)
+
+	def bench_export_jsonl(self) -> dict:
+		"""Everything exported as JSON Lines."""
+		path = os.path.join(self.workdir, "export.jsonl")
+		seconds, count = _timed(export, self.storage_manager, self.first, self.last, path)
+		return summarize([seconds], count)
+
+	def _content(self) -> tuple[list, list]:
+		input_type = self.rng.choice(("Tour", "Termin", "Lieferung"))
+		return make_entry(self.rng, input_type), settings_of(input_type)
+
+	def bench_store(self, runs: int = WRITES) -> dict:
+		"""Single inserts, one transaction each, with undo journal."""
+		samples = []
+		self.written.clear()
+		for _ in range(runs):
+			date = self._day()
+			text_memory, settings = self._content()
+			seconds, entry_id = _timed(self.storage_manager.insert_entry, date, text_memory, settings)
+			samples.append(seconds)
+			self.written.append(entry_id)
+		return summarize(samples)
+
+	def bench_update(self) -> dict:
+		"""Content changes of the stored entries."""
+		samples = []
+		for entry_id in self.written:
+			text_memory, settings = self._content()
+			samples.append(_timed(self.storage_manager.update_entry, entry_id, text_memory, settings)[0])
+		return summarize(samples)
+
+	def bench_delete(self) -> dict:
+		"""Deletes of the stored entries."""
+		samples = [_timed(self.storage_manager.delete_entry, entry_id)[0] for entry_id in self.written]
+		return summarize(samples)
+
+	def bench_writer_burst(self, runs: int = 500) -> dict:
+		"""A burst of saves through the background writer, until committed."""
+		writer = EntryWriter(self.storage_manager)
+		contents = [(self._day(), *self._content()) for _ in range(runs)]
+		start = time.perf_counter()
+		for date, text_memory, settings in contents:
+			writer.insert(date, text_memory, settings)
+		writer.flush()
+		seconds = time.perf_counter() - start
+		writer.close()
+		return summarize([seconds], runs)
+
+	def run(self, only: list[str] | None = None, log=None) -> dict:
+		"""
+		Args:
+			only (list[str], optional): Names of the benchmarks to run, all by default.
+			log (callable, optional): Called with a line per finished benchmark.
+
+		Returns:
+			dict: Benchmark name -> summarize() result.
+		"""
+		wanted = set(only or self.names())
+		if wanted & {"update", "delete"}:
+			# They work on the entries bench_store wrote
+			wanted.add("store")
+		results = {}
+		for name in self.names():
+			if name not in wanted:
+				continue
+			results[name] = getattr(self, f"bench_{name}")()
+			if log is not None:
+				log(f"{name:<24} p50 {results[name]['p50_ms']:>10.3f} ms   p95 {results[name]['p95_ms']:>10.3f} ms")
+		return results
+
+
+def _commit() -> str | None:
+	"""Current git commit of the source tree, if any."""
+	try:
+		return subprocess.run(
+			["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+			cwd=os.path.dirname(os.path.abspath(__file__))
+		).stdout.strip()
+	except (OSError, subprocess.CalledProcessError):
+		return None
+
+
+def metadata(suite: Suite, years: float, seed: int) -> dict:
+	"""Environment of a run, stored next to the results."""
+	return {
+		"commit": _commit(),
+		"created": dt.datetime.now().isoformat(timespec="seconds"),
+		"python": platform.python_version(),
+		"sqlite": sqlite3.sqlite_version,
+		"platform": platform.platform(),
+		"years": years,
+		"seed": seed,
+		"entries": suite.entries,
+	}
+
+
+def compare(baseline: dict, results: dict, ratio: float = REGRESSION_RATIO) -> list[dict]:
+	"""
+	Compare two result files by the median time of each benchmark.
+
+	Args:
+		baseline (dict): Older run, as written by main().
+		results (dict): Newer run.
+		ratio (float, optional): Slowdown counted as a regression.
+
+	Returns:
+		list[dict]: name, before_ms, after_ms, ratio and regression per
+			benchmark present in both runs.
+	"""
+	rows = []
+	for name, after in results["results"].items():
+		before = baseline["results"].get(name)
+		if before is None:
+			continue
+		before_ms, after_ms = before["p50_ms"], after["p50_ms"]
+		change = after_ms / before_ms if before_ms else float("inf")
+		rows.append({
+			"name": name,
+			"before_ms": before_ms,
+			"after_ms": after_ms,
+			"ratio": round(change, 3),
+			"regression": change > ratio and after_ms - before_ms > NOISE_MS,
+		})
+	return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+	"""
+	Command line runner, e.g.
+
+		python -m team_planer.benchmarks.run --out base.json
+		python -m team_planer.benchmarks.run --compare base.json --out new.json
+
+	Returns:
+		int: Exit code, 1 if a compared benchmark regressed.
+	"""
+	parser = argparse.ArgumentParser(
+		prog="python -m team_planer.benchmarks.run",
+		description="Benchmark the storage hot paths on a generated multi-year database."
+	)
+	parser.add_argument("--years", type=float, default=5, help="years of generated data")
+	parser.add_argument("--seed", type=int, default=0, help="random seed of data and benchmarks")
+	parser.add_argument("--only", help="comma separated benchmarks: " + ", ".join(Suite.names()))
+	parser.add_argument("--out", help="write the results as JSON to this file")
+	parser.add_argument("--compare", help="results file of an earlier run to compare against")
+	parser.add_argument("--threshold", type=float, default=REGRESSION_RATIO,
+						help="slowdown factor counted as a regression")
+	args = parser.parse_args(argv)
+	# The writer and the loader signal across threads
+	app = QCoreApplication.instance() or QCoreApplication([])
+
+	with tempfile.TemporaryDirectory(prefix="teamplaner-bench-") as workdir:
+		storage_manager = StorageManager(db_file=os.path.join(workdir, "bench.db"), shared=False)
+		migrate(storage_manager.db)
+		print(f"generating {args.years} years ...", flush=True)
+		generate(storage_manager, args.years, END_DATE, args.seed)
+		suite = Suite(storage_manager, workdir, args.seed)
+		print(f"{suite.entries} entries", flush=True)
+		only = args.only.split(",") if args.only else None
+		results = {
+			"version": RESULT_VERSION,
+			"meta": metadata(suite, args.years, args.seed),
+			"results": suite.run(only, log=lambda line: print(line, flush=True)),
+		}
+		storage_manager.db.close()
+
+	if args.out:
+		with open(args.out, "w", encoding="utf-8") as f:
+			json.dump(results, f, indent=4)
+	if not args.compare:
+		return 0
+	with open(args.compare, encoding="utf-8") as f:
+		baseline = json.load(f)
+	rows = compare(baseline, results, args.threshold)
+	print()
+	for row in rows:
+		flag = "  REGRESSION" if row["regression"] else ""
+		print(f"{row['name']:<24} {row['before_ms']:>10.3f} -> {row['after_ms']:>10.3f} ms  x{row['ratio']:.2f}{flag}")
+	return 1 if any(row["regression"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,244 @@
+import os
+import json
+import datetime as dt
+from team_planer.core.database import Database
+from team_planer.core.migrations import migrate
+
+ARCHIVE = "archive"   # schema name of the attached archive
+ARCHIVE_BATCH = 500   # entries moved per transaction
+
+
+def archive_path(db_path: str) -> str:
+	"""
+	Returns:
+		str: Archive file belonging to a database, e.g. storage_archive.db.
+	"""
+	root, extension = os.path.splitext(db_path)
+	return f"{root}_archive{extension or '.db'}"
+
+
+def archived_before(db: Database) -> str | None:
+	"""
+	Returns:
+		str | None: ISO date before which entries may be in the archive,
+			None if nothing was archived.
+	"""
+	row = db.execute("SELECT value FROM report_meta WHERE key = 'archived_before'").fetchone()
+	return row[0] if row else None
+
+
+def attach_archive(db: Database, start: str | None = None) -> bool:
+	"""
+	Attach the archive read-only if it can hold data from `start` on.
+
+	Args:
+		db (Database): The main database.
+		start (str | None, optional): First ISO day (or month) of a read;
+			None attaches whenever an archive exists.
+
+	Returns:
+		bool: True if the archive is attached as ARCHIVE.
+	"""
+	before = archived_before(db)
+	if before is None or (start is not None and start >= before):
+		return db.is_attached(ARCHIVE)
+	path = archive_path(db.path)
+	if not os.path.exists(path):
+		return False
+	db.attach(ARCHIVE, path, readonly=True)
+	return True
+
+
+def _ids(ids: list[int]) -> str:
+	"""Bind a list of ids as one parameter, used with json_each()."""
+	return json.dumps(ids)
+
+
+class Archiver:
+	"""
+	Moves old entries into the archive database and shrinks the main file.
+
+	The archive has the same schema, including the report summaries, so
+	old weeks, searches and reports keep working once it is attached.
+	Entries are copied to the archive and then deleted from the main
+	database, batch by batch; a run interrupted in between leaves copies
+	in both files, which readers de-duplicate and the next run replaces.
+	"""
+
+	def __init__(self, db: Database):
+		"""
+		Args:
+			db (Database): The main database.
+		"""
+		self.db = db
+		self.path = archive_path(db.path)
+
+	def _main(self) -> Database:
+		"""Private connections to the main file, opened like the shared ones."""
+		return Database(self.db.path, self.db.journal_mode, self.db.shared)
+
+	def _open(self) -> Database:
+		"""Private connection to the main database with the archive attached for writing."""
+		archive = Database(self.path, journal_mode="DELETE")
+		try:
+			migrate(archive)
+		finally:
+			archive.close()
+		db = self._main()
+		db.attach(ARCHIVE, self.path, readonly=False)
+		return db
+
+	def archive(self, before: dt.date | str) -> int:
+		"""
+		Move all entries dated before `before` into the archive.
+
+		Args:
+			before (date | str): First ISO day that stays in the main database.
+
+		Returns:
+			int: Number of archived entries.
+
+		Raises:
+			sqlite3.Error: If a database cannot be written.
+		"""
+		before = before.isoformat() if isinstance(before, dt.date) else before
+		db = self._open()
+		moved = 0
+		try:
+			with db.transaction():
+				# Published first, so readers look into the archive while rows move
+				db.execute("""
+					INSERT INTO main.report_meta (key, value) VALUES ('archived_before', ?)
+					ON CONFLICT (key) DO UPDATE SET value = MAX(value, excluded.value)
+				""", (before,))
+			while True:
+				with db.transaction():
+					ids = [row[0] for row in db.execute("""
+						SELECT id FROM main.user_inputs
+						WHERE iso_date < ?
+						ORDER BY id
+						LIMIT ?
+					""", (before, ARCHIVE_BATCH))]
+					if not ids:
+						break
+					self._move(db, _ids(ids))
+				moved += len(ids)
+			with db.transaction():
+				self._drop_shadowed(db)
+		finally:
+			db.close()
+		return moved
+
+	@staticmethod
+	def _move(db: Database, ids: str) -> None:
+		"""Copy one batch into the archive, replacing older copies, and delete it here."""
+		db.execute("DELETE FROM archive.user_inputs WHERE id IN (SELECT value FROM json_each(?))", (ids,))
+		db.execute("DELETE FROM archive.entry_search WHERE rowid IN (SELECT value FROM json_each(?))", (ids,))
+		# Type ids differ between the files; versions are matched by their settings
+		db.execute("""
+			INSERT OR IGNORE INTO archive.input_types (name, version, settings)
+			SELECT t.name, t.version, t.settings FROM main.input_types AS t
+			WHERE t.id IN (
+				SELECT type_id FROM main.user_inputs
+				WHERE id IN (SELECT value FROM json_each(?))
+			)
+		""", (ids,))
+		db.execute("""
+			INSERT INTO archive.user_inputs (id, date, iso_date, type, type_id)
+			SELECT e.id, e.date, e.iso_date, e.type, a.id FROM main.user_inputs AS e
+			LEFT JOIN main.input_types AS t ON t.id = e.type_id
+			LEFT JOIN archive.input_types AS a ON a.settings = t.settings
+			WHERE e.id IN (SELECT value FROM json_each(?))
+		""", (ids,))
+		# Block and item ids are reused in main once its newest rows were
+		# archived, so the archive assigns its own; items find their block
+		# by entry and position
+		db.execute("""
+			INSERT INTO archive.entry_blocks (entry_id, position, kind, goal_cents, header)
+			SELECT entry_id, position, kind, goal_cents, header FROM main.entry_blocks
+			WHERE entry_id IN (SELECT value FROM json_each(?))
+		""", (ids,))
+		db.execute("""
+			INSERT INTO archive.entry_items (block_id, position, label, amount_cents)
+			SELECT a.id, i.position, i.label, i.amount_cents
+			FROM main.entry_items AS i
+			JOIN main.entry_blocks AS b ON b.id = i.block_id
+			JOIN archive.entry_blocks AS a ON a.entry_id = b.entry_id AND a.position = b.position
+			WHERE b.entry_id IN (SELECT value FROM json_each(?))
+		""", (ids,))
+		# The archive's own triggers fold the facts into its summaries
+		db.execute("""
+			INSERT INTO archive.entry_facts (entry_id, iso_date, revenue_cents, workers, tour, goal_cents)
+			SELECT entry_id, iso_date, revenue_cents, workers, tour, goal_cents FROM main.entry_facts
+			WHERE entry_id IN (SELECT value FROM json_each(?))
+		""", (ids,))
+		db.execute("""
+			INSERT INTO archive.entry_search (rowid, body)
+			SELECT rowid, body FROM main.entry_search
+			WHERE rowid IN (SELECT value FROM json_each(?))
+		""", (ids,))
+
+		# Blocks, items and facts follow through ON DELETE CASCADE
+		db.execute("DELETE FROM main.user_inputs WHERE id IN (SELECT value FROM json_each(?))", (ids,))
+		db.execute("DELETE FROM main.entry_search WHERE rowid IN (SELECT value FROM json_each(?))", (ids,))
+		db.execute("DELETE FROM main.entry_journal WHERE entry_id IN (SELECT value FROM json_each(?))", (ids,))
+		db.execute("DELETE FROM main.archive_shadow WHERE entry_id IN (SELECT value FROM json_each(?))", (ids,))
+
+	@staticmethod
+	def _drop_shadowed(db: Database) -> None:
+		"""Delete archived entries that were deleted after being restored for editing."""
+		gone = _ids([row[0] for row in db.execute("""
+			SELECT entry_id FROM main.archive_shadow
+			WHERE entry_id NOT IN (SELECT id FROM main.user_inputs)
+		""")])
+		db.execute("DELETE FROM archive.user_inputs WHERE id IN (SELECT value FROM json_each(?))", (gone,))
+		db.execute("DELETE FROM archive.entry_search WHERE rowid IN (SELECT value FROM json_each(?))", (gone,))
+		db.execute("DELETE FROM main.archive_shadow WHERE entry_id IN (SELECT value FROM json_each(?))", (gone,))
+
+	def run(self, keep_days: int, today: dt.date | None = None) -> int:
+		"""
+		Apply the retention policy and shrink the main file.
+
+		The first run that archives anything rewrites the file with a full
+		VACUUM to turn on incremental vacuum; later runs only free pages.
+
+		Args:
+			keep_days (int): Entries older than this many days are archived;
+				0 disables archiving.
+			today (date, optional): Reference day, defaults to today.
+
+		Returns:
+			int: Number of archived entries.
+		"""
+		if keep_days <= 0:
+			return 0
+		before = (today or dt.date.today()) - dt.timedelta(keep_days)
+		moved = self.archive(before)
+		if moved:
+			db = self._main()
+			try:
+				if db.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+					db.incremental_vacuum()
+				else:
+					# Once per file: switch to incremental vacuum, see migration 8
+					db.execute("PRAGMA auto_vacuum = INCREMENTAL")
+					db.execute("VACUUM")
+			finally:
+				db.close()
+		return moved
+
+	def clear(self) -> None:
+		"""Delete the archived entries, e.g. together with all current ones."""
+		if not os.path.exists(self.path):
+			return
+		archive = Database(self.path, journal_mode="DELETE")
+		try:
+			with archive.transaction():
+				archive.execute("DELETE FROM user_inputs")
+				archive.execute("DELETE FROM entry_search")
+		finally:
+			archive.close()
+
+
+if __name__ == "__main__":
+	pass
@@ -0,0 +1,341 @@
+import os
+import time
+import pathlib
+import sqlite3
+import threading
+import datetime as dt
+from PySide6.QtCore import QObject, QTimer, Signal
+from team_planer.core.database import Database, BUSY_TIMEOUT
+from team_planer.core.migrations import migrate
+from team_planer.core.config_manager import ConfigManager
+from team_planer.core.storage_manager import StorageManager
+from team_planer.core.entry_writer import get_entry_writer
+
+BACKUP_PAGES = 256        # pages copied per step, 1 MB with 4 KiB pages
+BACKUP_PAUSE = 0.002      # seconds between steps, so writers get the lock
+BACKUP_ATTEMPTS = 4       # copies started before giving up, each with twice the pages per step
+BACKUP_KEEP = 7
+CHECK_INTERVAL_MS = 15 * 60 * 1000
+STAMP_FORMAT = "%Y%m%d-%H%M%S"
+
+
+def backup_dir(db_path: str, configured: str = "") -> str:
+	"""
+	Returns:
+		str: Snapshot folder, the configured one or "backups" next to the database.
+	"""
+	return configured or os.path.join(os.path.dirname(os.path.abspath(db_path)), "backups")
+
+
+def snapshot_time(path: str) -> dt.datetime | None:
+	"""
+	Returns:
+		datetime | None: Creation time encoded in a snapshot file name,
+			None if the file is no snapshot.
+	"""
+	name, extension = os.path.splitext(os.path.basename(path))
+	if extension != ".db":
+		return None
+	try:
+		return dt.datetime.strptime(name.rpartition("_")[2], STAMP_FORMAT)
+	except ValueError:
+		return None
+
+
+class BackupBusy(sqlite3.OperationalError):
+	"""The database kept changing during every backup attempt; try again later."""
+
+
+class _Restarted(Exception):
+	"""Raised from the progress callback to give up on a restarted copy."""
+
+
+class Backups:
+	"""
+	Rotating snapshots of a database, taken with SQLite's online backup API.
+
+	A snapshot is copied BACKUP_PAGES pages at a time from a private
+	connection, pausing between the steps, so readers and writers keep
+	working. A write by another connection restarts the copy from the
+	first page; the copy is then started over with twice the pages per
+	step, so it needs fewer steps. After BACKUP_ATTEMPTS copies it gives
+	up with BackupBusy rather than copying everything in one step, which
+	would lock out the writers of other clients on a shared database for
+	the whole copy. Only the main file is copied, not the archive.
+	"""
+
+	def __init__(self, db: Database, directory: str = "", keep: int = BACKUP_KEEP):
+		"""
+		Args:
+			db (Database): The database to back up.
+			directory (str, optional): Snapshot folder, see backup_dir().
+			keep (int, optional): Number of snapshots kept by rotate().
+		"""
+		self.db = db
+		self.directory = backup_dir(db.path, directory)
+		self.keep = keep
+		self.prefix = os.path.splitext(os.path.basename(db.path))[0] + "_"
+
+	def snapshots(self) -> list[str]:
+		"""
+		Returns:
+			list[str]: Snapshot files of this database, newest first.
+		"""
+		try:
+			names = os.listdir(self.directory)
+		except FileNotFoundError:
+			return []
+		paths = [
+			os.path.join(self.directory, name) for name in names
+			if name.startswith(self.prefix) and snapshot_time(name) is not None
+		]
+		return sorted(paths, key=snapshot_time, reverse=True)
+
+	def is_due(self, interval_hours: int, now: dt.datetime | None = None) -> bool:
+		"""
+		Returns:
+			bool: True if the newest snapshot is older than `interval_hours`;
+				always False for 0.
+		"""
+		if interval_hours <= 0:
+			return False
+		snapshots = self.snapshots()
+		if not snapshots:
+			return True
+		now = now or dt.datetime.now()
+		return now - snapshot_time(snapshots[0]) >= dt.timedelta(hours=interval_hours)
+
+	def create(self, progress=None, now: dt.datetime | None = None) -> str:
+		"""
+		Write a new snapshot.
+
+		The copy goes to a temporary file that is renamed when complete,
+		so a crash never leaves a torn snapshot behind.
+
+		Args:
+			progress (callable, optional): Called as progress(remaining, total)
+				after every step, in pages.
+			now (datetime, optional): Time stamp of the snapshot.
+
+		Returns:
+			str: Path of the snapshot.
+
+		Raises:
+			BackupBusy: If writes restarted every attempt.
+			sqlite3.Error: If the database cannot be read.
+			OSError: If the snapshot cannot be written.
+		"""
+		os.makedirs(self.directory, exist_ok=True)
+		stamp = (now or dt.datetime.now()).strftime(STAMP_FORMAT)
+		path = os.path.join(self.directory, f"{self.prefix}{stamp}.db")
+		tmp_path = f"{path}.tmp"
+
+		last = None
+
+		def step(status, remaining, total):
+			nonlocal last
+			# A step that was restarted leaves as many pages as before, or more
+			if last is not None and remaining >= last:
+				raise _Restarted()
+			last = remaining
+			if progress is not None:
+				progress(remaining, total)
+			if remaining:
+				time.sleep(BACKUP_PAUSE)
+
+		source = sqlite3.connect(self.db.path, timeout=BUSY_TIMEOUT)
+		target = sqlite3.connect(tmp_path)
+		try:
+			for attempt in range(BACKUP_ATTEMPTS):
+				last = None
+				try:
+					source.backup(target, pages=BACKUP_PAGES << attempt, progress=step)
+					break
+				except _Restarted:
+					continue
+			else:
+				raise BackupBusy(f"database changed during all {BACKUP_ATTEMPTS} backup attempts")
+			# The copy inherits WAL mode; a snapshot is a single self-contained file
+			target.execute("PRAGMA journal_mode = DELETE")
+		except BackupBusy:
+			target.close()
+			os.remove(tmp_path)
+			raise
+		finally:
+			target.close()
+			source.close()
+		os.replace(tmp_path, path)
+		return path
+
+	def rotate(self) -> list[str]:
+		"""
+		Delete all but the newest `keep` snapshots.
+
+		Returns:
+			list[str]: Deleted files.
+		"""
+		removed = []
+		for path in self.snapshots()[self.keep:]:
+			try:
+				os.remove(path)
+			except OSError:
+				continue
+			removed.append(path)
+		return removed
+
+	def run(self, interval_hours: int, now: dt.datetime | None = None) -> str | None:
+		"""
+		Take and rotate a snapshot if one is due.
+
+		Returns:
+			str | None: Path of the new snapshot, None if none was due.
+		"""
+		if not self.is_due(interval_hours, now):
+			return None
+		path = self.create(now=now)
+		self.rotate()
+		return path
+
+	def restore(self, path: str) -> str:
+		"""
+		Replace the database content with a snapshot.
+
+		The current state is saved as a snapshot first, so a restore can
+		itself be undone. The copy is done in one step, which keeps other
+		connections from seeing a half restored file.
+
+		Args:
+			path (str): Snapshot file.
+
+		Returns:
+			str: Snapshot of the state before the restore.
+
+		Raises:
+			sqlite3.Error: If the snapshot cannot be read or the database
+				cannot be written.
+		"""
+		before = self.create()
+		snapshot = sqlite3.connect(pathlib.Path(path).absolute().as_uri() + "?mode=ro", uri=True)
+		try:
+			snapshot.backup(self.db.connection())
+		finally:
+			snapshot.close()
+		# Snapshots of an older version get the current schema
+		migrate(self.db)
+		return before
+
+
+class BackupService(QObject):
+	"""
+	Takes the scheduled snapshots and runs backups and restores off the GUI thread.
+	"""
+
+	backupDone = Signal(str)
+	restoreDone = Signal(str)
+	failed = Signal(object)
+
+	def __init__(self, storage_manager: StorageManager | None = None, parent=None):
+		"""
+		Args:
+			storage_manager (StorageManager, optional): Storage to back up.
+			parent (QObject, optional): Qt parent.
+		"""
+		super().__init__(parent)
+		self.storage_manager = storage_manager or StorageManager()
+		self.interval_hours = 0
+		self.lock = threading.Lock()
+		self.thread = None
+
+		self.timer = QTimer(self)
+		self.timer.setInterval(CHECK_INTERVAL_MS)
+		self.timer.timeout.connect(self.check)
+
+	def backups(self) -> Backups:
+		"""Backups configured from the current settings."""
+		settings = ConfigManager().load_settings()
+		self.interval_hours = settings.backup_interval_hours
+		return Backups(self.storage_manager.db, settings.backup_dir, settings.backup_keep)
+
+	def start(self) -> None:
+		"""Take a due snapshot now and check again every CHECK_INTERVAL_MS."""
+		self.check()
+		self.timer.start()
+
+	def check(self) -> None:
+		"""Start a snapshot in the background if one is due."""
+		backups = self.backups()
+		if backups.is_due(self.interval_hours):
+			self._start(self._backup, backups, True)
+
+	def backup_now(self) -> bool:
+		"""
+		Returns:
+			bool: False if a backup or restore is already running.
+		"""
+		return self._start(self._backup, self.backups())
+
+	def restore(self, path: str) -> bool:
+		"""
+		Restore a snapshot after all queued writes are committed.
+
+		Returns:
+			bool: False if a backup or restore is already running.
+		"""
+		return self._start(self._restore, self.backups(), path)
+
+	def _start(self, target, *args) -> bool:
+		with self.lock:
+			if self.thread is not None and self.thread.is_alive():
+				return False
+			self.thread = threading.Thread(target=self._run, args=(target, *args), name="Backup", daemon=True)
+			self.thread.start()
+		return True
+
+	def _run(self, target, *args) -> None:
+		"""Body of the backup thread; closes the thread's connection when done."""
+		try:
+			target(*args)
+		finally:
+			self.storage_manager.db.release()
+
+	def _backup(self, backups: Backups, scheduled: bool = False) -> None:
+		try:
+			path = backups.create()
+			backups.rotate()
+		except BackupBusy as ex:
+			# A due snapshot is tried again at the next check
+			if not scheduled:
+				self.failed.emit(ex)
+			return
+		except (sqlite3.Error, OSError) as ex:
+			self.failed.emit(ex)
+			return
+		self.backupDone.emit(path)
+
+	def _restore(self, backups: Backups, path: str) -> None:
+		get_entry_writer().flush()
+		try:
+			self.storage_manager.restore_snapshot(path, backups)
+			backups.rotate()
+		except (sqlite3.Error, OSError) as ex:
+			self.failed.emit(ex)
+			return
+		self.restoreDone.emit(path)
+
+
+_service = None
+
+
+def get_backup_service() -> BackupService:
+	"""
+	Returns:
+		BackupService: The process-wide backup service.
+	"""
+	global _service
+	if _service is None:
+		_service = BackupService()
+	return _service
+
+
+if __name__ == "__main__":
+	pass
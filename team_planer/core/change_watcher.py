@@ -0,0 +1,96 @@
+import sqlite3
+from PySide6.QtCore import QObject, QTimer, Signal
+from team_planer.core.storage_backend import StorageBackend, create_storage
+
+POLL_INTERVAL_MS = 1000
+
+
+class ChangeWatcher(QObject):
+	"""
+	Notices entries changed by other clients of the same database file.
+
+	Polls PRAGMA data_version, which only changes after another connection
+	committed and costs no disk access, and reads the change log only then.
+	The affected weeks are dropped from the week cache before datesChanged
+	is emitted.
+	"""
+
+	datesChanged = Signal(object)
+
+	def __init__(self, storage_manager: StorageBackend | None = None, interval_ms: int = POLL_INTERVAL_MS, parent=None):
+		"""
+		Args:
+			storage_manager (StorageBackend, optional): Watched storage, the
+				configured one by default.
+			interval_ms (int, optional): Poll interval.
+			parent (QObject, optional): Qt parent.
+		"""
+		super().__init__(parent)
+		self.storage_manager = storage_manager or create_storage()
+		self.data_version = None
+		self.seq = None
+
+		self.timer = QTimer(self)
+		self.timer.setInterval(interval_ms)
+		self.timer.timeout.connect(self.poll)
+
+	def start(self) -> None:
+		"""Start polling from the current state of the database."""
+		try:
+			self.data_version = self.storage_manager.data_version()
+			self.seq = self.storage_manager.last_change()
+		except sqlite3.Error:
+			# Tables are missing until create_db(); poll() catches up later
+			self.seq = 0
+		self.timer.start()
+
+	def stop(self) -> None:
+		self.timer.stop()
+
+	def poll(self) -> bool:
+		"""
+		Check for foreign changes once.
+
+		Emits datesChanged with the set of changed ISO days, or None if all
+		days have to be reloaded.
+
+		Returns:
+			bool: True if something changed.
+		"""
+		storage = self.storage_manager
+		try:
+			data_version = storage.data_version()
+			if data_version == self.data_version:
+				return False
+			seq, dates = storage.changes_since(self.seq or 0)
+		except sqlite3.Error:
+			# Busy or unreachable share: try again on the next tick
+			return False
+		self.data_version = data_version
+		self.seq = seq
+		if dates is None:
+			storage.week_cache.clear()
+		elif dates:
+			storage.week_cache.invalidate(dates)
+		else:
+			return False
+		self.datesChanged.emit(dates)
+		return True
+
+
+_watcher = None
+
+
+def get_change_watcher() -> ChangeWatcher:
+	"""
+	Returns:
+		ChangeWatcher: The process-wide change watcher.
+	"""
+	global _watcher
+	if _watcher is None:
+		_watcher = ChangeWatcher()
+	return _watcher
+
+
+if __name__ == "__main__":
+	pass
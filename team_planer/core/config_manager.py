@@ -1,9 +1,14 @@
 import os
 import json
+import atexit
+import threading
+from types import MappingProxyType
+from team_planer.core.config_schema import AppConfig, compile_config
 
 APP_NAME = "TeamPlaner"
 CONFIG_DIR = os.path.join(os.getenv("APPDATA"), APP_NAME)
 CONFIG_FILE = os.path.join(CONFIG_DIR, "config.json")
+SAVE_DELAY = 0.5  # seconds to coalesce bursts of saves into one write
 
 # Default configuration settings for the application
 DEFAULT_CONFIG = {
@@ -21,6 +26,15 @@ DEFAULT_CONFIG = {
 		"Freitag"
 	),
 	"input_goal_per_worker" : 500,
+	"storage_backend": "sqlite", # "memory" keeps entries only while the app runs
+	"database_file": "",        # empty: storage.db in the app data folder
+	"shared_database": False,   # several PCs use database_file at once
+	"archive_after_days": 0,    # move older entries to the archive, 0 = never
+	"backup_dir": "",           # empty: "backups" next to the database
+	"backup_keep": 7,           # snapshots kept
+	"backup_interval_hours": 24, # 0 = no automatic snapshots
+	"query_stats": False,       # time every SQL statement from the start, see Debug menu
+	"slow_query_ms": 100,       # log statements at least this slow, 0 = off
 
 	"display-window_font-size": 10,
 	"display-window_font-family": "Arial",
@@ -103,7 +117,8 @@ DEFAULT_CONFIG = {
 		4: ("Verlerhafte Eingabe", "Ein Eingabefeld wurde leer gelassen.") 
 	},
 	"Warning-Massages": {
-		0: ("Eintrag Löschen", "Dieser Eintrag wird unwiederuflich gelöscht.")
+		0: ("Eintrag Löschen", "Dieser Eintrag wird gelöscht. Strg+Z stellt ihn wieder her."),
+		1: ("Sicherung wiederherstellen", "Alle Einträge werden durch die Sicherung ersetzt. Der aktuelle Stand wird vorher gesichert.")
 	},
 
 
@@ -142,45 +157,251 @@ DEFAULT_CONFIG = {
 	"E005": ("Configurations Fehler", "Falsche Eingabe in der Configurations-Datei!")
 }
 
+class _ConfigCache:
+	"""Process-wide cache of the parsed config file."""
+
+	def __init__(self):
+		self.path = None
+		self.stamp = None
+		self.config = None
+		self.view = None
+		self.settings = None
+		self.dirty = False
+		self.hits = 0
+		self.misses = 0
+
+	def get(self, path: str, stamp: tuple) -> MappingProxyType | None:
+		"""
+		Return the cached view if it still matches the file on disk.
+
+		Args:
+			path (str): Config file path.
+			stamp (tuple): (mtime_ns, size) of the file.
+
+		Returns:
+			MappingProxyType | None: Read-only config or None on a miss.
+		"""
+		if self.view is not None and self.path == path and (self.dirty or self.stamp == stamp):
+			self.hits += 1
+			return self.view
+		self.misses += 1
+		return None
+
+	def put(self, path: str, stamp: tuple, config: dict) -> MappingProxyType:
+		"""Store a freshly parsed config and return its read-only view."""
+		self.path = path
+		self.stamp = stamp
+		self.config = config
+		self.view = MappingProxyType(config)
+		self.settings = None
+		self.dirty = False
+		return self.view
+
+	def invalidate(self) -> None:
+		"""Drop the cached config so the next load re-reads the file."""
+		self.path = None
+		self.stamp = None
+		self.config = None
+		self.view = None
+		self.settings = None
+		self.dirty = False
+
+
+class _ConfigWriter:
+	"""Coalesces config saves into one delayed, atomic write."""
+
+	def __init__(self):
+		self.lock = threading.Lock()
+		self.timer = None
+		self.pending = None
+
+	def schedule(self, path: str, overrides: dict, delay: float) -> None:
+		"""
+		Queue the overrides for writing; a newer save replaces a queued one.
+
+		Args:
+			path (str): Config file path.
+			overrides (dict): Values that differ from the defaults.
+			delay (float): Seconds to wait for further saves.
+		"""
+		with self.lock:
+			self.pending = (path, overrides)
+			if self.timer is not None:
+				self.timer.cancel()
+			self.timer = threading.Timer(delay, self.flush)
+			self.timer.daemon = True
+			self.timer.start()
+
+	def flush(self) -> None:
+		"""Write the queued overrides now, if any."""
+		with self.lock:
+			if self.timer is not None:
+				self.timer.cancel()
+				self.timer = None
+			if self.pending is None:
+				return
+			path, overrides = self.pending
+			self.pending = None
+			write_atomic(path, overrides)
+			if _cache.path == path:
+				_cache.stamp = _file_stamp(path)
+				_cache.dirty = False
+
+
+_cache = _ConfigCache()
+_writer = _ConfigWriter()
+atexit.register(_writer.flush)
+
+# Defaults as they look after a JSON round trip, to spot unchanged values
+_DEFAULTS_JSON = json.loads(json.dumps(DEFAULT_CONFIG))
+
+
+def write_atomic(path: str, data: dict) -> None:
+	"""
+	Write JSON via temp file, fsync and rename so a crash never leaves
+	a half written file behind.
+
+	Args:
+		path (str): Target file.
+		data (dict): JSON serializable content.
+	"""
+	tmp_path = f"{path}.tmp"
+	with open(tmp_path, "w", encoding="utf-8") as f:
+		json.dump(data, f, indent=4, ensure_ascii=False)
+		f.flush()
+		os.fsync(f.fileno())
+	os.replace(tmp_path, path)
+	if hasattr(os, "O_DIRECTORY"):
+		dir_fd = os.open(os.path.dirname(path) or ".", os.O_RDONLY | os.O_DIRECTORY)
+		try:
+			os.fsync(dir_fd)
+		finally:
+			os.close(dir_fd)
+
+
+def user_overrides(config: dict) -> dict:
+	"""
+	Reduce a full config to the values that differ from the defaults.
+
+	Args:
+		config (dict): Full or partial configuration.
+
+	Returns:
+		dict: JSON ready overrides.
+	"""
+	overrides = {}
+	for key, value in json.loads(json.dumps(dict(config))).items():
+		if key not in _DEFAULTS_JSON or _DEFAULTS_JSON[key] != value:
+			overrides[key] = value
+	return overrides
+
+
+def _file_stamp(path: str) -> tuple | None:
+	"""Return (mtime_ns, size) of a file or None if it does not exist."""
+	try:
+		stat = os.stat(path)
+	except FileNotFoundError:
+		return None
+	return (stat.st_mtime_ns, stat.st_size)
+
+
 class ConfigManager:
 	"""Manages loading and saving the app config."""
 
 	def __init__(self):
 		"""Initialize ConfigManager."""
 		os.makedirs(CONFIG_DIR, exist_ok=True)
-		self.config = self.load_config()
+		self.config = dict(self.load_config())
 
-	def load_config(self) -> dict:
+	def load_config(self) -> MappingProxyType:
 		"""
-		Load the configuration file or create a default one.
+		Load the configuration: built-in defaults overlaid by the user file.
+
+		The file only holds the user's overrides. It is parsed once per
+		process and only re-read when its modification time or size changes.
 
 		Returns:
-			dict: The current configuration.
+			MappingProxyType: Read-only view of the current configuration.
 		"""
-		if not os.path.exists(CONFIG_FILE):
-			self.save_config(DEFAULT_CONFIG)
-			return DEFAULT_CONFIG
-		
-		with open(CONFIG_FILE, "r") as f:
-			config = json.load(f)
-		
-		# Ensure all default keys exist
-		for key, value in DEFAULT_CONFIG.items():
-			config.setdefault(key, value)
-
-		return config
-
-	def save_config(self, config: dict = None) -> None:
+		stamp = _file_stamp(CONFIG_FILE)
+		if stamp is None and not _cache.dirty:
+			write_atomic(CONFIG_FILE, {})
+			return _cache.put(CONFIG_FILE, _file_stamp(CONFIG_FILE), dict(DEFAULT_CONFIG))
+
+		view = _cache.get(CONFIG_FILE, stamp)
+		if view is not None:
+			return view
+
+		with open(CONFIG_FILE, "r", encoding="utf-8") as f:
+			overrides = user_overrides(json.load(f))
+
+		return _cache.put(CONFIG_FILE, stamp, {**DEFAULT_CONFIG, **overrides})
+
+	def load_settings(self) -> AppConfig:
 		"""
-		Save the configuration to disk.
+		Load the validated, typed configuration.
+
+		Compiled once per version of the config file. Invalid keys fall
+		back to their defaults and are listed in 'errors'.
+
+		Returns:
+			AppConfig: Frozen configuration sections.
+		"""
+		view = self.load_config()
+		if _cache.settings is None or _cache.view is not view:
+			_cache.settings = compile_config(view, DEFAULT_CONFIG, strict=False)
+		return _cache.settings
+
+	def save_config(self, config: dict = None, delay: float = SAVE_DELAY) -> None:
+		"""
+		Save the configuration; only values that differ from the defaults
+		are written.
+
+		The new values are visible to load_config right away, the file is
+		written once after 'delay' seconds without further saves.
 
 		Args:
 			config (dict, optional): Config to save. Defaults to self.config.
+			delay (float, optional): Debounce delay in seconds.
 		"""
 		if config is None:
 			config = self.config
-		with open(CONFIG_FILE, "w") as f:
-			json.dump(config, f, indent=4)
+		overrides = user_overrides(config)
+		with _writer.lock:
+			_cache.put(CONFIG_FILE, _cache.stamp, {**DEFAULT_CONFIG, **overrides})
+			_cache.dirty = True
+		_writer.schedule(CONFIG_FILE, overrides, delay)
+
+	@staticmethod
+	def flush() -> None:
+		"""Write a pending save to disk immediately."""
+		_writer.flush()
+
+	@staticmethod
+	def diff_config(old: dict, new: dict) -> frozenset:
+		"""
+		Compare two configs key by key.
+
+		Args:
+			old (dict): Previous configuration.
+			new (dict): Current configuration.
+
+		Returns:
+			frozenset: Keys that were added, removed or changed.
+		"""
+		changed = {key for key in old.keys() | new.keys() if key not in old or key not in new}
+		for key in old.keys() & new.keys():
+			if old[key] != new[key]:
+				changed.add(key)
+		return frozenset(changed)
+
+	@staticmethod
+	def cache_info() -> dict:
+		"""
+		Returns:
+			dict: Hit and miss counters of the shared config cache.
+		"""
+		return {"hits": _cache.hits, "misses": _cache.misses}
 
 
 if __name__ == "__main__":
@@ -0,0 +1,377 @@
+import re
+from types import MappingProxyType
+
+DATE_FORMATS = (
+	"dd.mm.yyyy", "dd/mm/yyyy", "dd.mm.yy", "dd/mm/yy",
+	"mm.dd.yyyy", "mm/dd/yyyy", "mm.dd.yy", "mm/dd/yy"
+)
+FONT_WEIGHTS = ("Bold", "Regular", "Normal")
+
+
+class ConfigError(ValueError):
+	"""Raised with all problems found in a configuration."""
+
+	def __init__(self, errors: list[str]):
+		"""
+		Args:
+			errors (list[str]): One message per invalid key.
+		"""
+		super().__init__("\n".join(errors))
+		self.errors = tuple(errors)
+
+
+# Validators return the normalized value or raise ValueError
+
+def _int(minimum: int = 0):
+	def check(value):
+		if isinstance(value, bool) or not isinstance(value, int) or value < minimum:
+			raise ValueError(f"expected an integer >= {minimum}")
+		return value
+	return check
+
+
+def _str(value):
+	if not isinstance(value, str) or not value:
+		raise ValueError("expected a non-empty string")
+	return value
+
+
+def _bool(value):
+	if not isinstance(value, bool):
+		raise ValueError("expected true or false")
+	return value
+
+
+def _path(value):
+	if not isinstance(value, str):
+		raise ValueError("expected a file path or an empty string")
+	return value
+
+
+def _color(value):
+	if not isinstance(value, str) or not re.match(r"(#[0-9a-fA-F]{3,8}|[a-zA-Z]+)$", value):
+		raise ValueError("expected a color like '#ccc' or 'red'")
+	return value
+
+
+def _choice(*choices):
+	def check(value):
+		if value not in choices:
+			raise ValueError(f"expected one of {', '.join(choices)}")
+		return value
+	return check
+
+
+def _margins(value):
+	if not isinstance(value, (list, tuple)) or len(value) != 4:
+		raise ValueError("expected four integers [left, top, right, bottom]")
+	return tuple(_int()(v) for v in value)
+
+
+def _str_list(value):
+	if not isinstance(value, (list, tuple)) or not 0 < len(value) <= 7:
+		raise ValueError("expected a list of one to seven names")
+	return tuple(_str(v) for v in value)
+
+
+def _messages(value):
+	"""Normalize a message table; JSON stores the int keys as strings."""
+	if not isinstance(value, dict):
+		raise ValueError("expected a mapping of code -> [header, text]")
+	messages = {}
+	for code, message in value.items():
+		if isinstance(code, str) and code.isdigit():
+			code = int(code)
+		messages[code] = _message(message)
+	return messages
+
+
+def _message(value):
+	if not isinstance(value, (list, tuple)) or len(value) != 2:
+		raise ValueError("expected [header, text]")
+	return (_str(value[0]), _str(value[1]))
+
+
+def _read(config: dict, defaults: dict, key: str, check, errors: list):
+	"""Validate one key; invalid values are reported and replaced by the default."""
+	if key not in config:
+		return check(defaults[key])
+	try:
+		return check(config[key])
+	except ValueError as ex:
+		errors.append(f"{key}: {ex}")
+		return check(defaults[key])
+
+
+class _Section:
+	"""Immutable group of validated config values."""
+
+	__slots__ = ()
+	PREFIX = ""
+	FIELDS = {}
+
+	def __init__(self, **values):
+		for name in self.__slots__:
+			object.__setattr__(self, name, values[name])
+
+	def __setattr__(self, name, value):
+		raise AttributeError(f"{type(self).__name__} is read-only")
+
+	def __delattr__(self, name):
+		raise AttributeError(f"{type(self).__name__} is read-only")
+
+	def __eq__(self, other):
+		return type(self) is type(other) and all(
+			getattr(self, name) == getattr(other, name) for name in self.__slots__
+		)
+
+	def __repr__(self):
+		values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+		return f"{type(self).__name__}({values})"
+
+	@classmethod
+	def compile(cls, config: dict, defaults: dict, errors: list) -> "_Section":
+		"""
+		Build the section from the prefixed keys of a config.
+
+		Args:
+			config (dict): Raw configuration.
+			defaults (dict): Default configuration.
+			errors (list): Collects validation messages.
+		"""
+		return cls(**{
+			name: _read(config, defaults, cls.PREFIX + key, check, errors)
+			for name, (key, check) in cls.FIELDS.items()
+		})
+
+
+class DisplaySection(_Section):
+	"""Settings of the week view (display-window_*)."""
+
+	PREFIX = "display-window_"
+	FIELDS = {
+		"font_size": ("font-size", _int(1)),
+		"font_family": ("font-family", _str),
+		"font_weight": ("font-weight", _choice(*FONT_WEIGHTS)),
+		"content_frame_border_width": ("content-frame_border-width", _int()),
+		"content_frame_border_radius": ("content-frame_border-radius", _int()),
+		"content_frame_border_color": ("content-frame_border-color", _color),
+		"tday_content_frame_border_color": ("tday-content-frame_border-color", _color),
+		"header_frame_border_width": ("header-frame_border-width", _int()),
+		"header_frame_border_radius": ("header-frame_border-radius", _int()),
+		"header_frame_border_color": ("header-frame_border-color", _color),
+		"tday_header_frame_border_color": ("tday-header-frame_border-color", _color),
+		"header_frame_padding": ("header-frame_padding", _int()),
+		"header_content_margin": ("header-content_margin", _int()),
+		"frame_content_margin": ("frame-content_margin", _margins),
+		"content_content_margin": ("content-content_margin", _int()),
+	}
+	__slots__ = tuple(FIELDS)
+
+
+class UserInputSection(_Section):
+	"""Settings of the entry frames in the week view (user-input_*)."""
+
+	PREFIX = "user-input_"
+	FIELDS = {
+		"font_size": ("font-size", _int(1)),
+		"font_family": ("font-family", _str),
+		"font_weight": ("font-weight", _choice(*FONT_WEIGHTS)),
+		"inner_border_width": ("inner-border-width", _int()),
+		"inner_border_radius": ("inner-border-radius", _int()),
+		"inner_border_color": ("inner-border-color", _color),
+		"outer_border_width": ("outer-border-width", _int()),
+		"outer_border_radius": ("outer-border-radius", _int()),
+		"outer_border_color": ("outer-border-color", _color),
+		"calc_true_color": ("calc-true-color", _color),
+		"calc_false_color": ("calc-false-color", _color),
+	}
+	__slots__ = tuple(FIELDS)
+
+
+class EditWindowSection(_Section):
+	"""Settings of the edit window (edit-window_*)."""
+
+	PREFIX = "edit-window_"
+	FIELDS = {
+		"font_size": ("font-size", _int(1)),
+		"font_family": ("font-family", _str),
+		"font_weight": ("font-weight", _choice(*FONT_WEIGHTS)),
+		"inner_border_width": ("inner-border-width", _int()),
+		"inner_border_radius": ("inner-border-radius", _int()),
+		"inner_border_color": ("inner-border-color", _color),
+		"outer_border_width": ("outer-border-width", _int()),
+		"outer_border_radius": ("outer-border-radius", _int()),
+		"outer_border_color": ("outer-border-color", _color),
+		"focus_color": ("focused-content-color", _color),
+		"unchangeable_content_color": ("unchangeable-content-color", _color),
+		"content_margin": ("content-margin", _margins),
+	}
+	__slots__ = tuple(FIELDS)
+
+
+class InputField(_Section):
+	"""One labeled field of an input type, e.g. ("Monteure", "worker")."""
+
+	__slots__ = ("header", "kind")
+
+
+class InputType(_Section):
+	"""An entry type offered by the input window, e.g. Tour or Termin."""
+
+	__slots__ = ("name", "type_id", "inner_color", "outer_color", "fields")
+
+	@property
+	def settings(self) -> tuple:
+		"""The settings tuple stored with each entry of this type."""
+		return (self.name, self.type_id, self.inner_color, self.outer_color)
+
+	@classmethod
+	def parse(cls, name: str, value) -> "InputType":
+		"""
+		Build an input type from its config form.
+
+		Args:
+			name (str): Key of the type in the config.
+			value (list): [[name, id, inner_color, outer_color], [header, kind], ...]
+		"""
+		if not isinstance(value, (list, tuple)) or len(value) < 2:
+			raise ValueError(f"'{name}' needs a settings row and at least one field")
+		head = value[0]
+		if not isinstance(head, (list, tuple)) or len(head) != 4:
+			raise ValueError(f"'{name}' settings must be [name, id, inner_color, outer_color]")
+		fields = []
+		for field in value[1:]:
+			if not isinstance(field, (list, tuple)) or len(field) != 2:
+				raise ValueError(f"'{name}' fields must be [header, kind]")
+			kind = field[1]
+			if not isinstance(kind, str) or not re.match(r"(text|worker|calc#\d+)$", kind):
+				raise ValueError(f"'{name}' field kind must be text, worker or calc#<goal>")
+			fields.append(InputField(header=_str(field[0]), kind=kind))
+		return cls(
+			name=_str(head[0]),
+			type_id=_int()(head[1]),
+			inner_color=_color(head[2]),
+			outer_color=_color(head[3]),
+			fields=tuple(fields)
+		)
+
+
+def _input_types(value):
+	if not isinstance(value, dict) or not value:
+		raise ValueError("expected a mapping of type name -> definition")
+	return MappingProxyType({
+		name: InputType.parse(name, definition) for name, definition in value.items()
+	})
+
+
+class InputWindowSection(_Section):
+	"""Settings of the input window (input-window_*), including input types."""
+
+	PREFIX = "input-window_"
+	FIELDS = {
+		"font_size": ("font-size", _int(1)),
+		"font_family": ("font-family", _str),
+		"font_weight": ("font-weight", _choice(*FONT_WEIGHTS)),
+		"inner_border_width": ("inner-border-width", _int()),
+		"inner_border_radius": ("inner-border-radius", _int()),
+		"inner_border_color": ("inner-border-color", _color),
+		"outer_border_width": ("outer-border-width", _int()),
+		"outer_border_radius": ("outer-border-radius", _int()),
+		"outer_border_color": ("outer-border-color", _color),
+		"focus_color": ("focus-content-color", _color),
+		"content_margin": ("content-margin", _margins),
+		"input_types": ("input-types", _input_types),
+		"first_input_type": ("first-input-type", _str),
+	}
+	__slots__ = tuple(FIELDS)
+
+	@classmethod
+	def compile(cls, config: dict, defaults: dict, errors: list) -> "InputWindowSection":
+		section = super().compile(config, defaults, errors)
+		if section.first_input_type not in section.input_types:
+			errors.append(
+				f"{cls.PREFIX}first-input-type: '{section.first_input_type}' is not an input type"
+			)
+			values = {name: getattr(section, name) for name in cls.__slots__}
+			values["first_input_type"] = next(iter(section.input_types))
+			section = cls(**values)
+		return section
+
+
+class AppConfig(_Section):
+	"""The whole validated configuration."""
+
+	FIELDS = {
+		"language": ("language", _str),
+		"window_title": ("window_title", _str),
+		"window_shown": ("window_shown", _int(1)),
+		"weeks_shown": ("weeks_shown", _int(1)),
+		"date_format": ("date_format", _choice(*DATE_FORMATS)),
+		"show_holidays": ("show_holidays", _bool),
+		"weekday_list": ("weekday_list", _str_list),
+		"input_goal_per_worker": ("input_goal_per_worker", _int()),
+		"storage_backend": ("storage_backend", _choice("sqlite", "memory")),
+		"database_file": ("database_file", _path),
+		"shared_database": ("shared_database", _bool),
+		"archive_after_days": ("archive_after_days", _int()),
+		"backup_dir": ("backup_dir", _path),
+		"backup_keep": ("backup_keep", _int(1)),
+		"backup_interval_hours": ("backup_interval_hours", _int()),
+		"query_stats": ("query_stats", _bool),
+		"slow_query_ms": ("slow_query_ms", _int()),
+		"warning_messages": ("Warning-Massages", _messages),
+	}
+	SECTIONS = {
+		"display": DisplaySection,
+		"user_input": UserInputSection,
+		"edit_window": EditWindowSection,
+		"input_window": InputWindowSection,
+	}
+	__slots__ = tuple(FIELDS) + tuple(SECTIONS) + ("error_messages", "errors")
+
+	@classmethod
+	def compile(cls, config: dict, defaults: dict, errors: list) -> "AppConfig":
+		values = {
+			name: _read(config, defaults, key, check, errors)
+			for name, (key, check) in cls.FIELDS.items()
+		}
+		for name, section in cls.SECTIONS.items():
+			values[name] = section.compile(config, defaults, errors)
+
+		# Numbered messages plus the legacy top-level "E00x" codes
+		error_messages = _read(config, defaults, "Error-Massages", _messages, errors)
+		for key in sorted(defaults.keys() | config.keys()):
+			if isinstance(key, str) and re.match(r"E\d{3}$", key):
+				error_messages[key] = _read(config, defaults, key, _message, errors)
+		values["error_messages"] = MappingProxyType(error_messages)
+		values["warning_messages"] = MappingProxyType(values["warning_messages"])
+		values["errors"] = tuple(errors)
+		return cls(**values)
+
+
+def compile_config(config: dict, defaults: dict, strict: bool = True) -> AppConfig:
+	"""
+	Validate a raw config and compile it into frozen section objects.
+
+	Args:
+		config (dict): Raw configuration, e.g. as parsed from JSON.
+		defaults (dict): Default configuration used for missing keys.
+		strict (bool, optional): Raise on errors instead of falling back
+			to the default value of each invalid key.
+
+	Returns:
+		AppConfig: The compiled configuration.
+
+	Raises:
+		ConfigError: If strict and the config has errors.
+	"""
+	errors = []
+	app_config = AppConfig.compile(config, defaults, errors)
+	if strict and errors:
+		raise ConfigError(errors)
+	return app_config
+
+
+if __name__ == "__main__":
+	pass
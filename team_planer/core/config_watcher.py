@@ -0,0 +1,69 @@
+import os
+from PySide6.QtCore import QObject, QTimer, QFileSystemWatcher, Signal
+from team_planer.core import config_manager as cm_mod
+from team_planer.core.config_manager import ConfigManager
+
+
+class ConfigWatcher(QObject):
+	"""Watches config.json and emits the keys that changed on disk."""
+
+	configChanged = Signal(object)
+
+	def __init__(self, debounce_ms: int = 200, parent=None):
+		"""
+		Args:
+			debounce_ms (int, optional): Delay to coalesce bursts of file events.
+			parent (QObject, optional): Qt parent.
+		"""
+		super().__init__(parent)
+		self.config_manager = ConfigManager()
+		self.snapshot = self.config_manager.load_config()
+
+		self.timer = QTimer(self)
+		self.timer.setSingleShot(True)
+		self.timer.setInterval(debounce_ms)
+		self.timer.timeout.connect(self._reload)
+
+		self.watcher = QFileSystemWatcher(self)
+		self.watcher.fileChanged.connect(self._on_file_changed)
+		self._watch()
+
+	def _watch(self) -> None:
+		"""(Re-)register the config file, editors often replace it on save."""
+		path = cm_mod.CONFIG_FILE
+		if os.path.exists(path) and path not in self.watcher.files():
+			self.watcher.addPath(path)
+
+	def _on_file_changed(self, path: str) -> None:
+		self.timer.start()
+
+	def _reload(self) -> None:
+		"""Reload the config and emit the changed keys, if any."""
+		self._watch()
+		try:
+			config = self.config_manager.load_config()
+		except ValueError:
+			# File is mid-write or invalid, keep the last good config
+			return
+		changed = ConfigManager.diff_config(self.snapshot, config)
+		self.snapshot = config
+		if changed:
+			self.configChanged.emit(changed)
+
+
+_watcher = None
+
+
+def get_config_watcher() -> ConfigWatcher:
+	"""
+	Returns:
+		ConfigWatcher: The process-wide config watcher.
+	"""
+	global _watcher
+	if _watcher is None:
+		_watcher = ConfigWatcher()
+	return _watcher
+
+
+if __name__ == "__main__":
+	pass
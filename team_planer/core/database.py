@@ -0,0 +1,287 @@
+import atexit
+import pathlib
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from team_planer.core.query_stats import TimedCursor
+
+# Applied to every new connection, in this order
+PRAGMAS = (
+	("synchronous", "NORMAL"),
+	("cache_size", -8000),       # KiB, ~8 MB page cache per connection
+	("mmap_size", 67108864),     # 64 MB memory mapped reads
+	("temp_store", "MEMORY"),
+	("foreign_keys", "ON"),
+)
+STATEMENT_CACHE_SIZE = 256
+BUSY_TIMEOUT = 5.0    # seconds SQLite itself waits for a lock
+WRITE_RETRIES = 3     # extra BEGIN/COMMIT attempts once the busy timeout ran out
+RETRY_DELAY = 0.25    # seconds, grows with each attempt
+
+
+class Database:
+	"""Long-lived SQLite connections to one database file, one per thread."""
+
+	def __init__(self, path: str, journal_mode: str = "WAL", shared: bool = False):
+		"""
+		Args:
+			path (str): Database file.
+			journal_mode (str, optional): SQLite journal mode for the file.
+			shared (bool, optional): The file is used from several computers,
+				e.g. on a network share. WAL and memory mapped reads need
+				memory shared between the clients, so a rollback journal is
+				used instead.
+		"""
+		self.path = path
+		self.shared = shared
+		self.journal_mode = "DELETE" if shared else journal_mode
+		self.local = threading.local()
+		self.lock = threading.Lock()
+		self.connections = []
+		# name -> URI of attached databases, applied to every connection
+		self.attachments = {}
+		self.attachments_version = 0
+		# QueryStats that execute() reports to while it is enabled
+		self.stats = None
+
+	def connection(self) -> sqlite3.Connection:
+		"""
+		Returns:
+			sqlite3.Connection: The calling thread's connection, opened on first use.
+		"""
+		connection = getattr(self.local, "connection", None)
+		if connection is None:
+			connection = self._connect()
+			self.local.connection = connection
+			with self.lock:
+				self.connections.append(connection)
+		if getattr(self.local, "attachments_version", 0) != self.attachments_version and not connection.in_transaction:
+			self._sync_attachments(connection)
+		return connection
+
+	def _sync_attachments(self, connection: sqlite3.Connection) -> None:
+		"""Attach and detach on the calling thread's connection to match self.attachments."""
+		with self.lock:
+			wanted = dict(self.attachments)
+			version = self.attachments_version
+		attached = getattr(self.local, "attached", {})
+		for name, uri in attached.items():
+			if wanted.get(name) != uri:
+				connection.execute(f"DETACH DATABASE {name}")
+		for name, uri in list(wanted.items()):
+			if attached.get(name) != uri:
+				try:
+					connection.execute(f"ATTACH DATABASE ? AS {name}", (uri,))
+				except sqlite3.Error:
+					# e.g. the file was removed; queries on it fail on their own
+					del wanted[name]
+		self.local.attached = wanted
+		self.local.attachments_version = version
+
+	def attach(self, name: str, path: str, readonly: bool = True) -> None:
+		"""
+		Make another database file available as `name` on every connection.
+
+		Connections pick the change up on their next use outside a
+		transaction. Attaching the same file again is a no-op.
+
+		Args:
+			name (str): Schema name, e.g. "archive".
+			path (str): Database file.
+			readonly (bool, optional): Open the file read-only.
+		"""
+		uri = pathlib.Path(path).absolute().as_uri() + ("?mode=ro" if readonly else "")
+		with self.lock:
+			if self.attachments.get(name) == uri:
+				return
+			self.attachments[name] = uri
+			self.attachments_version += 1
+
+	def detach(self, name: str) -> None:
+		"""Undo attach(); connections detach on their next use."""
+		with self.lock:
+			if self.attachments.pop(name, None) is not None:
+				self.attachments_version += 1
+
+	def is_attached(self, name: str) -> bool:
+		return name in self.attachments
+
+	def _connect(self) -> sqlite3.Connection:
+		"""Open and tune a new connection."""
+		connection = sqlite3.connect(
+			self.path,
+			isolation_level=None,  # transactions are explicit, see transaction()
+			check_same_thread=False,
+			cached_statements=STATEMENT_CACHE_SIZE,
+			timeout=BUSY_TIMEOUT,
+			uri=True  # for ATTACH with mode=ro; plain paths are unaffected
+		)
+		_retry(connection, f"PRAGMA journal_mode = {self.journal_mode}")
+		for name, value in PRAGMAS:
+			if self.shared and name == "mmap_size":
+				value = 0
+			connection.execute(f"PRAGMA {name} = {value}")
+		return connection
+
+	def execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+		"""
+		Run one statement on the calling thread's connection.
+
+		Args:
+			sql (str): SQL statement; keep it constant so it hits the statement cache.
+			params (tuple, optional): Bound parameters.
+
+		Returns:
+			sqlite3.Cursor: The cursor, wrapped in a TimedCursor while `stats`
+				is set and enabled.
+		"""
+		stats = self.stats
+		if stats is None or not stats.enabled:
+			return self.connection().execute(sql, params)
+		started = time.perf_counter()
+		cursor = self.connection().execute(sql, params)
+		return TimedCursor(cursor, stats, sql, time.perf_counter() - started)
+
+	@contextmanager
+	def transaction(self):
+		"""
+		Run the block in one write transaction; nested use joins the outer one.
+
+		Taking the write lock and committing are retried WRITE_RETRIES times
+		when another client holds the database longer than BUSY_TIMEOUT.
+
+		Yields:
+			sqlite3.Connection: The calling thread's connection.
+		"""
+		connection = self.connection()
+		if connection.in_transaction:
+			yield connection
+			return
+		_retry(connection, "BEGIN IMMEDIATE")
+		try:
+			yield connection
+			_retry(connection, "COMMIT")
+		except BaseException:
+			if connection.in_transaction:
+				connection.execute("ROLLBACK")
+			raise
+
+	def data_version(self) -> int:
+		"""
+		Returns:
+			int: Changes whenever another connection, in this or any other
+				process, committed to the file since the last call.
+		"""
+		return self.execute("PRAGMA data_version").fetchone()[0]
+
+	def incremental_vacuum(self) -> int:
+		"""
+		Give the free pages of the file back to the file system.
+
+		Needs auto_vacuum = INCREMENTAL, see Archiver.run().
+
+		Returns:
+			int: Number of pages freed.
+		"""
+		freed = self.execute("PRAGMA freelist_count").fetchone()[0]
+		self.execute("PRAGMA incremental_vacuum").fetchall()
+		return freed
+
+	def checkpoint(self) -> None:
+		"""Fold the WAL back into the database file and truncate it."""
+		if self.journal_mode.upper() == "WAL":
+			self.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+	def release(self) -> None:
+		"""
+		Close the calling thread's connection, if it has one.
+
+		Call at the end of short-lived worker threads; connections are
+		otherwise kept until close(). A later use on the same thread opens
+		a new connection. An open transaction is rolled back.
+		"""
+		connection = getattr(self.local, "connection", None)
+		if connection is None:
+			return
+		self.local.connection = None
+		self.local.attached = {}
+		self.local.attachments_version = 0
+		with self.lock:
+			if connection in self.connections:
+				self.connections.remove(connection)
+		connection.close()
+
+	def close(self) -> None:
+		"""Checkpoint and close all connections of this database."""
+		try:
+			self.checkpoint()
+		except sqlite3.Error:
+			pass
+		with self.lock:
+			for connection in self.connections:
+				connection.close()
+			self.connections.clear()
+		self.local = threading.local()
+
+
+def is_busy(error: Exception) -> bool:
+	"""
+	Returns:
+		bool: True if the error means another connection holds a lock.
+	"""
+	return isinstance(error, sqlite3.OperationalError) and (
+		(getattr(error, "sqlite_errorcode", 0) & 0xFF) in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+		or "locked" in str(error)
+	)
+
+
+def _retry(connection: sqlite3.Connection, sql: str) -> sqlite3.Cursor:
+	"""Run a locking statement, retrying with a growing delay while the file is busy."""
+	for attempt in range(WRITE_RETRIES + 1):
+		try:
+			return connection.execute(sql)
+		except sqlite3.OperationalError as ex:
+			if attempt == WRITE_RETRIES or not is_busy(ex):
+				raise
+			time.sleep(RETRY_DELAY * (attempt + 1))
+
+
+_databases = {}
+_databases_lock = threading.Lock()
+
+
+def get_database(path: str, shared: bool = False) -> Database:
+	"""
+	Get the process-wide Database for a file.
+
+	Args:
+		path (str): Database file.
+		shared (bool, optional): Multi-client mode, see Database. Only
+			used when the file is opened for the first time.
+
+	Returns:
+		Database: Shared instance for that path.
+	"""
+	with _databases_lock:
+		database = _databases.get(path)
+		if database is None:
+			database = Database(path, shared=shared)
+			_databases[path] = database
+		return database
+
+
+def close_databases() -> None:
+	"""Shutdown hook: checkpoint and close every open database."""
+	with _databases_lock:
+		databases = list(_databases.values())
+		_databases.clear()
+	for database in databases:
+		database.close()
+
+
+atexit.register(close_databases)
+
+
+if __name__ == "__main__":
+	pass
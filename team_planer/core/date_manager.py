@@ -8,8 +8,7 @@ class DateManager:
 	def __init__(self):
 		"""Load config and set the active date format."""
 		self.config_manager = ConfigManager()
-		config = self.config_manager.load_config()
-		self.date_format = config["date_format"]
+		self.date_format = self.config_manager.load_settings().date_format
 
 	# TODO: implement the other date formats
 	def get_date_str(self, day: int = 0, date_format: str | None = None) -> str:
@@ -84,5 +83,47 @@ class DateManager:
 		else:
 			return ["format error" * 7]
 
+	@staticmethod
+	def to_iso_date(date: str) -> str:
+		"""
+		Convert a stored 'dd.mm.yyyy' date to ISO-8601.
+
+		Args:
+			date (str): Date like "18.09.2025".
+
+		Returns:
+			str: Date like "2025-09-18".
+		"""
+		return f"{date[6:10]}-{date[3:5]}-{date[0:2]}"
+
+	@staticmethod
+	def from_iso_date(iso_date: str) -> str:
+		"""
+		Convert an ISO-8601 date to the stored 'dd.mm.yyyy' form.
+
+		Args:
+			iso_date (str): Date like "2025-09-18".
+
+		Returns:
+			str: Date like "18.09.2025".
+		"""
+		return f"{iso_date[8:10]}.{iso_date[5:7]}.{iso_date[0:4]}"
+
+	@staticmethod
+	def week_offset(date: str) -> int:
+		"""
+		Get the week offset of a date as used by get_date_str_list.
+
+		Args:
+			date (str): Date like "18.09.2025".
+
+		Returns:
+			int: Weeks from the current week (0 = current, negative = past).
+		"""
+		target = dt.date.fromisoformat(DateManager.to_iso_date(date))
+		today = dt.date.today()
+		monday = today - dt.timedelta(today.weekday())
+		return (target - dt.timedelta(target.weekday()) - monday).days // 7
+
 if __name__ == "__main__":
 	pass
\ No newline at end of file
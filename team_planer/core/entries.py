@@ -0,0 +1,300 @@
+import re
+import json
+from decimal import Decimal, ROUND_HALF_UP
+
+# Optional sign, "." or "," as decimal mark, any number of decimals
+_AMOUNT = re.compile(r"[+-]?(?:\d+(?:[.,]\d*)?|[.,]\d+)$")
+
+
+class Item:
+	"""One line of a block; amount_cents is set for calc lines."""
+
+	__slots__ = ("label", "amount_cents")
+
+	def __init__(self, label: str, amount_cents: int | None = None):
+		self.label = label
+		self.amount_cents = amount_cents
+
+	def __eq__(self, other):
+		return isinstance(other, Item) and (self.label, self.amount_cents) == (other.label, other.amount_cents)
+
+	def __repr__(self):
+		return f"Item({self.label!r}, {self.amount_cents!r})"
+
+
+class Block:
+	"""
+	One field of an entry.
+
+	Attributes:
+		kind (str): "text", "worker", "calc" or a custom field kind.
+		goal_cents (int | None): Number given with the kind, e.g. "calc#1000".
+		header (str | None): Fixed header of the field.
+		items (list[Item]): Entered lines.
+	"""
+
+	__slots__ = ("kind", "goal_cents", "header", "items")
+
+	def __init__(self, kind: str, goal_cents: int | None = None, header: str | None = None, items: list | None = None):
+		self.kind = kind
+		self.goal_cents = goal_cents
+		self.header = header
+		self.items = items if items is not None else []
+
+	def __eq__(self, other):
+		return isinstance(other, Block) and (
+			(self.kind, self.goal_cents, self.header, self.items)
+			== (other.kind, other.goal_cents, other.header, other.items)
+		)
+
+	def __repr__(self):
+		return f"Block({self.kind!r}, {self.goal_cents!r}, {self.header!r}, {self.items!r})"
+
+
+def parse_cents(text: str) -> int:
+	"""
+	Parse an amount like "123", "-123.5" or "123,50" without going through float.
+
+	More than two decimals are rounded half up to whole cents.
+
+	Returns:
+		int: Amount in cents.
+
+	Raises:
+		ValueError: If the text is not an amount.
+	"""
+	text = text.strip()
+	if not _AMOUNT.match(text):
+		raise ValueError(f"not an amount: {text!r}")
+	return int((Decimal(text.replace(",", ".")) * 100).to_integral_value(ROUND_HALF_UP))
+
+
+def format_cents(cents: int) -> str:
+	"""Format cents as "123.50" or "-123.50"."""
+	sign = "-" if cents < 0 else ""
+	cents = abs(cents)
+	return f"{sign}{cents // 100}.{cents % 100:02d}"
+
+
+def _format_goal(cents: int) -> str:
+	return str(cents // 100) if cents % 100 == 0 else format_cents(cents)
+
+
+def parse_calc_line(line: str) -> Item:
+	"""
+	Split a calc line like "Customer#123.50" at its last "#".
+
+	Returns:
+		Item: Label and amount in cents.
+
+	Raises:
+		ValueError: If the line has no "#" or no amount after it.
+	"""
+	label, sep, amount = line.rpartition("#")
+	if not sep:
+		raise ValueError(f"no amount in {line!r}")
+	return Item(label, parse_cents(amount))
+
+
+def unreadable_amounts(text_memory: list[list[str]]) -> list[str]:
+	"""
+	Returns:
+		list[str]: Calc lines of the editor's lists without a readable
+			amount; blocks_from_text_memory() keeps them as plain text.
+	"""
+	return [
+		item.label
+		for block in blocks_from_text_memory(text_memory) if block.kind == "calc"
+		for item in block.items if item.amount_cents is None
+	]
+
+
+def check_amounts(text_memory: list[list[str]]) -> None:
+	"""
+	Refuse content that would lose amounts, before it is written.
+
+	Raises:
+		ValueError: If a calc line has no readable amount.
+	"""
+	lines = unreadable_amounts(text_memory)
+	if lines:
+		raise ValueError(f"calc lines without a readable amount: {lines!r}")
+
+
+def blocks_from_text_memory(text_memory: list[list[str]]) -> list[Block]:
+	"""
+	Convert the editor's nested lists into blocks.
+
+	A list looks like ["calc#1000", "*Header", "Customer#123.50", ...]: the
+	kind with an optional number, an optional "*" header and the lines.
+	"""
+	blocks = []
+	for raw in text_memory:
+		if not raw:
+			continue
+		kind, _, goal = str(raw[0]).partition("#")
+		try:
+			goal_cents = parse_cents(goal) if goal else None
+		except ValueError:
+			kind, goal_cents = str(raw[0]), None
+		block = Block(kind, goal_cents)
+		lines = [str(line) for line in raw[1:]]
+		if lines and lines[0].startswith("*"):
+			block.header = lines[0][1:]
+			lines = lines[1:]
+		for line in lines:
+			if kind == "calc":
+				# Unreadable amounts stay visible as text, see check_amounts()
+				try:
+					block.items.append(parse_calc_line(line))
+				except ValueError:
+					block.items.append(Item(line))
+			else:
+				block.items.append(Item(line))
+		blocks.append(block)
+	return blocks
+
+
+def text_memory_from_blocks(blocks: list[Block]) -> list[list[str]]:
+	"""Inverse of blocks_from_text_memory, for the input and edit windows."""
+	text_memory = []
+	for block in blocks:
+		kind = block.kind if block.goal_cents is None else f"{block.kind}#{_format_goal(block.goal_cents)}"
+		raw = [kind]
+		if block.header is not None:
+			raw.append(f"*{block.header}")
+		for item in block.items:
+			if item.amount_cents is None:
+				raw.append(item.label)
+			else:
+				raw.append(f"{item.label}#{format_cents(item.amount_cents)}")
+		text_memory.append(raw)
+	return text_memory
+
+
+def entry_facts(blocks: list[Block]) -> tuple[int, int, bool]:
+	"""
+	Figures of an entry as used for reports, mirroring UserInput.
+
+	Returns:
+		tuple[int, int, bool]: Revenue in cents, number of workers, and
+			whether the entry is a tour checked against the worker goal.
+	"""
+	revenue_cents = workers = 0
+	tour = False
+	for block in blocks:
+		if block.kind == "worker":
+			workers = len(block.items)
+		elif block.kind == "calc":
+			tour = tour or workers > 0
+			revenue_cents += sum(item.amount_cents or 0 for item in block.items)
+	return revenue_cents, workers, tour
+
+
+def write_facts(db: object, entry_id: int, iso_date: str, blocks: list[Block]) -> None:
+	"""
+	Insert or replace the report facts of an entry. Call inside a transaction.
+
+	The summary tables follow through triggers; the goal is taken from
+	report_meta so it always matches the last sync_goal().
+	"""
+	if iso_date is None:
+		# Legacy rows without a readable date are not reported
+		return
+	revenue_cents, workers, tour = entry_facts(blocks)
+	db.execute("""
+		INSERT INTO entry_facts (entry_id, iso_date, revenue_cents, workers, tour, goal_cents)
+		VALUES (:id, :iso_date, :revenue, :workers, :tour, CASE WHEN :tour THEN :workers * (
+			SELECT value FROM report_meta WHERE key = 'goal_cents_per_worker'
+		) END)
+		ON CONFLICT (entry_id) DO UPDATE SET
+			iso_date = excluded.iso_date,
+			revenue_cents = excluded.revenue_cents,
+			workers = excluded.workers,
+			tour = excluded.tour,
+			goal_cents = excluded.goal_cents
+	""", {"id": entry_id, "iso_date": iso_date, "revenue": revenue_cents, "workers": workers, "tour": int(tour)})
+
+
+def search_text(entry_type: str, blocks: list[Block]) -> str:
+	"""Text of an entry as indexed for full-text search: type, headers and lines."""
+	lines = [entry_type or ""]
+	for block in blocks:
+		if block.header is not None:
+			lines.append(block.header)
+		lines.extend(item.label for item in block.items)
+	return "\n".join(lines)
+
+
+def index_entry(db: object, entry_id: int, entry_type: str, blocks: list[Block]) -> None:
+	"""
+	(Re-)index one entry in entry_search. Call inside a transaction.
+
+	Args:
+		db (Database): Target database.
+		entry_id (int): Row id in user_inputs, used as the FTS rowid.
+		entry_type (str): Input type name.
+		blocks (list[Block]): Content of the entry.
+	"""
+	db.execute("DELETE FROM entry_search WHERE rowid = ?", (entry_id,))
+	db.execute(
+		"INSERT INTO entry_search (rowid, body) VALUES (?, ?)",
+		(entry_id, search_text(entry_type, blocks))
+	)
+
+
+def insert_blocks(db: object, entry_id: int, blocks: list[Block]) -> None:
+	"""
+	Write the blocks of an entry. Call inside a transaction.
+
+	Args:
+		db (Database): Target database.
+		entry_id (int): Row id in user_inputs.
+		blocks (list[Block]): Blocks in display order.
+	"""
+	for position, block in enumerate(blocks):
+		block_id = db.execute("""
+			INSERT INTO entry_blocks (entry_id, position, kind, goal_cents, header)
+			VALUES (?, ?, ?, ?, ?)
+		""", (entry_id, position, block.kind, block.goal_cents, block.header)).lastrowid
+		db.connection().executemany("""
+			INSERT INTO entry_items (block_id, position, label, amount_cents)
+			VALUES (?, ?, ?, ?)
+		""", [
+			(block_id, item_position, item.label, item.amount_cents)
+			for item_position, item in enumerate(block.items)
+		])
+
+
+def read_blocks(db: object, entry_ids: list[int]) -> dict[int, list[Block]]:
+	"""
+	Content of entries straight from their blocks and items.
+
+	Args:
+		db (Database): Database to read.
+		entry_ids (list[int]): Entries of the main database.
+
+	Returns:
+		dict[int, list[Block]]: Blocks in display order per entry; entries
+			without blocks are left out.
+	"""
+	entries = {}
+	blocks = {}
+	for entry_id, block_id, kind, goal_cents, header, label, amount_cents in db.execute("""
+		SELECT b.entry_id, b.id, b.kind, b.goal_cents, b.header, i.label, i.amount_cents
+		FROM entry_blocks AS b
+		LEFT JOIN entry_items AS i ON i.block_id = b.id
+		WHERE b.entry_id IN (SELECT value FROM json_each(?))
+		ORDER BY b.entry_id, b.position, i.position
+	""", (json.dumps(list(entry_ids)),)):
+		block = blocks.get(block_id)
+		if block is None:
+			block = blocks[block_id] = Block(kind, goal_cents, header)
+			entries.setdefault(entry_id, []).append(block)
+		if label is not None:
+			block.items.append(Item(label, amount_cents))
+	return entries
+
+
+if __name__ == "__main__":
+	pass
@@ -0,0 +1,216 @@
+import atexit
+import queue
+import threading
+import time
+from PySide6.QtCore import QObject, Signal
+from team_planer.core.date_manager import DateManager
+from team_planer.core.entries import check_amounts
+from team_planer.core.storage_backend import StorageBackend, create_storage
+
+GROUP_WINDOW = 0.01  # seconds to wait for more writes before committing
+MAX_BATCH = 200
+
+
+class WriteTicket:
+	"""Handle of one queued write, filled in by the writer thread."""
+
+	__slots__ = ("kind", "entry", "args", "entry_id", "iso_date", "result", "error")
+
+	def __init__(self, kind: str, entry: "int | WriteTicket | None", args: tuple):
+		"""
+		Args:
+			kind (str): "insert", "update", "delete", "undo" or "redo".
+			entry (int | WriteTicket | None): Target row, or the ticket of a
+				queued insert whose id is not known yet.
+			args (tuple): Arguments for the StorageBackend call.
+		"""
+		self.kind = kind
+		self.entry = entry
+		self.args = args
+		self.entry_id = None
+		self.iso_date = None
+		self.result = None
+		self.error = None
+
+	def __repr__(self):
+		return f"WriteTicket({self.kind!r}, entry_id={self.entry_id!r})"
+
+
+class EntryWriter(QObject):
+	"""
+	Single background writer for entry inserts, updates, deletes and
+	undo/redo steps.
+
+	Writes that arrive within GROUP_WINDOW of each other are committed in
+	one transaction, so a burst of saves costs one fsync. Queue order is
+	kept, which lets an update or delete target an insert that is still
+	pending and lets undo see every change queued before it.
+	"""
+
+	writeDone = Signal(object)
+	writeFailed = Signal(object, object)
+
+	_STOP = object()
+
+	def __init__(self, storage_manager: StorageBackend | None = None, parent=None):
+		"""
+		Args:
+			storage_manager (StorageBackend, optional): Target storage, the
+				configured one by default.
+			parent (QObject, optional): Qt parent.
+		"""
+		super().__init__(parent)
+		self.storage_manager = storage_manager or create_storage()
+		self.queue = queue.Queue()
+		self.thread = None
+		self.lock = threading.Lock()
+
+	def insert(self, date: str, text_memory: list[list[str]], settings: list[str]) -> WriteTicket:
+		"""Queue a new entry. ticket.entry_id holds the row id once written."""
+		return self._submit(WriteTicket("insert", None, (date, text_memory, settings)))
+
+	def update(self, entry: "int | WriteTicket", text_memory: list[list[str]], settings: list[str]) -> WriteTicket:
+		"""Queue a content change of an entry."""
+		return self._submit(WriteTicket("update", entry, (text_memory, settings)))
+
+	def delete(self, entry: "int | WriteTicket") -> WriteTicket:
+		"""Queue the removal of an entry."""
+		return self._submit(WriteTicket("delete", entry, ()))
+
+	def undo(self) -> WriteTicket:
+		"""Queue an undo. ticket.result holds the JournalStep, None if nothing was undone."""
+		return self._submit(WriteTicket("undo", None, ()))
+
+	def redo(self) -> WriteTicket:
+		"""Queue a redo. ticket.result holds the JournalStep, None if nothing was redone."""
+		return self._submit(WriteTicket("redo", None, ()))
+
+	def _submit(self, ticket: WriteTicket) -> WriteTicket:
+		with self.lock:
+			if self.thread is None:
+				self.thread = threading.Thread(target=self._run, name="EntryWriter", daemon=True)
+				self.thread.start()
+		self.queue.put(ticket)
+		return ticket
+
+	def flush(self, timeout: float | None = None) -> None:
+		"""Block until every queued write is committed."""
+		if self.thread is not None:
+			self.queue.all_tasks_done.acquire()
+			try:
+				end = None if timeout is None else time.monotonic() + timeout
+				while self.queue.unfinished_tasks:
+					remaining = None if end is None else end - time.monotonic()
+					if remaining is not None and remaining <= 0:
+						return
+					self.queue.all_tasks_done.wait(remaining)
+			finally:
+				self.queue.all_tasks_done.release()
+
+	def close(self) -> None:
+		"""Commit the remaining writes and stop the thread."""
+		with self.lock:
+			thread, self.thread = self.thread, None
+		if thread is not None:
+			self.queue.put(self._STOP)
+			thread.join()
+
+	def _run(self) -> None:
+		while True:
+			batch = [self.queue.get()]
+			deadline = time.monotonic() + GROUP_WINDOW
+			while batch[-1] is not self._STOP and len(batch) < MAX_BATCH:
+				remaining = deadline - time.monotonic()
+				try:
+					batch.append(self.queue.get(timeout=max(remaining, 0)))
+				except queue.Empty:
+					break
+			stop = batch[-1] is self._STOP
+			tickets = [ticket for ticket in batch if ticket is not self._STOP]
+			if tickets:
+				self._commit(tickets)
+			for _ in batch:
+				self.queue.task_done()
+			if stop:
+				return
+
+	def _commit(self, tickets: list[WriteTicket]) -> None:
+		"""Write a batch in one transaction, falling back to one per ticket."""
+		storage = self.storage_manager
+		try:
+			with storage.transaction():
+				for ticket in tickets:
+					self._apply(ticket)
+		except Exception:
+			# Isolate the failing write so the rest of the batch is kept
+			for ticket in tickets:
+				ticket.entry_id = ticket.iso_date = ticket.result = ticket.error = None
+				try:
+					with storage.transaction():
+						self._apply(ticket)
+				except Exception as ex:
+					ticket.error = ex
+		# Only after the commit, so a concurrent load cannot re-cache old rows
+		self.storage_manager.week_cache.invalidate(
+			ticket.iso_date for ticket in tickets if ticket.error is None
+		)
+		for ticket in tickets:
+			if ticket.error is None:
+				self.writeDone.emit(ticket)
+			else:
+				self.writeFailed.emit(ticket, ticket.error)
+
+	def _apply(self, ticket: WriteTicket) -> None:
+		storage = self.storage_manager
+		if ticket.kind == "insert":
+			check_amounts(ticket.args[1])
+			ticket.entry_id = storage.insert_entry(*ticket.args)
+			ticket.iso_date = DateManager.to_iso_date(ticket.args[0])
+			ticket.result = True
+			return
+		if ticket.kind in ("undo", "redo"):
+			step = getattr(storage.journal, ticket.kind)()
+			if step is not None:
+				ticket.entry_id = step.entry_id
+				ticket.iso_date = step.iso_date
+			ticket.result = step
+			return
+		entry = ticket.entry
+		if isinstance(entry, WriteTicket):
+			if entry.entry_id is None:
+				raise LookupError(f"{entry!r} was not written")
+			entry = entry.entry_id
+		ticket.entry_id = entry
+		if ticket.kind == "update":
+			check_amounts(ticket.args[0])
+			ticket.iso_date = storage.update_entry(entry, *ticket.args)
+		else:
+			ticket.iso_date = storage.delete_entry(entry)
+		ticket.result = ticket.iso_date is not None
+
+
+_writer = None
+
+
+def get_entry_writer() -> EntryWriter:
+	"""
+	Returns:
+		EntryWriter: The process-wide entry writer.
+	"""
+	global _writer
+	if _writer is None:
+		_writer = EntryWriter()
+	return _writer
+
+
+def close_entry_writer() -> None:
+	"""Shutdown hook: commit pending writes before the databases close."""
+	if _writer is not None:
+		_writer.close()
+
+
+atexit.register(close_entry_writer)
+
+
+if __name__ == "__main__":
+	pass
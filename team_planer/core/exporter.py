@@ -0,0 +1,272 @@
+import io
+import sys
+import csv
+import json
+import argparse
+import datetime as dt
+from typing import Iterator
+from team_planer.core.migrations import migrate
+from team_planer.core.date_manager import DateManager
+from team_planer.core.entries import entry_facts, format_cents
+
+FORMATS = ("csv", "jsonl", "ics")
+BUFFER_BYTES = 1 << 20   # output is flushed in chunks of this size
+# Spreadsheet friendly for the German locale: ";" separated, decimal comma
+CSV_DELIMITER = ";"
+CSV_COLUMNS = ("id", "date", "type", "field", "kind", "label", "amount")
+ICS_TYPES = ("Termin",)
+
+
+def _amount(cents: int | None) -> str:
+	"""Format cents like "1234,50" for the CSV export."""
+	return "" if cents is None else format_cents(cents).replace(".", ",")
+
+
+def csv_rows(entries) -> Iterator[tuple]:
+	"""
+	One row per entry line, so amounts can be summed directly.
+
+	Args:
+		entries (Iterable[Entry]): Entries in date order.
+
+	Yields:
+		tuple: Values in CSV_COLUMNS order; entries without lines give one
+			row with empty fields.
+	"""
+	for entry in entries:
+		entry_type = entry.settings[0] if entry.settings else ""
+		empty = True
+		for block in entry.blocks:
+			for item in block.items:
+				empty = False
+				yield (
+					entry.id, entry.iso_date, entry_type, block.header or "", block.kind,
+					item.label, _amount(item.amount_cents)
+				)
+		if empty:
+			yield (entry.id, entry.iso_date, entry_type, "", "", "", "")
+
+
+def json_records(entries) -> Iterator[dict]:
+	"""
+	Args:
+		entries (Iterable[Entry]): Entries in date order.
+
+	Yields:
+		dict: One JSON-ready record per entry.
+	"""
+	for entry in entries:
+		revenue_cents, workers, _ = entry_facts(entry.blocks)
+		yield {
+			"id": entry.id,
+			"date": entry.iso_date,
+			"type": entry.settings[0] if entry.settings else None,
+			"settings": entry.settings,
+			"blocks": [
+				{
+					"kind": block.kind,
+					"goal_cents": block.goal_cents,
+					"header": block.header,
+					"items": [{"label": item.label, "amount_cents": item.amount_cents} for item in block.items]
+				}
+				for block in entry.blocks
+			],
+			"revenue_cents": revenue_cents,
+			"workers": workers
+		}
+
+
+def _ics_text(text: str) -> str:
+	"""Escape a TEXT value (RFC 5545, 3.3.11)."""
+	return (
+		text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+		.replace("\r\n", "\\n").replace("\n", "\\n")
+	)
+
+
+def _ics_line(line: str) -> str:
+	"""Fold a content line at 75 octets and terminate it with CRLF."""
+	data = line.encode("utf-8")
+	if len(data) <= 75:
+		return line + "\r\n"
+	parts, start, limit = [], 0, 75
+	while start < len(data):
+		end = min(start + limit, len(data))
+		# Never split a UTF-8 sequence
+		while end < len(data) and (data[end] & 0xC0) == 0x80:
+			end -= 1
+		parts.append(data[start:end].decode("utf-8"))
+		start, limit = end, 74
+	return "\r\n ".join(parts) + "\r\n"
+
+
+def ics_lines(entries, types: tuple = ICS_TYPES, stamp: dt.datetime | None = None) -> Iterator[str]:
+	"""
+	An iCalendar file with one all-day event per appointment entry.
+
+	The first line of the entry is the summary; all lines, including a
+	free-text time, go into the description.
+
+	Args:
+		entries (Iterable[Entry]): Entries in date order.
+		types (tuple, optional): Input types exported as events.
+		stamp (datetime, optional): DTSTAMP of all events, defaults to now.
+
+	Yields:
+		str: CRLF terminated, folded content lines.
+	"""
+	stamp = (stamp or dt.datetime.now(dt.timezone.utc)).strftime("%Y%m%dT%H%M%SZ")
+	yield _ics_line("BEGIN:VCALENDAR")
+	yield _ics_line("VERSION:2.0")
+	yield _ics_line("PRODID:-//TeamPlaner//Export//DE")
+	for entry in entries:
+		if not entry.settings or entry.settings[0] not in types:
+			continue
+		lines = []
+		for block in entry.blocks:
+			labels = [item.label for item in block.items]
+			if block.header is not None:
+				lines.append(f"{block.header}: {', '.join(labels)}")
+			else:
+				lines.extend(labels)
+		description = "\n".join(lines)
+		day = dt.date.fromisoformat(entry.iso_date)
+		yield _ics_line("BEGIN:VEVENT")
+		yield _ics_line(f"UID:entry-{entry.id}@teamplaner")
+		yield _ics_line(f"DTSTAMP:{stamp}")
+		yield _ics_line(f"DTSTART;VALUE=DATE:{day:%Y%m%d}")
+		yield _ics_line(f"DTEND;VALUE=DATE:{day + dt.timedelta(1):%Y%m%d}")
+		yield _ics_line(f"SUMMARY:{_ics_text(next((line for line in lines if line), entry.settings[0]))}")
+		if description:
+			yield _ics_line(f"DESCRIPTION:{_ics_text(description)}")
+		yield _ics_line("END:VEVENT")
+	yield _ics_line("END:VCALENDAR")
+
+
+class _Counter:
+	"""Passes entries through and counts them."""
+
+	def __init__(self, entries):
+		self.entries = entries
+		self.count = 0
+
+	def __iter__(self):
+		for entry in self.entries:
+			self.count += 1
+			yield entry
+
+
+def write_export(entries, output: io.TextIOBase, export_format: str) -> int:
+	"""
+	Stream entries into an open text file.
+
+	Args:
+		entries (Iterable[Entry]): Entries in date order, e.g. from
+			StorageBackend.iter_entries.
+		output (TextIOBase): Target, opened with newline="".
+		export_format (str): One of FORMATS.
+
+	Returns:
+		int: Number of exported entries.
+	"""
+	counted = _Counter(entries)
+	if export_format == "csv":
+		writer = csv.writer(output, delimiter=CSV_DELIMITER)
+		writer.writerow(CSV_COLUMNS)
+		writer.writerows(csv_rows(counted))
+	elif export_format == "jsonl":
+		for record in json_records(counted):
+			output.write(json.dumps(record, ensure_ascii=False))
+			output.write("\n")
+	elif export_format == "ics":
+		output.writelines(ics_lines(counted))
+	else:
+		raise ValueError(f"unknown export format: {export_format!r}")
+	return counted.count
+
+
+def format_of(path: str) -> str:
+	"""
+	Returns:
+		str: Export format matching the file extension, "csv" by default.
+	"""
+	extension = path.rpartition(".")[2].lower()
+	return extension if extension in FORMATS else "csv"
+
+
+def export(storage_manager: object, start: dt.date | str, end: dt.date | str, path: str,
+		   export_format: str | None = None) -> int:
+	"""
+	Export the entries of a date range to a file.
+
+	Entries are read with one streaming query and written through a
+	BUFFER_BYTES buffer, so memory use does not grow with the range.
+
+	Args:
+		storage_manager (StorageBackend): Source of the entries.
+		start (date | str): First day, as date or "dd.mm.yyyy".
+		end (date | str): Last day (inclusive).
+		path (str): Target file, "-" for standard output.
+		export_format (str | None, optional): One of FORMATS, taken from
+			the file extension by default.
+
+	Returns:
+		int: Number of exported entries.
+
+	Raises:
+		OSError: If the file cannot be written.
+		sqlite3.Error: If the database cannot be read.
+	"""
+	export_format = export_format or format_of(path)
+	entries = storage_manager.iter_entries(start, end)
+	if path == "-":
+		return write_export(entries, sys.stdout, export_format)
+	# Excel only detects UTF-8 CSV files by their BOM
+	encoding = "utf-8-sig" if export_format == "csv" else "utf-8"
+	with open(path, "w", encoding=encoding, newline="", buffering=BUFFER_BYTES) as output:
+		return write_export(entries, output, export_format)
+
+
+def _parse_date(text: str) -> dt.date:
+	try:
+		return dt.date.fromisoformat(text)
+	except ValueError:
+		pass
+	try:
+		return dt.date.fromisoformat(DateManager.to_iso_date(text))
+	except (ValueError, IndexError):
+		raise argparse.ArgumentTypeError(f"not a date: {text!r}")
+
+
+def main(argv: list[str] | None = None) -> int:
+	"""
+	Command line export, e.g.
+
+		python -m team_planer.core.exporter --from 2020-01-01 --to 2024-12-31 plans.csv
+
+	Returns:
+		int: Exit code.
+	"""
+	from team_planer.core.storage_manager import StorageManager
+
+	parser = argparse.ArgumentParser(
+		prog="python -m team_planer.core.exporter",
+		description="Export the entries of a date range as CSV, JSON Lines or iCalendar."
+	)
+	parser.add_argument("output", help="target file (.csv, .jsonl, .ics), - for standard output")
+	parser.add_argument("--from", dest="start", type=_parse_date, required=True, help="first day, yyyy-mm-dd or dd.mm.yyyy")
+	parser.add_argument("--to", dest="end", type=_parse_date, required=True, help="last day (inclusive)")
+	parser.add_argument("--format", choices=FORMATS, help="output format, taken from the file extension by default")
+	parser.add_argument("--db", help="database file, defaults to the configured one")
+	args = parser.parse_args(argv)
+
+	storage_manager = StorageManager(db_file=args.db)
+	migrate(storage_manager.db)
+	count = export(storage_manager, args.start, args.end, args.output, args.format)
+	if args.output != "-":
+		print(f"{count} entries written to {args.output}")
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,210 @@
+import re
+import json
+import datetime as dt
+from collections import Counter
+from team_planer.core.entries import read_blocks, text_memory_from_blocks
+
+SCAN_BATCH = 500      # entries read and checked per transaction
+REPORT_EXAMPLES = 20  # quarantined and unreadable entries listed by id in the summary
+_DATE = re.compile(r"\d\d\.\d\d\.\d{4}$")
+
+
+def settings_problem(settings: object) -> str | None:
+	"""
+	Args:
+		settings (object): Decoded settings of an input type.
+
+	Returns:
+		str | None: Why an entry with these settings cannot be shown, None
+			if they are usable: a list of name, priority and two colors.
+	"""
+	if not isinstance(settings, list) or len(settings) < 4:
+		return "settings are not a list of name, priority and two colors"
+	if not all(isinstance(settings[i], str) for i in (0, 2, 3)):
+		return "type name or colors are not text"
+	return None
+
+
+def decode_settings(text: str | None) -> list | None:
+	"""
+	Returns:
+		list | None: Settings from their JSON form, None if they are
+			missing or unusable, see settings_problem().
+	"""
+	try:
+		settings = json.loads(text)
+	except (TypeError, ValueError):
+		return None
+	return None if settings_problem(settings) else settings
+
+
+def date_problem(date: str | None, iso_date: str | None) -> str | None:
+	"""
+	Returns:
+		str | None: Why a stored date is unusable, None if "dd.mm.yyyy"
+			is a real day and matches its ISO form.
+	"""
+	if not isinstance(date, str) or not _DATE.match(date):
+		return "date is not dd.mm.yyyy"
+	try:
+		day = dt.datetime.strptime(date, "%d.%m.%Y").date()
+	except ValueError:
+		return "date does not exist"
+	if iso_date != day.isoformat():
+		return "ISO date does not match the date"
+	return None
+
+
+class ScanReport:
+	"""Outcome of one integrity scan, kept small however many rows were bad."""
+
+	def __init__(self):
+		self.scanned = 0
+		self.quarantined = 0
+		self.reasons = Counter()
+		self.examples = []    # (entry id, date, reason) of the first quarantined entries
+		self.unreadable = 0   # calc lines without a readable amount, kept but not counted
+		self.unreadable_entries = 0
+		self.unreadable_examples = []    # (entry id, date, lines) of the first such entries
+
+	def add(self, entry_id: int, date: str | None, reason: str) -> None:
+		self.quarantined += 1
+		self.reasons[reason] += 1
+		if len(self.examples) < REPORT_EXAMPLES:
+			self.examples.append((entry_id, date, reason))
+
+	def add_unreadable(self, entry_id: int, date: str | None, lines: int) -> None:
+		self.unreadable += lines
+		self.unreadable_entries += 1
+		if len(self.unreadable_examples) < REPORT_EXAMPLES:
+			self.unreadable_examples.append((entry_id, date, lines))
+
+	def summary(self) -> str:
+		"""
+		Returns:
+			str: One text for the user covering the whole scan.
+		"""
+		if not self.quarantined and not self.unreadable:
+			return f"{self.scanned} entries checked, no problems found."
+		lines = [f"{self.scanned} entries checked, {self.quarantined} moved to quarantine" + (":" if self.quarantined else ".")]
+		if self.quarantined:
+			lines += [f"  {count} × {reason}" for reason, count in self.reasons.most_common()]
+			lines.append("")
+			lines += [f"  #{entry_id} {date or '?'}: {reason}" for entry_id, date, reason in self.examples]
+			if self.quarantined > len(self.examples):
+				lines.append(f"  … and {self.quarantined - len(self.examples)} more")
+		if self.unreadable:
+			lines.append("")
+			lines.append(f"{self.unreadable} calc lines have no readable amount and are left out of the totals:")
+			lines += [f"  #{entry_id} {date or '?'}: {count} lines" for entry_id, date, count in self.unreadable_examples]
+			if self.unreadable_entries > len(self.unreadable_examples):
+				lines.append(f"  … and {self.unreadable_entries - len(self.unreadable_examples)} more")
+		return "\n".join(lines)
+
+	def __repr__(self):
+		return f"ScanReport(scanned={self.scanned!r}, quarantined={self.quarantined!r})"
+
+
+class IntegrityScanner:
+	"""
+	Checks every entry of the main database and quarantines broken ones.
+
+	Entries are read in id order, SCAN_BATCH at a time, so memory use does
+	not grow with the database. An entry is broken when it could not be
+	shown: unusable settings of its input type or a wrong date. It is
+	copied to the quarantine table with its content and the reason, and
+	removed from user_inputs, the search index and the undo journal.
+	Calc lines without a readable amount are only reported: the entry can
+	still be shown and corrected. The read-only archive is not scanned.
+	"""
+
+	def __init__(self, storage_manager: object):
+		"""
+		Args:
+			storage_manager (StorageManager): Storage to check.
+		"""
+		self.storage_manager = storage_manager
+		self.db = storage_manager.db
+
+	def scan(self, progress=None) -> ScanReport:
+		"""
+		Check all entries.
+
+		Args:
+			progress (callable | None, optional): Called with the number of
+				entries checked so far after each batch.
+
+		Returns:
+			ScanReport: Counts and the first quarantined and unreadable entries.
+
+		Raises:
+			sqlite3.Error: If the database cannot be read or written.
+		"""
+		report = ScanReport()
+		types = {}    # type id -> problem or None, shared by all batches
+		last_id = 0
+		while True:
+			with self.db.transaction():
+				rows = self.db.execute("""
+					SELECT e.id, e.date, e.iso_date, e.type, e.type_id, t.settings
+					FROM user_inputs AS e
+					LEFT JOIN input_types AS t ON t.id = e.type_id
+					WHERE e.id > ?
+					ORDER BY e.id
+					LIMIT ?
+				""", (last_id, SCAN_BATCH)).fetchall()
+				if not rows:
+					break
+				for entry_id, date, iso_date, type_name, type_id, settings in rows:
+					if type_id not in types:
+						types[type_id] = self._settings_problem(settings)
+					reason = types[type_id] or date_problem(date, iso_date)
+					if reason:
+						self._quarantine(entry_id, date, iso_date, type_name, settings, reason)
+						report.add(entry_id, date, reason)
+				dates = {row[0]: row[1] for row in rows}
+				for entry_id, lines in self.db.execute("""
+					SELECT b.entry_id, COUNT(*)
+					FROM entry_blocks AS b
+					JOIN entry_items AS i ON i.block_id = b.id
+					WHERE b.entry_id > ? AND b.entry_id <= ?
+					AND b.kind = 'calc' AND i.amount_cents IS NULL
+					GROUP BY b.entry_id
+				""", (last_id, rows[-1][0])):
+					report.add_unreadable(entry_id, dates.get(entry_id), lines)
+				last_id = rows[-1][0]
+			report.scanned += len(rows)
+			if progress is not None:
+				progress(report.scanned)
+		if report.quarantined:
+			self.storage_manager.week_cache.clear()
+		return report
+
+	@staticmethod
+	def _settings_problem(text: str | None) -> str | None:
+		if text is None:
+			return "input type is missing"
+		try:
+			settings = json.loads(text)
+		except ValueError:
+			return "settings are not valid JSON"
+		return settings_problem(settings)
+
+	def _quarantine(self, entry_id: int, date: str | None, iso_date: str | None, type_name: str | None,
+					settings: str | None, reason: str) -> None:
+		"""Move one entry into the quarantine table. Call inside a transaction."""
+		blocks = read_blocks(self.db, [entry_id]).get(entry_id, [])
+		content = json.dumps(text_memory_from_blocks(blocks), ensure_ascii=False)
+		self.db.execute("""
+			INSERT OR REPLACE INTO quarantine (entry_id, date, iso_date, type, settings, content, reason)
+			VALUES (?, ?, ?, ?, ?, ?, ?)
+		""", (entry_id, date, iso_date, type_name, settings, content, reason))
+		# Blocks, items and facts follow through ON DELETE CASCADE
+		self.db.execute("DELETE FROM user_inputs WHERE id = ?", (entry_id,))
+		self.db.execute("DELETE FROM entry_search WHERE rowid = ?", (entry_id,))
+		self.db.execute("DELETE FROM entry_journal WHERE entry_id = ?", (entry_id,))
+		self.storage_manager._log_change(iso_date)
+
+
+if __name__ == "__main__":
+	pass
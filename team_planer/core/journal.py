@@ -0,0 +1,206 @@
+import json
+from team_planer.core.date_manager import DateManager
+
+UNDO_LIMIT = 100      # newest journal records per client reachable with undo
+COMPACT_EVERY = 256   # records between automatic compactions
+ORPHAN_DAYS = 7       # records of clients silent this long are dropped
+
+# entry_journal.state
+UNDOABLE = 0
+UNDONE = 1     # can be redone
+DROPPED = 2    # undone, then replaced by a new change
+
+
+class JournalStep:
+	"""Effect of one undo or redo on the stored entries."""
+
+	__slots__ = ("seq", "op", "entry_id", "iso_date", "image")
+
+	def __init__(self, seq: int, op: str, entry_id: int, iso_date: str | None, image: dict | None):
+		"""
+		Args:
+			seq (int): Journal record that was undone or redone.
+			op (str): Change applied by the step: "insert", "update" or "delete".
+			entry_id (int): Row id of the entry.
+			iso_date (str | None): Date of the entry as "yyyy-mm-dd".
+			image (dict | None): Entry after the step with "date", "settings"
+				and "text_memory"; None after a delete.
+		"""
+		self.seq = seq
+		self.op = op
+		self.entry_id = entry_id
+		self.iso_date = iso_date
+		self.image = image
+
+	def __repr__(self):
+		return f"JournalStep({self.seq!r}, {self.op!r}, entry_id={self.entry_id!r})"
+
+
+def entry_image(date: str, settings: list, text_memory: list[list[str]]) -> dict:
+	"""Before/after image of an entry as stored in the journal."""
+	return {"date": date, "settings": settings, "text_memory": text_memory}
+
+
+class Journal:
+	"""
+	Undo/redo over the entry_journal table.
+
+	StorageManager records every insert, update and delete in the same
+	transaction as the change itself. Undo applies the inverse of the newest
+	undoable record, redo re-applies the oldest undone one; both are a
+	single write on the entry and are not journaled again.
+
+	Records carry the client that wrote them. On a shared database every
+	client only undoes and redoes its own changes.
+	"""
+
+	def __init__(self, storage_manager: object, client: str | None = None):
+		"""
+		Args:
+			storage_manager (StorageManager): Storage the records belong to.
+			client (str | None, optional): Client the records are written
+				for, defaults to this process (CLIENT_ID).
+		"""
+		if client is None:
+			from team_planer.core.storage_manager import CLIENT_ID
+			client = CLIENT_ID
+		self.storage_manager = storage_manager
+		self.db = storage_manager.db
+		self.client = client
+
+	def record(self, op: str, entry_id: int, before: dict | None, after: dict | None) -> int:
+		"""
+		Append a change. Call inside the transaction of the change.
+
+		A new change makes this client's undone records unreachable for redo.
+
+		Returns:
+			int: Sequence number of the record.
+		"""
+		self.db.execute(
+			"UPDATE entry_journal SET state = ? WHERE client = ? AND state = ?", (DROPPED, self.client, UNDONE)
+		)
+		seq = self.db.execute("""
+			INSERT INTO entry_journal (entry_id, op, before, after, client)
+			VALUES (?, ?, ?, ?, ?)
+		""", (
+			entry_id,
+			op,
+			None if before is None else json.dumps(before),
+			None if after is None else json.dumps(after),
+			self.client
+		)).lastrowid
+		if seq % COMPACT_EVERY == 0:
+			self.compact()
+		return seq
+
+	def undo(self) -> JournalStep | None:
+		"""
+		Revert the newest undoable change of this client.
+
+		Returns:
+			JournalStep | None: What was done, None if there is nothing to undo.
+
+		Raises:
+			sqlite3.Error: If the change cannot be reverted.
+		"""
+		with self.db.transaction():
+			row = self.db.execute("""
+				SELECT seq, entry_id, op, before FROM entry_journal
+				WHERE client = :client AND state = :state
+				AND seq >= (
+					SELECT MIN(seq) FROM (
+						SELECT seq FROM entry_journal
+						WHERE client = :client
+						ORDER BY seq DESC
+						LIMIT :limit
+					)
+				)
+				ORDER BY seq DESC
+				LIMIT 1
+			""", {"client": self.client, "state": UNDOABLE, "limit": UNDO_LIMIT}).fetchone()
+			if row is None:
+				return None
+			seq, entry_id, op, before = row
+			inverse = {"insert": "delete", "update": "update", "delete": "insert"}[op]
+			step = self._apply(seq, inverse, entry_id, None if before is None else json.loads(before))
+			self.db.execute("UPDATE entry_journal SET state = ? WHERE seq = ?", (UNDONE, seq))
+		return step
+
+	def redo(self) -> JournalStep | None:
+		"""
+		Re-apply the oldest undone change of this client.
+
+		Returns:
+			JournalStep | None: What was done, None if there is nothing to redo.
+
+		Raises:
+			sqlite3.Error: If the change cannot be re-applied.
+		"""
+		with self.db.transaction():
+			row = self.db.execute("""
+				SELECT seq, entry_id, op, after FROM entry_journal
+				WHERE client = ? AND state = ?
+				ORDER BY seq
+				LIMIT 1
+			""", (self.client, UNDONE)).fetchone()
+			if row is None:
+				return None
+			seq, entry_id, op, after = row
+			step = self._apply(seq, op, entry_id, None if after is None else json.loads(after))
+			self.db.execute("UPDATE entry_journal SET state = ? WHERE seq = ?", (UNDOABLE, seq))
+		return step
+
+	def _apply(self, seq: int, op: str, entry_id: int, image: dict | None) -> JournalStep:
+		storage = self.storage_manager
+		if op == "insert":
+			storage.insert_entry(image["date"], image["text_memory"], image["settings"], entry_id=entry_id, journal=False)
+			iso_date = DateManager.to_iso_date(image["date"])
+		elif op == "update":
+			iso_date = storage.update_entry(entry_id, image["text_memory"], image["settings"], journal=False)
+		else:
+			iso_date = storage.delete_entry(entry_id, journal=False)
+		if iso_date is None:
+			raise LookupError(f"entry {entry_id} of journal record {seq} does not exist")
+		return JournalStep(seq, op, entry_id, iso_date, image)
+
+	def compact(self, keep: int = UNDO_LIMIT) -> int:
+		"""
+		Drop records that undo and redo can no longer reach.
+
+		Keeps the newest records of every client. Clients that wrote
+		nothing for ORPHAN_DAYS, e.g. closed instances, lose their records.
+
+		Args:
+			keep (int, optional): Newest records to keep per client.
+
+		Returns:
+			int: Number of deleted records.
+		"""
+		with self.db.transaction():
+			return self.db.execute("""
+				DELETE FROM entry_journal
+				WHERE state = :dropped
+				OR seq IN (
+					SELECT seq FROM (
+						SELECT seq, ROW_NUMBER() OVER (PARTITION BY client ORDER BY seq DESC) AS age
+						FROM entry_journal
+					)
+					WHERE age > :keep
+				)
+				OR client IS NOT :client AND COALESCE(client, '') IN (
+					SELECT COALESCE(client, '') FROM entry_journal
+					GROUP BY client
+					HAVING MAX(created) < datetime('now', :orphaned)
+				)
+			""", {
+				"dropped": DROPPED, "keep": keep, "client": self.client, "orphaned": f"-{ORPHAN_DAYS} days"
+			}).rowcount
+
+	def clear(self) -> None:
+		"""Forget all records. Call inside a transaction."""
+		self.db.execute("DELETE FROM entry_journal")
+
+
+if __name__ == "__main__":
+	pass
@@ -0,0 +1,332 @@
+import re
+import json
+import bisect
+import threading
+import unicodedata
+import datetime as dt
+from contextlib import contextmanager
+from typing import Iterator
+from team_planer.core.date_manager import DateManager
+from team_planer.core.entries import blocks_from_text_memory, entry_facts, search_text
+from team_planer.core.week_cache import get_week_cache
+from team_planer.core.journal import (
+	Journal, JournalStep, entry_image, UNDO_LIMIT, UNDOABLE, UNDONE, DROPPED
+)
+from team_planer.core.storage_backend import StorageBackend, Entry, SearchHit
+
+PREFIX_MIN = 2        # as in StorageManager.search
+SNIPPET_WORDS = 8
+
+
+def _words(text: str) -> list[str]:
+	"""Words folded like the SQLite index: lower case, without diacritics."""
+	folded = unicodedata.normalize("NFKD", text.casefold())
+	folded = "".join(char for char in folded if not unicodedata.combining(char))
+	return re.findall(r"\w+", folded)
+
+
+def _iso(date: dt.date | str) -> str:
+	if isinstance(date, dt.date):
+		return date.isoformat()
+	return DateManager.to_iso_date(date)
+
+
+class _MemoryData:
+	"""Entries of one in-memory store, shared by all MemoryStorage instances of its name."""
+
+	def __init__(self):
+		self.lock = threading.RLock()
+		self.entries = {}     # id -> Entry
+		self.days = {}        # iso date -> sorted ids
+		self.dates = []       # sorted iso dates that have entries
+		self.words = {}       # id -> folded words, the search index
+		self.types = {}       # settings as JSON -> the one list its entries share
+		self.journal = []     # [seq, entry_id, op, before, after, state]
+		self.next_id = 1
+		self.depth = 0
+		self.rollback = []    # inverse changes of the open transaction
+
+
+class MemoryJournal(Journal):
+	"""Undo/redo like Journal, with the records kept in memory."""
+
+	def __init__(self, storage: "MemoryStorage"):
+		"""
+		Args:
+			storage (MemoryStorage): Storage the records belong to.
+		"""
+		self.storage_manager = storage
+		self.data = storage.data
+
+	def record(self, op: str, entry_id: int, before: dict | None, after: dict | None) -> int:
+		"""Append a change. Call inside the transaction of the change."""
+		records = self.data.journal
+		undone = [record for record in records if record[5] == UNDONE]
+		for record in undone:
+			record[5] = DROPPED
+		seq = records[-1][0] + 1 if records else 1
+		records.append([seq, entry_id, op, before, after, UNDOABLE])
+
+		def revert():
+			records.pop()
+			for record in undone:
+				record[5] = UNDONE
+		self.data.rollback.append(revert)
+		return seq
+
+	def undo(self) -> JournalStep | None:
+		with self.storage_manager.transaction():
+			records = self.data.journal
+			newest = records[-1][0] if records else 0
+			record = next((
+				record for record in reversed(records)
+				if record[5] == UNDOABLE and record[0] > newest - UNDO_LIMIT
+			), None)
+			if record is None:
+				return None
+			seq, entry_id, op, before = record[:4]
+			inverse = {"insert": "delete", "update": "update", "delete": "insert"}[op]
+			step = self._apply(seq, inverse, entry_id, before)
+			self._set_state(record, UNDONE)
+		return step
+
+	def redo(self) -> JournalStep | None:
+		with self.storage_manager.transaction():
+			record = next((record for record in self.data.journal if record[5] == UNDONE), None)
+			if record is None:
+				return None
+			seq, entry_id, op, _, after = record[:5]
+			step = self._apply(seq, op, entry_id, after)
+			self._set_state(record, UNDOABLE)
+		return step
+
+	def _set_state(self, record: list, state: int) -> None:
+		previous = record[5]
+		record[5] = state
+		self.data.rollback.append(lambda: record.__setitem__(5, previous))
+
+	def compact(self, keep: int = UNDO_LIMIT) -> int:
+		with self.storage_manager.transaction():
+			records = self.data.journal
+			newest = records[-1][0] if records else 0
+			kept = [record for record in records if record[5] != DROPPED and record[0] > newest - keep]
+			dropped = len(records) - len(kept)
+			records[:] = kept
+		return dropped
+
+	def clear(self) -> None:
+		self.data.journal.clear()
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_memory_data(name: str) -> _MemoryData:
+	"""
+	Returns:
+		_MemoryData: The process-wide in-memory store of that name.
+	"""
+	with _stores_lock:
+		data = _stores.get(name)
+		if data is None:
+			data = _MemoryData()
+			_stores[name] = data
+		return data
+
+
+def drop_memory_data(name: str) -> None:
+	"""Forget an in-memory store, e.g. between tests."""
+	with _stores_lock:
+		_stores.pop(name, None)
+	get_week_cache(f":memory:{name}").clear()
+
+
+class MemoryStorage(StorageBackend):
+	"""
+	Entries kept in dicts indexed by id and by day, without any disk access.
+
+	Meant for tests, demos and displays that need no persistence. All
+	instances with the same name share one store, like StorageManager
+	instances of the same file. Writes are atomic: a failing transaction
+	reverts its changes. Nothing survives the process.
+	"""
+
+	def __init__(self, parent: object | None = None, name: str = "default"):
+		"""
+		Args:
+			parent (object | None): Parent window or controller.
+			name (str, optional): Store shared by instances of the same name.
+		"""
+		super().__init__(parent)
+		self.name = name
+		self.data = get_memory_data(name)
+		self.week_cache = get_week_cache(f":memory:{name}")
+		self.journal = MemoryJournal(self)
+
+	def create_db(self) -> None:
+		"""Nothing to create."""
+
+	@contextmanager
+	def transaction(self):
+		"""
+		Hold the store for one atomic write; nested use joins the outer one.
+
+		Yields:
+			MemoryStorage: This storage.
+		"""
+		data = self.data
+		with data.lock:
+			data.depth += 1
+			try:
+				yield self
+			except BaseException:
+				if data.depth == 1:
+					while data.rollback:
+						data.rollback.pop()()
+				raise
+			finally:
+				data.depth -= 1
+				if data.depth == 0:
+					data.rollback.clear()
+
+	def _set(self, entry_id: int, entry: Entry | None) -> Entry | None:
+		"""Put or remove an entry and keep the indexes in step; returns the previous one."""
+		data = self.data
+		previous = data.entries.pop(entry_id, None)
+		if previous is not None:
+			ids = data.days[previous.iso_date]
+			ids.remove(entry_id)
+			if not ids:
+				del data.days[previous.iso_date]
+				del data.dates[bisect.bisect_left(data.dates, previous.iso_date)]
+			del data.words[entry_id]
+		if entry is not None:
+			data.entries[entry_id] = entry
+			ids = data.days.get(entry.iso_date)
+			if ids is None:
+				ids = data.days[entry.iso_date] = []
+				bisect.insort(data.dates, entry.iso_date)
+			bisect.insort(ids, entry_id)
+			data.words[entry_id] = frozenset(_words(search_text(entry.settings[0], entry.blocks)))
+		return previous
+
+	def _write(self, entry_id: int, entry: Entry | None) -> Entry | None:
+		"""_set() inside a transaction, reverted if the transaction fails."""
+		previous = self._set(entry_id, entry)
+		self.data.rollback.append(lambda: self._set(entry_id, previous))
+		return previous
+
+	def _type(self, settings: list[str]) -> list[str]:
+		"""The shared settings list of an input type version, like input_types in SQLite."""
+		with self.data.lock:
+			return self.data.types.setdefault(json.dumps(settings), list(settings))
+
+	def iter_entries(self, start_date: dt.date | str, end_date: dt.date | str) -> Iterator[Entry]:
+		start, end = _iso(start_date), _iso(end_date)
+		data = self.data
+		with data.lock:
+			dates = data.dates[bisect.bisect_left(data.dates, start):bisect.bisect_right(data.dates, end)]
+			entries = [data.entries[entry_id] for date in dates for entry_id in data.days[date]]
+		yield from entries
+
+	def get_entry(self, entry_id: int) -> Entry | None:
+		return self.data.entries.get(entry_id)
+
+	def insert_entry(self, date: str, text_memory: list[list[str]], settings: list[str],
+					 entry_id: int | None = None, journal: bool = True) -> int:
+		"""
+		Raises:
+			ValueError: If `entry_id` is taken.
+		"""
+		with self.transaction():
+			data = self.data
+			if entry_id is None:
+				entry_id = data.next_id
+			elif entry_id in data.entries:
+				raise ValueError(f"entry {entry_id} exists")
+			data.next_id = max(data.next_id, entry_id + 1)
+			entry = Entry(entry_id, date, DateManager.to_iso_date(date), self._type(settings), blocks_from_text_memory(text_memory))
+			self._write(entry_id, entry)
+			if journal:
+				self.journal.record("insert", entry_id, None, entry_image(date, entry.settings, entry.text_memory))
+		return entry_id
+
+	def update_entry(self, entry_id: int, text_memory: list[list[str]], settings: list[str],
+					 journal: bool = True) -> str | None:
+		with self.transaction():
+			before = self.data.entries.get(entry_id)
+			if before is None:
+				return None
+			entry = Entry(entry_id, before.date, before.iso_date, self._type(settings), blocks_from_text_memory(text_memory))
+			self._write(entry_id, entry)
+			if journal:
+				self.journal.record(
+					"update", entry_id,
+					entry_image(before.date, before.settings, before.text_memory),
+					entry_image(entry.date, entry.settings, entry.text_memory)
+				)
+		return entry.iso_date
+
+	def delete_entry(self, entry_id: int, journal: bool = True) -> str | None:
+		with self.transaction():
+			before = self.data.entries.get(entry_id)
+			if before is None:
+				return None
+			self._write(entry_id, None)
+			if journal:
+				self.journal.record("delete", entry_id, entry_image(before.date, before.settings, before.text_memory), None)
+		return before.iso_date
+
+	def delete_all_entries(self) -> None:
+		with self.transaction():
+			for entry_id in list(self.data.entries):
+				self._write(entry_id, None)
+			records = list(self.data.journal)
+			self.journal.clear()
+			self.data.rollback.append(lambda: self.data.journal.extend(records))
+
+	def search(self, text: str, limit: int = 50) -> list[SearchHit]:
+		"""Hits ordered by date, newest first; there is no relevance ranking."""
+		query = _words(text)
+		if not query:
+			return []
+		exact, last = set(query[:-1]), query[-1]
+		prefix = len(last) >= PREFIX_MIN
+		hits = []
+		with self.data.lock:
+			entries = self.data.entries
+			for entry_id, words in self.data.words.items():
+				if not exact.issubset(words):
+					continue
+				if not any(word == last or (prefix and word.startswith(last)) for word in words):
+					continue
+				hits.append(entries[entry_id])
+		hits.sort(key=lambda entry: (entry.iso_date, entry.id), reverse=True)
+		return [
+			SearchHit(entry.id, entry.date, entry.iso_date, entry.settings[0], self._snippet(entry, exact, last, prefix))
+			for entry in hits[:limit]
+		]
+
+	@staticmethod
+	def _snippet(entry: Entry, exact: set, last: str, prefix: bool) -> str:
+		"""Up to SNIPPET_WORDS words around the first hit, hits wrapped in [ ]."""
+		words = search_text(entry.settings[0], entry.blocks).split()
+
+		def is_hit(word):
+			folded = _words(word)
+			return any(part in exact or part == last or (prefix and part.startswith(last)) for part in folded)
+		first = next((i for i, word in enumerate(words) if is_hit(word)), 0)
+		start = max(0, min(first - SNIPPET_WORDS // 2, len(words) - SNIPPET_WORDS))
+		shown = [f"[{word}]" if is_hit(word) else word for word in words[start:start + SNIPPET_WORDS]]
+		return ("…" if start else "") + " ".join(shown) + ("…" if start + SNIPPET_WORDS < len(words) else "")
+
+	def day_totals(self, start: dt.date, end: dt.date) -> dict[str, int]:
+		totals = {}
+		for entry in self.iter_entries(start, end):
+			totals[entry.iso_date] = totals.get(entry.iso_date, 0) + entry_facts(entry.blocks)[0]
+		return totals
+
+
+if __name__ == "__main__":
+	pass
@@ -0,0 +1,620 @@
+import re
+import json
+from decimal import Decimal, ROUND_HALF_UP
+from team_planer.core.database import Database
+
+BACKFILL_BATCH = 1000
+
+# The data steps below use their own copies of the entry logic instead of
+# team_planer.core.entries: a step has to do the same thing on every
+# database, however the live code changes later. Blocks are kept as
+# (kind, goal_cents, header, [(label, amount_cents), ...]).
+
+# Amounts as read by step 3: unsigned, at most two decimals
+_LEGACY_AMOUNT = re.compile(r"(\d+)(?:[.,](\d{1,2}))?$")
+# Amounts as read from step 13 on: optional sign, decimals rounded to cents
+_AMOUNT = re.compile(r"[+-]?(?:\d+(?:[.,]\d*)?|[.,]\d+)$")
+
+
+def _legacy_cents(text: str) -> int:
+	"""Amount in cents as step 3 read it. Raises ValueError if it is none."""
+	match = _LEGACY_AMOUNT.match(text.strip())
+	if match is None:
+		raise ValueError(f"not an amount: {text!r}")
+	return int(match.group(1)) * 100 + int((match.group(2) or "0").ljust(2, "0"))
+
+
+def _cents(text: str) -> int:
+	"""Amount in cents as step 13 reads it. Raises ValueError if it is none."""
+	text = text.strip()
+	if not _AMOUNT.match(text):
+		raise ValueError(f"not an amount: {text!r}")
+	return int((Decimal(text.replace(",", ".")) * 100).to_integral_value(ROUND_HALF_UP))
+
+
+def _legacy_blocks(text_memory: list) -> list[tuple]:
+	"""Blocks of the old JSON content, read the way step 3 shipped."""
+	blocks = []
+	for raw in text_memory:
+		if not raw:
+			continue
+		kind, _, goal = str(raw[0]).partition("#")
+		try:
+			goal_cents = _legacy_cents(goal) if goal else None
+		except ValueError:
+			kind, goal_cents = str(raw[0]), None
+		lines = [str(line) for line in raw[1:]]
+		header = None
+		if lines and lines[0].startswith("*"):
+			header = lines[0][1:]
+			lines = lines[1:]
+		items = []
+		for line in lines:
+			amount = None
+			if kind == "calc":
+				label, sep, text = line.rpartition("#")
+				try:
+					if sep:
+						line, amount = label, _legacy_cents(text)
+				except ValueError:
+					pass
+			items.append((line, amount))
+		blocks.append((kind, goal_cents, header, items))
+	return blocks
+
+
+def _insert_blocks(db: Database, entry_id: int, blocks: list[tuple]) -> None:
+	"""Write the blocks of one entry. Call inside a transaction."""
+	for position, (kind, goal_cents, header, items) in enumerate(blocks):
+		block_id = db.execute("""
+			INSERT INTO entry_blocks (entry_id, position, kind, goal_cents, header)
+			VALUES (?, ?, ?, ?, ?)
+		""", (entry_id, position, kind, goal_cents, header)).lastrowid
+		db.connection().executemany("""
+			INSERT INTO entry_items (block_id, position, label, amount_cents)
+			VALUES (?, ?, ?, ?)
+		""", [(block_id, item_position, label, amount) for item_position, (label, amount) in enumerate(items)])
+
+
+def _read_blocks(db: Database, entry_ids: list[int]) -> dict[int, list[tuple]]:
+	"""Blocks per entry in display order; entries without blocks are left out."""
+	entries = {}
+	blocks = {}
+	for entry_id, block_id, kind, goal_cents, header, label, amount in db.execute("""
+		SELECT b.entry_id, b.id, b.kind, b.goal_cents, b.header, i.label, i.amount_cents
+		FROM entry_blocks AS b
+		LEFT JOIN entry_items AS i ON i.block_id = b.id
+		WHERE b.entry_id IN (SELECT value FROM json_each(?))
+		ORDER BY b.entry_id, b.position, i.position
+	""", (json.dumps(list(entry_ids)),)):
+		block = blocks.get(block_id)
+		if block is None:
+			block = blocks[block_id] = (kind, goal_cents, header, [])
+			entries.setdefault(entry_id, []).append(block)
+		if label is not None:
+			block[3].append((label, amount))
+	return entries
+
+
+def _write_facts(db: Database, entry_id: int, iso_date: str, blocks: list[tuple]) -> None:
+	"""
+	Report facts of one entry as counted from step 13 on: workers of the
+	last worker block, a tour if workers were listed before a calc block.
+	"""
+	revenue_cents = workers = 0
+	tour = False
+	for kind, _, _, items in blocks:
+		if kind == "worker":
+			workers = len(items)
+		elif kind == "calc":
+			tour = tour or workers > 0
+			revenue_cents += sum(amount or 0 for _, amount in items)
+	db.execute("""
+		INSERT INTO entry_facts (entry_id, iso_date, revenue_cents, workers, tour, goal_cents)
+		VALUES (:id, :iso_date, :revenue, :workers, :tour, CASE WHEN :tour THEN :workers * (
+			SELECT value FROM report_meta WHERE key = 'goal_cents_per_worker'
+		) END)
+		ON CONFLICT (entry_id) DO UPDATE SET
+			iso_date = excluded.iso_date,
+			revenue_cents = excluded.revenue_cents,
+			workers = excluded.workers,
+			tour = excluded.tour,
+			goal_cents = excluded.goal_cents
+	""", {"id": entry_id, "iso_date": iso_date, "revenue": revenue_cents, "workers": workers, "tour": int(tour)})
+
+
+def _index_entry(db: Database, entry_id: int, entry_type: str | None, blocks: list[tuple]) -> None:
+	"""Replace the search text of one entry: type, headers and lines."""
+	lines = [entry_type or ""]
+	for _, _, header, items in blocks:
+		if header is not None:
+			lines.append(header)
+		lines.extend(label for label, _ in items)
+	db.execute("DELETE FROM entry_search WHERE rowid = ?", (entry_id,))
+	db.execute("INSERT INTO entry_search (rowid, body) VALUES (?, ?)", (entry_id, "\n".join(lines)))
+
+
+def _create_user_inputs(db: Database) -> None:
+	"""1: The original entry table."""
+	with db.transaction():
+		db.execute("""
+			CREATE TABLE IF NOT EXISTS user_inputs (
+			id INTEGER PRIMARY KEY AUTOINCREMENT,
+			date TEXT NOT NULL,
+			type TEXT,
+			settings TEXT,
+			text TEXT
+			)
+		""")
+
+
+def _add_iso_date(db: Database) -> None:
+	"""2: Sortable ISO-8601 date column, backfilled in batches, and its index."""
+	with db.transaction():
+		columns = {row[1] for row in db.execute("PRAGMA table_info(user_inputs)")}
+		if "iso_date" not in columns:
+			db.execute("ALTER TABLE user_inputs ADD COLUMN iso_date TEXT")
+
+	# One transaction per batch; rows already converted are skipped on resume
+	max_id = db.execute("SELECT COALESCE(MAX(id), 0) FROM user_inputs").fetchone()[0]
+	for start in range(0, max_id, BACKFILL_BATCH):
+		with db.transaction():
+			db.execute("""
+				UPDATE user_inputs
+				SET iso_date = substr(date, 7, 4) || '-' || substr(date, 4, 2) || '-' || substr(date, 1, 2)
+				WHERE id > ? AND id <= ? AND iso_date IS NULL
+				AND date GLOB '[0-9][0-9].[0-9][0-9].[0-9][0-9][0-9][0-9]'
+			""", (start, start + BACKFILL_BATCH))
+
+	with db.transaction():
+		db.execute("""
+			CREATE INDEX IF NOT EXISTS idx_user_inputs_iso_date
+			ON user_inputs (iso_date)
+		""")
+
+
+def _normalize_entries(db: Database) -> None:
+	"""3: Entry content as blocks and items with integer cents, replacing the JSON 'text' blob."""
+	with db.transaction():
+		db.execute("""
+			CREATE TABLE IF NOT EXISTS entry_blocks (
+			id INTEGER PRIMARY KEY,
+			entry_id INTEGER NOT NULL REFERENCES user_inputs (id) ON DELETE CASCADE,
+			position INTEGER NOT NULL,
+			kind TEXT NOT NULL,
+			goal_cents INTEGER,
+			header TEXT
+			)
+		""")
+		db.execute("""
+			CREATE TABLE IF NOT EXISTS entry_items (
+			id INTEGER PRIMARY KEY,
+			block_id INTEGER NOT NULL REFERENCES entry_blocks (id) ON DELETE CASCADE,
+			position INTEGER NOT NULL,
+			label TEXT NOT NULL,
+			amount_cents INTEGER
+			)
+		""")
+		db.execute("""
+			CREATE INDEX IF NOT EXISTS idx_entry_blocks_entry
+			ON entry_blocks (entry_id, position)
+		""")
+		db.execute("""
+			CREATE INDEX IF NOT EXISTS idx_entry_items_block
+			ON entry_items (block_id, position)
+		""")
+		columns = {row[1] for row in db.execute("PRAGMA table_info(user_inputs)")}
+	if "text" not in columns:
+		return
+
+	# A converted row has its blob cleared in the same transaction, so a
+	# resumed run never converts a row twice
+	max_id = db.execute("SELECT COALESCE(MAX(id), 0) FROM user_inputs").fetchone()[0]
+	for start in range(0, max_id, BACKFILL_BATCH):
+		with db.transaction():
+			rows = db.execute("""
+				SELECT id, text FROM user_inputs
+				WHERE id > ? AND id <= ? AND text IS NOT NULL
+			""", (start, start + BACKFILL_BATCH)).fetchall()
+			for entry_id, text in rows:
+				try:
+					text_memory = json.loads(text)
+				except ValueError:
+					text_memory = None
+				if not isinstance(text_memory, list) or not all(isinstance(raw, list) for raw in text_memory):
+					# Keep unreadable content visible instead of dropping it
+					text_memory = [["text", text]]
+				_insert_blocks(db, entry_id, _legacy_blocks(text_memory))
+			db.execute("""
+				UPDATE user_inputs SET text = NULL
+				WHERE id > ? AND id <= ?
+			""", (start, start + BACKFILL_BATCH))
+
+	with db.transaction():
+		db.execute("ALTER TABLE user_inputs DROP COLUMN text")
+
+
+def _add_search_index(db: Database) -> None:
+	"""4: FTS5 index over the type, headers and lines of every entry."""
+	with db.transaction():
+		# Diacritics are folded so "Auftrage" also finds "Aufträge"
+		db.execute("""
+			CREATE VIRTUAL TABLE IF NOT EXISTS entry_search
+			USING fts5 (body, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')
+		""")
+
+	max_id = db.execute("SELECT COALESCE(MAX(id), 0) FROM user_inputs").fetchone()[0]
+	for start in range(0, max_id, BACKFILL_BATCH):
+		with db.transaction():
+			# Clearing the range first makes a resumed batch safe to repeat
+			db.execute("""
+				DELETE FROM entry_search WHERE rowid > ? AND rowid <= ?
+			""", (start, start + BACKFILL_BATCH))
+			db.execute("""
+				INSERT INTO entry_search (rowid, body)
+				SELECT e.id, COALESCE(e.type, '') || char(10) || COALESCE((
+					SELECT group_concat(line, char(10)) FROM (
+						SELECT b.position, -1 AS item, b.header AS line
+						FROM entry_blocks AS b
+						WHERE b.entry_id = e.id AND b.header IS NOT NULL
+						UNION ALL
+						SELECT b.position, i.position, i.label
+						FROM entry_blocks AS b JOIN entry_items AS i ON i.block_id = b.id
+						WHERE b.entry_id = e.id
+						ORDER BY 1, 2
+					)
+				), '')
+				FROM user_inputs AS e
+				WHERE e.id > ? AND e.id <= ?
+			""", (start, start + BACKFILL_BATCH))
+
+
+# Summary table -> key of a fact row (r is NEW or OLD)
+SUMMARY_KEYS = (
+	("day_summary", "{r}.iso_date"),
+	("week_summary", "date({r}.iso_date, 'weekday 0', '-6 days')"),
+	("month_summary", "substr({r}.iso_date, 1, 7)"),
+)
+
+
+def _add_to_summary(table: str, key: str) -> str:
+	"""Trigger statement adding the NEW fact row to one summary."""
+	return f"""
+		INSERT INTO {table} (key, revenue_cents, entries, tours, worker_days, goal_met, goal_missed)
+		VALUES (
+			{key.format(r="NEW")}, NEW.revenue_cents, 1, NEW.tour, NEW.workers,
+			NEW.goal_cents IS NOT NULL AND NEW.revenue_cents >= NEW.goal_cents,
+			NEW.goal_cents IS NOT NULL AND NEW.revenue_cents < NEW.goal_cents
+		)
+		ON CONFLICT (key) DO UPDATE SET
+			revenue_cents = revenue_cents + excluded.revenue_cents,
+			entries = entries + 1,
+			tours = tours + excluded.tours,
+			worker_days = worker_days + excluded.worker_days,
+			goal_met = goal_met + excluded.goal_met,
+			goal_missed = goal_missed + excluded.goal_missed;
+	"""
+
+
+def _remove_from_summary(table: str, key: str) -> str:
+	"""Trigger statements taking the OLD fact row out of one summary."""
+	return f"""
+		UPDATE {table} SET
+			revenue_cents = revenue_cents - OLD.revenue_cents,
+			entries = entries - 1,
+			tours = tours - OLD.tour,
+			worker_days = worker_days - OLD.workers,
+			goal_met = goal_met - (OLD.goal_cents IS NOT NULL AND OLD.revenue_cents >= OLD.goal_cents),
+			goal_missed = goal_missed - (OLD.goal_cents IS NOT NULL AND OLD.revenue_cents < OLD.goal_cents)
+		WHERE key = {key.format(r="OLD")};
+		DELETE FROM {table} WHERE key = {key.format(r="OLD")} AND entries = 0;
+	"""
+
+
+def _add_summaries(db: Database) -> None:
+	"""5: Per-entry report facts and day/week/month summaries kept by triggers."""
+	with db.transaction():
+		db.execute("""
+			CREATE TABLE IF NOT EXISTS report_meta (
+			key TEXT PRIMARY KEY,
+			value INTEGER
+			)
+		""")
+		db.execute("""
+			CREATE TABLE IF NOT EXISTS entry_facts (
+			entry_id INTEGER PRIMARY KEY REFERENCES user_inputs (id) ON DELETE CASCADE,
+			iso_date TEXT NOT NULL,
+			revenue_cents INTEGER NOT NULL,
+			workers INTEGER NOT NULL,
+			tour INTEGER NOT NULL,
+			goal_cents INTEGER
+			)
+		""")
+		for table, _ in SUMMARY_KEYS:
+			db.execute(f"""
+				CREATE TABLE IF NOT EXISTS {table} (
+				key TEXT PRIMARY KEY,
+				revenue_cents INTEGER NOT NULL,
+				entries INTEGER NOT NULL,
+				tours INTEGER NOT NULL,
+				worker_days INTEGER NOT NULL,
+				goal_met INTEGER NOT NULL,
+				goal_missed INTEGER NOT NULL
+				) WITHOUT ROWID
+			""")
+		add = "".join(_add_to_summary(table, key) for table, key in SUMMARY_KEYS)
+		remove = "".join(_remove_from_summary(table, key) for table, key in SUMMARY_KEYS)
+		db.execute(f"CREATE TRIGGER IF NOT EXISTS entry_facts_insert AFTER INSERT ON entry_facts BEGIN {add} END")
+		db.execute(f"CREATE TRIGGER IF NOT EXISTS entry_facts_delete AFTER DELETE ON entry_facts BEGIN {remove} END")
+		db.execute(f"CREATE TRIGGER IF NOT EXISTS entry_facts_update AFTER UPDATE ON entry_facts BEGIN {remove}{add} END")
+
+	# Facts of entries that already have a row are kept, so resuming is safe;
+	# the goal is filled in by ReportEngine.sync_goal() once the config is known
+	max_id = db.execute("SELECT COALESCE(MAX(id), 0) FROM user_inputs").fetchone()[0]
+	for start in range(0, max_id, BACKFILL_BATCH):
+		with db.transaction():
+			db.execute("""
+				INSERT OR IGNORE INTO entry_facts (entry_id, iso_date, revenue_cents, workers, tour)
+				SELECT id, iso_date, revenue, workers, calc AND workers > 0
+				FROM (
+					SELECT e.id, e.iso_date,
+						COALESCE((
+							SELECT SUM(i.amount_cents)
+							FROM entry_blocks AS b JOIN entry_items AS i ON i.block_id = b.id
+							WHERE b.entry_id = e.id AND b.kind = 'calc'
+						), 0) AS revenue,
+						COALESCE((
+							SELECT COUNT(*)
+							FROM entry_blocks AS b JOIN entry_items AS i ON i.block_id = b.id
+							WHERE b.id = (
+								SELECT MAX(id) FROM entry_blocks
+								WHERE entry_id = e.id AND kind = 'worker'
+							)
+						), 0) AS workers,
+						EXISTS (
+							SELECT 1 FROM entry_blocks
+							WHERE entry_id = e.id AND kind = 'calc'
+						) AS calc
+					FROM user_inputs AS e
+					WHERE e.id > ? AND e.id <= ? AND e.iso_date IS NOT NULL
+				)
+			""", (start, start + BACKFILL_BATCH))
+
+
+def _add_journal(db: Database) -> None:
+	"""6: Append-only journal of entry changes with before/after images, for undo/redo."""
+	with db.transaction():
+		db.execute("""
+			CREATE TABLE IF NOT EXISTS entry_journal (
+			seq INTEGER PRIMARY KEY AUTOINCREMENT,
+			entry_id INTEGER NOT NULL,
+			op TEXT NOT NULL CHECK (op IN ('insert', 'update', 'delete')),
+			before TEXT,
+			after TEXT,
+			created TEXT NOT NULL DEFAULT (datetime('now')),
+			state INTEGER NOT NULL DEFAULT 0
+			)
+		""")
+		db.execute("""
+			CREATE INDEX IF NOT EXISTS idx_entry_journal_state
+			ON entry_journal (state, seq)
+		""")
+
+
+def _add_change_log(db: Database) -> None:
+	"""7: Days changed per client, so other clients reload only those days."""
+	with db.transaction():
+		db.execute("""
+			CREATE TABLE IF NOT EXISTS entry_changes (
+			seq INTEGER PRIMARY KEY AUTOINCREMENT,
+			client TEXT NOT NULL,
+			iso_date TEXT
+			)
+		""")
+
+
+def _add_archive_support(db: Database) -> None:
+	"""8: Incremental vacuum to shrink the file after archiving, and the archive shadow list."""
+	with db.transaction():
+		# Archived entries that were restored for editing or deleted; their
+		# copy in the archive is hidden until the next archive run
+		db.execute("""
+			CREATE TABLE IF NOT EXISTS archive_shadow (
+			entry_id INTEGER PRIMARY KEY
+			)
+		""")
+	# Only takes effect with a full VACUUM, which rewrites the whole file;
+	# Archiver.run() does it once, off the startup path
+	db.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
+
+def _add_input_types(db: Database) -> None:
+	"""9: Input type definitions stored once per version and referenced by id, replacing the per-row 'settings'."""
+	with db.transaction():
+		# A version is one distinct settings list of a type; config edits add
+		# a version, so older entries keep the look they were saved with
+		db.execute("""
+			CREATE TABLE IF NOT EXISTS input_types (
+			id INTEGER PRIMARY KEY,
+			name TEXT NOT NULL,
+			version INTEGER NOT NULL,
+			settings TEXT NOT NULL UNIQUE
+			)
+		""")
+		columns = {row[1] for row in db.execute("PRAGMA table_info(user_inputs)")}
+		if "type_id" not in columns:
+			db.execute("ALTER TABLE user_inputs ADD COLUMN type_id INTEGER REFERENCES input_types (id)")
+		db.execute("""
+			CREATE INDEX IF NOT EXISTS idx_user_inputs_type
+			ON user_inputs (type_id)
+		""")
+	if "settings" not in columns:
+		return
+
+	with db.transaction():
+		# Versions are numbered per name in the order the settings were first used
+		db.execute("""
+			INSERT OR IGNORE INTO input_types (name, version, settings)
+			SELECT name, ROW_NUMBER() OVER (PARTITION BY name ORDER BY first_id), settings
+			FROM (
+				SELECT COALESCE(type, '') AS name, settings, MIN(id) AS first_id
+				FROM user_inputs
+				WHERE settings IS NOT NULL
+				GROUP BY settings
+			)
+		""")
+
+	max_id = db.execute("SELECT COALESCE(MAX(id), 0) FROM user_inputs").fetchone()[0]
+	for start in range(0, max_id, BACKFILL_BATCH):
+		with db.transaction():
+			db.execute("""
+				UPDATE user_inputs
+				SET type_id = (SELECT t.id FROM input_types AS t WHERE t.settings = user_inputs.settings)
+				WHERE id > ? AND id <= ? AND type_id IS NULL
+			""", (start, start + BACKFILL_BATCH))
+
+	with db.transaction():
+		db.execute("ALTER TABLE user_inputs DROP COLUMN settings")
+
+
+def _add_journal_entry_index(db: Database) -> None:
+	"""10: Journal records by entry, so archiving deletes them without a full scan."""
+	with db.transaction():
+		db.execute("""
+			CREATE INDEX IF NOT EXISTS idx_entry_journal_entry
+			ON entry_journal (entry_id)
+		""")
+
+
+def _add_quarantine(db: Database) -> None:
+	"""11: Entries the integrity scanner took out, with their content and the reason."""
+	with db.transaction():
+		db.execute("""
+			CREATE TABLE IF NOT EXISTS quarantine (
+			entry_id INTEGER PRIMARY KEY,
+			date TEXT,
+			iso_date TEXT,
+			type TEXT,
+			settings TEXT,
+			content TEXT,
+			reason TEXT NOT NULL,
+			found TEXT NOT NULL DEFAULT (datetime('now'))
+			)
+		""")
+
+
+def _add_journal_client(db: Database) -> None:
+	"""12: Client of every journal record, so undo and redo stay with the client that wrote it."""
+	with db.transaction():
+		columns = {row[1] for row in db.execute("PRAGMA table_info(entry_journal)")}
+		if "client" not in columns:
+			# Older records have no client: no one can undo them, and
+			# compaction drops them once they are ORPHAN_DAYS old
+			db.execute("ALTER TABLE entry_journal ADD COLUMN client TEXT")
+		db.execute("""
+			CREATE INDEX IF NOT EXISTS idx_entry_journal_client
+			ON entry_journal (client, state, seq)
+		""")
+
+
+def _reparse_amounts(db: Database) -> None:
+	"""13: Calc lines stored without an amount read again, now that signs and more decimals parse."""
+	with db.transaction():
+		# Before, "-12.50" or "0.125" was kept as plain text and left out of the totals
+		rows = db.execute("""
+			SELECT i.id, i.label, b.entry_id
+			FROM entry_items AS i
+			JOIN entry_blocks AS b ON b.id = i.block_id
+			WHERE b.kind = 'calc' AND i.amount_cents IS NULL AND i.label LIKE '%#%'
+		""").fetchall()
+		entry_ids = set()
+		for item_id, line, entry_id in rows:
+			label, _, amount = line.rpartition("#")
+			try:
+				cents = _cents(amount)
+			except ValueError:
+				# Still unreadable, listed by the integrity scanner
+				continue
+			db.execute("UPDATE entry_items SET label = ?, amount_cents = ? WHERE id = ?", (label, cents, item_id))
+			entry_ids.add(entry_id)
+		if not entry_ids:
+			return
+		blocks = _read_blocks(db, entry_ids)
+		for entry_id, iso_date, entry_type in db.execute("""
+			SELECT id, iso_date, type FROM user_inputs
+			WHERE id IN (SELECT value FROM json_each(?))
+		""", (json.dumps(sorted(entry_ids)),)).fetchall():
+			_index_entry(db, entry_id, entry_type, blocks.get(entry_id, []))
+			if iso_date is not None:
+				_write_facts(db, entry_id, iso_date, blocks.get(entry_id, []))
+
+
+def _rewrite_facts(db: Database) -> None:
+	"""14: Report facts counted again in Python; the SQL backfill of step 5 took workers from the wrong block."""
+	# Batches replace the facts they cover, so a resumed run is safe
+	max_id = db.execute("SELECT COALESCE(MAX(id), 0) FROM user_inputs").fetchone()[0]
+	for start in range(0, max_id, BACKFILL_BATCH):
+		with db.transaction():
+			rows = db.execute("""
+				SELECT id, iso_date FROM user_inputs
+				WHERE id > ? AND id <= ? AND iso_date IS NOT NULL
+			""", (start, start + BACKFILL_BATCH)).fetchall()
+			blocks = _read_blocks(db, [entry_id for entry_id, _ in rows])
+			for entry_id, iso_date in rows:
+				_write_facts(db, entry_id, iso_date, blocks.get(entry_id, []))
+
+
+# (version, step) in order; a step must be safe to re-run after a crash
+MIGRATIONS = (
+	(1, _create_user_inputs),
+	(2, _add_iso_date),
+	(3, _normalize_entries),
+	(4, _add_search_index),
+	(5, _add_summaries),
+	(6, _add_journal),
+	(7, _add_change_log),
+	(8, _add_archive_support),
+	(9, _add_input_types),
+	(10, _add_journal_entry_index),
+	(11, _add_quarantine),
+	(12, _add_journal_client),
+	(13, _reparse_amounts),
+	(14, _rewrite_facts),
+)
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_version(db: Database) -> int:
+	"""
+	Returns:
+		int: Schema version stored in PRAGMA user_version.
+	"""
+	return db.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(db: Database) -> int:
+	"""
+	Bring the database schema up to date.
+
+	Each migration is recorded in PRAGMA user_version as soon as it is
+	complete, so an interrupted run resumes with the unfinished step.
+
+	Args:
+		db (Database): Database to migrate.
+
+	Returns:
+		int: The schema version after migrating.
+	"""
+	version = get_version(db)
+	for target, step in MIGRATIONS:
+		if target <= version:
+			continue
+		step(db)
+		with db.transaction():
+			db.execute(f"PRAGMA user_version = {target}")
+		version = target
+	return version
+
+
+if __name__ == "__main__":
+	pass
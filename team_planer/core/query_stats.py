@@ -0,0 +1,257 @@
+import json
+import time
+import sqlite3
+import threading
+import datetime as dt
+from collections import deque
+
+SAMPLES = 512       # newest durations kept per statement, for the p95
+SLOW_KEEP = 100     # newest slow statements kept for the debug view
+
+
+def _percentile(samples: list[float], share: float) -> float:
+	"""Nearest-rank percentile of unsorted samples, 0 for none."""
+	if not samples:
+		return 0.0
+	ordered = sorted(samples)
+	return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+class QueryStats:
+	"""
+	Call counts, latency and returned rows per SQL statement.
+
+	Statements are keyed by their text with whitespace collapsed, so keep
+	parameters bound instead of formatted into the SQL. A statement's time
+	covers executing it and fetching its rows, not what the caller does
+	with the rows in between; phases outside SQLite, like building
+	widgets, are recorded with record() under a name in [ ].
+	"""
+
+	def __init__(self, slow_ms: int = 0, log_file: str | None = None, enabled: bool = True):
+		"""
+		Args:
+			slow_ms (int, optional): Statements taking at least this many
+				milliseconds go to the slow-query log, 0 turns it off.
+			log_file (str | None, optional): File the slow-query log is
+				appended to, in addition to the in-memory list.
+			enabled (bool, optional): Databases and callers record only
+				while this is set. Off, a statement costs one attribute check.
+		"""
+		self.enabled = enabled
+		self.slow_ms = slow_ms
+		self.log_file = log_file
+		self.lock = threading.Lock()
+		self.statements = {}    # key -> [calls, seconds, rows, max seconds, samples]
+		self.slow = deque(maxlen=SLOW_KEEP)
+		self.keys = {}          # raw SQL -> key, the same strings come back all the time
+		self.since = dt.datetime.now()
+
+	def _key(self, sql: str) -> str:
+		key = self.keys.get(sql)
+		if key is None:
+			key = self.keys[sql] = " ".join(sql.split())
+		return key
+
+	def record(self, sql: str, seconds: float, rows: int = 0) -> None:
+		"""
+		Add one execution.
+
+		Args:
+			sql (str): Statement, or a phase name like "[week widgets]".
+			seconds (float): Time taken.
+			rows (int, optional): Rows returned or changed.
+		"""
+		key = self._key(sql)
+		with self.lock:
+			stats = self.statements.get(key)
+			if stats is None:
+				stats = self.statements[key] = [0, 0.0, 0, 0.0, deque(maxlen=SAMPLES)]
+			stats[0] += 1
+			stats[1] += seconds
+			stats[2] += rows
+			stats[3] = max(stats[3], seconds)
+			stats[4].append(seconds)
+			slow = self.slow_ms and seconds * 1000 >= self.slow_ms
+			if slow:
+				entry = {
+					"time": dt.datetime.now().isoformat(timespec="seconds"),
+					"ms": round(seconds * 1000, 3),
+					"rows": rows,
+					"sql": key,
+				}
+				self.slow.append(entry)
+		if slow and self.log_file:
+			try:
+				with open(self.log_file, "a", encoding="utf-8") as file:
+					file.write(f"{entry['time']}\t{entry['ms']:.1f} ms\t{rows} rows\t{key}\n")
+			except OSError:
+				pass
+
+	def snapshot(self) -> dict:
+		"""
+		Returns:
+			dict: "since", "statements" (one dict per statement, most total
+				time first, times in ms) and "slow" (newest last).
+		"""
+		with self.lock:
+			items = [(key, stats[:4] + [list(stats[4])]) for key, stats in self.statements.items()]
+			slow = list(self.slow)
+		statements = [
+			{
+				"sql": key,
+				"calls": calls,
+				"total_ms": round(seconds * 1000, 3),
+				"mean_ms": round(seconds * 1000 / calls, 3),
+				"p95_ms": round(_percentile(samples, 0.95) * 1000, 3),
+				"max_ms": round(longest * 1000, 3),
+				"rows": rows,
+			}
+			for key, (calls, seconds, rows, longest, samples) in items
+		]
+		statements.sort(key=lambda statement: statement["total_ms"], reverse=True)
+		return {"since": self.since.isoformat(timespec="seconds"), "statements": statements, "slow": slow}
+
+	def dump(self, path: str) -> None:
+		"""
+		Write snapshot() to a JSON file.
+
+		Raises:
+			OSError: If the file cannot be written.
+		"""
+		with open(path, "w", encoding="utf-8") as file:
+			json.dump(self.snapshot(), file, ensure_ascii=False, indent=2)
+
+	def reset(self) -> None:
+		"""Forget all counts and the slow-query list."""
+		with self.lock:
+			self.statements.clear()
+			self.slow.clear()
+			self.since = dt.datetime.now()
+
+
+class TimedCursor:
+	"""
+	sqlite3.Cursor stand-in that reports its statement to QueryStats.
+
+	The statement is recorded once its rows are exhausted, fetchall() was
+	called or the cursor is dropped, whichever comes first.
+	"""
+
+	__slots__ = ("cursor", "stats", "sql", "seconds", "rows", "done")
+
+	def __init__(self, cursor: sqlite3.Cursor, stats: QueryStats, sql: str, seconds: float):
+		self.cursor = cursor
+		self.stats = stats
+		self.sql = sql
+		self.seconds = seconds
+		self.rows = 0
+		self.done = False
+
+	def __getattr__(self, name: str):
+		# lastrowid, rowcount, description, ...
+		return getattr(self.cursor, name)
+
+	def __iter__(self):
+		return self
+
+	def __next__(self):
+		started = time.perf_counter()
+		try:
+			row = next(self.cursor)
+		except StopIteration:
+			self.seconds += time.perf_counter() - started
+			self._finish()
+			raise
+		self.seconds += time.perf_counter() - started
+		self.rows += 1
+		return row
+
+	def fetchone(self):
+		started = time.perf_counter()
+		row = self.cursor.fetchone()
+		self.seconds += time.perf_counter() - started
+		if row is None:
+			self._finish()
+		else:
+			self.rows += 1
+		return row
+
+	def fetchmany(self, size: int | None = None) -> list:
+		started = time.perf_counter()
+		rows = self.cursor.fetchmany(self.cursor.arraysize if size is None else size)
+		self.seconds += time.perf_counter() - started
+		self.rows += len(rows)
+		if not rows:
+			self._finish()
+		return rows
+
+	def fetchall(self) -> list:
+		started = time.perf_counter()
+		rows = self.cursor.fetchall()
+		self.seconds += time.perf_counter() - started
+		self.rows += len(rows)
+		self._finish()
+		return rows
+
+	def _finish(self) -> None:
+		if self.done:
+			return
+		self.done = True
+		# INSERT/UPDATE/DELETE without RETURNING report changed rows instead
+		rows = self.rows or max(self.cursor.rowcount, 0)
+		self.stats.record(self.sql, self.seconds, rows)
+
+	def __del__(self):
+		try:
+			self._finish()
+		except Exception:
+			pass
+
+
+def explain(db, sql: str, params: tuple | dict = ()) -> list[str]:
+	"""
+	Args:
+		db (Database): Database to ask.
+		sql (str): Statement to plan; it is not run.
+		params (tuple | dict, optional): Bound parameters.
+
+	Returns:
+		list[str]: The detail lines of EXPLAIN QUERY PLAN.
+	"""
+	return [row[-1] for row in db.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()]
+
+
+def full_scans(plan: list[str]) -> list[str]:
+	"""
+	Args:
+		plan (list[str]): Lines from explain().
+
+	Returns:
+		list[str]: Lines that read a whole table or index; only SEARCH
+			lines look rows up. Virtual tables like json_each() and FTS
+			are left out, they plan on their own.
+	"""
+	return [line for line in plan if line.startswith("SCAN ") and "VIRTUAL TABLE" not in line]
+
+
+_stats = None
+_stats_lock = threading.Lock()
+
+
+def get_query_stats() -> QueryStats:
+	"""
+	Returns:
+		QueryStats: The process-wide statistics, set up from the config on first use.
+	"""
+	global _stats
+	with _stats_lock:
+		if _stats is None:
+			from team_planer.core.config_manager import ConfigManager
+			settings = ConfigManager().load_settings()
+			_stats = QueryStats(settings.slow_query_ms, enabled=settings.query_stats)
+		return _stats
+
+
+if __name__ == "__main__":
+	pass
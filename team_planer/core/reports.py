@@ -0,0 +1,149 @@
+import datetime as dt
+from team_planer.core.database import Database
+from team_planer.core.migrations import SUMMARY_KEYS
+from team_planer.core.archive import ARCHIVE, attach_archive
+from team_planer.core.entries import format_cents
+
+
+class Summary:
+	"""Precomputed figures of one day, week or month."""
+
+	__slots__ = ("key", "revenue_cents", "entries", "tours", "worker_days", "goal_met", "goal_missed")
+
+	def __init__(self, key: str, revenue_cents: int, entries: int, tours: int,
+				 worker_days: int, goal_met: int, goal_missed: int):
+		"""
+		Args:
+			key (str): ISO day, Monday of the week, or "yyyy-mm".
+			revenue_cents (int): Sum of all calc amounts.
+			entries (int): Number of entries.
+			tours (int): Entries checked against the worker goal.
+			worker_days (int): Workers summed over all entries.
+			goal_met (int): Tours that reached their goal.
+			goal_missed (int): Tours below their goal.
+		"""
+		self.key = key
+		self.revenue_cents = revenue_cents
+		self.entries = entries
+		self.tours = tours
+		self.worker_days = worker_days
+		self.goal_met = goal_met
+		self.goal_missed = goal_missed
+
+	def __repr__(self):
+		return f"Summary({self.key!r}, revenue_cents={self.revenue_cents!r}, tours={self.tours!r})"
+
+
+class ReportEngine:
+	"""
+	Reads the summary tables maintained by the entry_facts triggers.
+
+	Reports never touch entry content, so a year is at most 365 rows.
+	Periods before the archive boundary add up the archive's summaries.
+	"""
+
+	def __init__(self, db: Database):
+		"""
+		Args:
+			db (Database): Database with schema version 5 or later.
+		"""
+		self.db = db
+
+	def _source(self, table: str, start: str) -> str:
+		"""The summary table, unioned with the archive's if it can hold `start`."""
+		if not attach_archive(self.db, start):
+			return f"main.{table}"
+		return f"(SELECT * FROM main.{table} UNION ALL SELECT * FROM {ARCHIVE}.{table})"
+
+	def _read(self, table: str, start: str, end: str) -> list[Summary]:
+		rows = self.db.execute(f"""
+			SELECT key, SUM(revenue_cents), SUM(entries), SUM(tours), SUM(worker_days),
+				SUM(goal_met), SUM(goal_missed)
+			FROM {self._source(table, start)}
+			WHERE key BETWEEN ? AND ?
+			GROUP BY key
+			ORDER BY key
+		""", (start, end))
+		return [Summary(*row) for row in rows]
+
+	def days(self, start: dt.date, end: dt.date) -> list[Summary]:
+		"""
+		Returns:
+			list[Summary]: Days with entries in [start, end], keyed "yyyy-mm-dd".
+		"""
+		return self._read("day_summary", start.isoformat(), end.isoformat())
+
+	def weeks(self, start: dt.date, end: dt.date) -> list[Summary]:
+		"""
+		Returns:
+			list[Summary]: Weeks touching [start, end], keyed by their Monday.
+		"""
+		monday = start - dt.timedelta(start.weekday())
+		return self._read("week_summary", monday.isoformat(), end.isoformat())
+
+	def months(self, start: dt.date, end: dt.date) -> list[Summary]:
+		"""
+		Returns:
+			list[Summary]: Months touching [start, end], keyed "yyyy-mm".
+		"""
+		return self._read("month_summary", start.isoformat()[:7], end.isoformat()[:7])
+
+	def day_totals(self, start: dt.date, end: dt.date) -> dict[str, int]:
+		"""
+		Returns:
+			dict[str, int]: Revenue in cents per ISO day with entries.
+		"""
+		rows = self.db.execute(f"""
+			SELECT key, SUM(revenue_cents) FROM {self._source("day_summary", start.isoformat())}
+			WHERE key BETWEEN ? AND ?
+			GROUP BY key
+		""", (start.isoformat(), end.isoformat()))
+		return dict(rows.fetchall())
+
+	def sync_goal(self, goal_per_worker: int) -> int:
+		"""
+		Re-evaluate all tours against a new goal per worker.
+
+		Only facts whose goal changes are touched; their triggers move the
+		met/missed counts in the summaries.
+
+		Args:
+			goal_per_worker (int): input_goal_per_worker from the config.
+
+		Returns:
+			int: Number of tours that were re-evaluated.
+		"""
+		goal_cents = goal_per_worker * 100
+		with self.db.transaction():
+			self.db.execute("""
+				INSERT INTO report_meta (key, value) VALUES ('goal_cents_per_worker', ?)
+				ON CONFLICT (key) DO UPDATE SET value = excluded.value
+			""", (goal_cents,))
+			cursor = self.db.execute("""
+				UPDATE entry_facts SET goal_cents = workers * :goal
+				WHERE tour AND goal_cents IS NOT workers * :goal
+			""", {"goal": goal_cents})
+		return cursor.rowcount
+
+	def rebuild(self) -> None:
+		"""Recompute every summary from the facts, e.g. after a manual repair."""
+		with self.db.transaction():
+			for table, key in SUMMARY_KEYS:
+				self.db.execute(f"DELETE FROM {table}")
+				self.db.execute(f"""
+					INSERT INTO {table} (key, revenue_cents, entries, tours, worker_days, goal_met, goal_missed)
+					SELECT {key.format(r="f")}, SUM(revenue_cents), COUNT(*), SUM(tour), SUM(workers),
+						SUM(goal_cents IS NOT NULL AND revenue_cents >= goal_cents),
+						SUM(goal_cents IS NOT NULL AND revenue_cents < goal_cents)
+					FROM entry_facts AS f
+					GROUP BY 1
+				""")
+
+
+def format_money(cents: int) -> str:
+	"""Format cents the way the input window shows amounts, e.g. "1234,50€"."""
+	return format_cents(cents).replace(".", ",") + "€"
+
+
+if __name__ == "__main__":
+	pass
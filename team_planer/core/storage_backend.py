@@ -0,0 +1,320 @@
+import datetime as dt
+from abc import ABC, abstractmethod
+from typing import Iterator
+from team_planer.core.date_manager import DateManager
+from team_planer.core.entries import Block, check_amounts, text_memory_from_blocks
+from team_planer.core.config_manager import ConfigManager
+
+BACKENDS = ("sqlite", "memory")
+
+
+class Entry:
+	"""A decoded entry row, independent of any widget."""
+
+	__slots__ = ("id", "date", "iso_date", "settings", "blocks")
+
+	def __init__(self, id: int, date: str, iso_date: str, settings: list, blocks: list[Block]):
+		"""
+		Args:
+			id (int): Row id.
+			date (str): Date as "dd.mm.yyyy".
+			iso_date (str): Date as "yyyy-mm-dd".
+			settings (list): Input type metadata.
+			blocks (list[Block]): Input content.
+		"""
+		self.id = id
+		self.date = date
+		self.iso_date = iso_date
+		self.settings = settings
+		self.blocks = blocks
+
+	@property
+	def text_memory(self) -> list[list[str]]:
+		"""Content in the nested list form used by the input and edit windows."""
+		return text_memory_from_blocks(self.blocks)
+
+	def __repr__(self):
+		return f"Entry(id={self.id!r}, date={self.date!r}, settings={self.settings!r})"
+
+
+class SearchHit:
+	"""One full-text search result."""
+
+	__slots__ = ("id", "date", "iso_date", "type", "snippet")
+
+	def __init__(self, id: int, date: str, iso_date: str, type: str, snippet: str):
+		"""
+		Args:
+			id (int): Row id of the entry.
+			date (str): Date as "dd.mm.yyyy".
+			iso_date (str): Date as "yyyy-mm-dd".
+			type (str): Input type name.
+			snippet (str): Matching text, hits wrapped in [ ].
+		"""
+		self.id = id
+		self.date = date
+		self.iso_date = iso_date
+		self.type = type
+		self.snippet = snippet
+
+	def __repr__(self):
+		return f"SearchHit(id={self.id!r}, date={self.date!r}, snippet={self.snippet!r})"
+
+
+class StorageBackend(ABC):
+	"""
+	Entry storage used by the windows, the week loader and the entry writer.
+
+	Implementations store entries and provide the week cache and the undo
+	journal; the error reporting wrappers the windows call are shared.
+	Backends without a database file leave `db` as None, which turns off
+	the file based features: archive, backups and multi-client sync.
+	"""
+
+	db = None
+
+	def __init__(self, parent: object | None = None):
+		"""
+		Args:
+			parent (object | None): Parent window or controller, for popups.
+		"""
+		self.parent = parent
+		# Ids of entries that were left out because they could not be read
+		# or shown; the rest of their week is shown regardless
+		self.skipped = set()
+
+	@abstractmethod
+	def create_db(self) -> None:
+		"""Prepare the storage for use, e.g. create or migrate its schema."""
+
+	@abstractmethod
+	def transaction(self):
+		"""
+		Context manager running a block as one atomic write; nested use
+		joins the outer one.
+		"""
+
+	@abstractmethod
+	def iter_entries(self, start_date: dt.date | str, end_date: dt.date | str) -> Iterator[Entry]:
+		"""
+		Args:
+			start_date (date | str): First day, as date or "dd.mm.yyyy".
+			end_date (date | str): Last day (inclusive).
+
+		Yields:
+			Entry: Entries of the range ordered by date and id.
+		"""
+
+	@abstractmethod
+	def get_entry(self, entry_id: int) -> Entry | None:
+		"""
+		Returns:
+			Entry | None: The entry, None if it does not exist.
+		"""
+
+	@abstractmethod
+	def insert_entry(self, date: str, text_memory: list[list[str]], settings: list[str],
+					 entry_id: int | None = None, journal: bool = True) -> int:
+		"""
+		Insert an entry. Joins the caller's transaction, if any.
+
+		Args:
+			date (str): Date as "dd.mm.yyyy".
+			text_memory (list[list[str]]): Input content.
+			settings (list[str]): Input metadata.
+			entry_id (int | None, optional): Id to reuse, e.g. when undoing a
+				delete. A new id is assigned by default.
+			journal (bool, optional): Record the change for undo.
+
+		Returns:
+			int: Id of the new entry.
+		"""
+
+	@abstractmethod
+	def update_entry(self, entry_id: int, text_memory: list[list[str]], settings: list[str],
+					 journal: bool = True) -> str | None:
+		"""
+		Replace the content of an entry. Joins the caller's transaction, if any.
+
+		Returns:
+			str | None: ISO date of the updated entry, None if it does not exist.
+		"""
+
+	@abstractmethod
+	def delete_entry(self, entry_id: int, journal: bool = True) -> str | None:
+		"""
+		Delete an entry. Joins the caller's transaction, if any.
+
+		Returns:
+			str | None: ISO date of the deleted entry, None if it did not exist.
+		"""
+
+	@abstractmethod
+	def delete_all_entries(self) -> None:
+		"""Delete every entry and the undo journal."""
+
+	@abstractmethod
+	def search(self, text: str, limit: int = 50) -> list[SearchHit]:
+		"""
+		Every word of `text` has to match a word in the entry, the last one
+		as a prefix (case and diacritics are ignored).
+
+		Args:
+			text (str): Search input as typed.
+			limit (int, optional): Maximum number of hits.
+
+		Returns:
+			list[SearchHit]: Best hits first, empty for an empty query.
+		"""
+
+	@abstractmethod
+	def day_totals(self, start: dt.date, end: dt.date) -> dict[str, int]:
+		"""
+		Returns:
+			dict[str, int]: Revenue in cents per ISO day with entries.
+		"""
+
+	def sync_goal(self, goal_per_worker: int) -> int:
+		"""
+		Re-evaluate the tours against a new goal per worker.
+
+		Returns:
+			int: Number of updated entries; 0 for backends without reports.
+		"""
+		return 0
+
+	def data_version(self) -> int:
+		"""
+		Returns:
+			int: Changes when another client wrote; constant without clients.
+		"""
+		return 0
+
+	def last_change(self) -> int:
+		"""
+		Returns:
+			int: Newest change log position, 0 without a change log.
+		"""
+		return 0
+
+	def changes_since(self, seq: int) -> tuple[int, set[str] | None]:
+		"""
+		Returns:
+			tuple[int, set[str] | None]: The new position and the ISO days
+				other clients changed; None if every day has to be reloaded.
+		"""
+		return seq, set()
+
+	def prune_changes(self) -> int:
+		"""
+		Returns:
+			int: Number of dropped change log rows.
+		"""
+		return 0
+
+	def release_thread(self) -> None:
+		"""Free what the calling worker thread holds, e.g. its connection; nothing by default."""
+
+	def store_user_input(self, date: str, text_memory: list[list[str]], settings: list[str]) -> int | None:
+		"""
+		Store a user input entry.
+
+		Args:
+			date (str): Input date.
+			text_memory (list[list[str]]): Input content.
+			settings (list[str]): Input metadata.
+
+		Returns:
+			int | None: Row id of the new entry, None if storing failed.
+		"""
+		try:
+			check_amounts(text_memory)
+			entry_id = self.insert_entry(date, text_memory, settings)
+			self.week_cache.invalidate([DateManager.to_iso_date(date)])
+			return entry_id
+		except Exception as ex:
+			self.show_warning("E004")
+			return None
+
+	def update_user_input(self, entry_id: int, text_memory: list[list[str]], settings: list[str]) -> bool:
+		"""
+		Replace the content of an entry in a single transaction.
+
+		Args:
+			entry_id (int): Row id of the entry.
+			text_memory (list[list[str]]): New input content.
+			settings (list[str]): Input metadata.
+
+		Returns:
+			bool: True if the entry was updated.
+		"""
+		try:
+			check_amounts(text_memory)
+			with self.transaction():
+				iso_date = self.update_entry(entry_id, text_memory, settings)
+			self.week_cache.invalidate([iso_date])
+			return iso_date is not None
+		except Exception as ex:
+			self.show_warning("E004")
+			return False
+
+	def delete_db(self) -> None:
+		"""Delete all entries form the database."""
+		try:
+			self.delete_all_entries()
+			self.week_cache.clear()
+		except Exception as ex:
+			self.show_warning("E004")
+
+	def delete_user_input(self, entry_id: int) -> None:
+		"""
+		Delete a specific user input.
+
+		Args:
+			entry_id (int): Row id of the entry.
+		"""
+		try:
+			self.week_cache.invalidate([self.delete_entry(entry_id)])
+		except Exception as ex:
+			self.show_warning("E004")
+
+	def show_warning(self, error_code: str) -> None:
+		"""
+		Display an error window.
+
+		Args:
+			error_code (str): Error code to display.
+		"""
+		from team_planer.windows.warning_window import PopupWindow
+		error_window = PopupWindow("error", error_code, self.parent)
+		error_window.exec()
+
+
+def create_storage(parent: object | None = None, backend: str | None = None) -> StorageBackend:
+	"""
+	Create the storage the application works on.
+
+	Args:
+		parent (object | None, optional): Parent window or controller.
+		backend (str | None, optional): One of BACKENDS, defaults to the
+			configured storage_backend.
+
+	Returns:
+		StorageBackend: A StorageManager for "sqlite", a MemoryStorage for
+			"memory". Instances of the same backend share their data.
+
+	Raises:
+		ValueError: If the backend is unknown.
+	"""
+	backend = backend or ConfigManager().load_settings().storage_backend
+	if backend == "sqlite":
+		from team_planer.core.storage_manager import StorageManager
+		return StorageManager(parent)
+	if backend == "memory":
+		from team_planer.core.memory_storage import MemoryStorage
+		return MemoryStorage(parent)
+	raise ValueError(f"unknown storage backend: {backend!r}")
+
+
+if __name__ == "__main__":
+	pass
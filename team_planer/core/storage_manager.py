@@ -1,145 +1,548 @@
-import sqlite3
 import os
+import re
 import json
-from team_planer.windows.warning_window import PopupWindow
+import heapq
+import socket
+import datetime as dt
+from typing import Iterator
+from team_planer.core.database import get_database
+from team_planer.core.date_manager import DateManager
+from team_planer.core.migrations import migrate
+from team_planer.core.entries import (
+	Block, Item, blocks_from_text_memory, text_memory_from_blocks, insert_blocks, index_entry,
+	write_facts
+)
+from team_planer.core.week_cache import get_week_cache
+from team_planer.core.storage_backend import StorageBackend, Entry, SearchHit
+from team_planer.core.reports import ReportEngine
+from team_planer.core.journal import Journal, entry_image
+from team_planer.core.config_manager import ConfigManager
+from team_planer.core.archive import ARCHIVE, Archiver, attach_archive
+from team_planer.core.query_stats import get_query_stats
+from team_planer.core.integrity import decode_settings
 
 APP_NAME = "TeamPlaner"
 DATA_DIR = os.path.join(os.getenv("APPDATA"), APP_NAME)
 DB_FILE = os.path.join(DATA_DIR, "storage.db")
+# Shorter prefixes match most of the index and cannot be ranked fast enough
+PREFIX_MIN = 2
+RANK_WINDOW = 2000
+# Identifies this process in entry_changes, so it skips its own changes
+CLIENT_ID = f"{socket.gethostname()}/{os.getpid()}"
+CHANGE_LOG_KEEP = 10000
+SLOW_QUERY_LOG = os.path.join(DATA_DIR, "slow_queries.log")
 
-class StorageManager:
+def _fts_query(text: str) -> str:
+	"""
+	Turn free text into an FTS5 query: all words must match, the last one
+	(still being typed) as a prefix once it has PREFIX_MIN characters.
+	"""
+	words = [f'"{word}"' for word in re.findall(r"\w+", text)]
+	if words and len(words[-1]) - 2 >= PREFIX_MIN:
+		words[-1] += "*"
+	return " ".join(words)
+
+
+def _iso(date: dt.date | str) -> str:
+	"""Normalize a date or "dd.mm.yyyy" string to ISO-8601."""
+	if isinstance(date, dt.date):
+		return date.isoformat()
+	return DateManager.to_iso_date(date)
+
+
+def _entry_query(schema: str, where: str) -> str:
+	"""
+	Join of entries, blocks and items in one schema, one row per item.
+
+	Archived entries that were restored into the main database or deleted
+	there are left out.
+	"""
+	shadow = "AND e.id NOT IN (SELECT entry_id FROM main.archive_shadow)" if schema == ARCHIVE else ""
+	return f"""
+		SELECT e.id, e.date, e.iso_date, e.type_id, t.settings,
+			b.id, b.kind, b.goal_cents, b.header, i.label, i.amount_cents
+		FROM {schema}.user_inputs AS e
+		LEFT JOIN {schema}.input_types AS t ON t.id = e.type_id
+		LEFT JOIN {schema}.entry_blocks AS b ON b.entry_id = e.id
+		LEFT JOIN {schema}.entry_items AS i ON i.block_id = b.id
+		WHERE {where} {shadow}
+		ORDER BY e.iso_date, e.id, b.position, i.position
+	"""
+
+
+def _merge_entries(current: Iterator[Entry], archived: Iterator[Entry]) -> Iterator[Entry]:
+	"""Merge two date ordered streams; an entry in both is taken from `current`."""
+	last_id = None
+	for entry in heapq.merge(current, archived, key=lambda entry: (entry.iso_date, entry.id)):
+		if entry.id != last_id:
+			yield entry
+		last_id = entry.id
+
+
+def _fold_entries(rows, skipped: set | None = None) -> Iterator[Entry]:
+	"""
+	Fold entry/block/item join rows into entries.
+
+	Rows must be ordered by entry, block position and item position, one row
+	per item: (id, date, iso_date, type id, settings, block id, kind,
+	goal_cents, header, label, amount_cents). The settings of a type are
+	decoded once; its entries share the list.
+
+	Entries whose settings are unusable are left out and their ids added
+	to `skipped`, so one broken row does not cost the rest of the range.
+	"""
+	entry = block = None
+	block_id = skip_id = None
+	types = {}
+	for row in rows:
+		if row[0] == skip_id:
+			continue
+		if entry is None or entry.id != row[0]:
+			if entry is not None:
+				yield entry
+				entry = None
+			if row[3] not in types:
+				types[row[3]] = decode_settings(row[4])
+			settings = types[row[3]]
+			if settings is None:
+				skip_id = row[0]
+				if skipped is not None:
+					skipped.add(row[0])
+				continue
+			entry = Entry(row[0], row[1], row[2], settings, [])
+			block_id = None
+		if row[5] is None:
+			continue
+		if row[5] != block_id:
+			block_id = row[5]
+			block = Block(row[6], row[7], row[8])
+			entry.blocks.append(block)
+		if row[9] is not None:
+			block.items.append(Item(row[9], row[10]))
+	if entry is not None:
+		yield entry
+
+
+class StorageManager(StorageBackend):
 	"""Handles reading and writing user data to the SQLite database."""
 
-	# TODO: Change the doc with parent
-	def __init__(self, parent: object | None = None):
+	def __init__(self, parent: object | None = None, db_file: str | None = None, shared: bool | None = None):
 		"""
 		Args:
 			parent (object | None): Parent window or controller.
+			db_file (str | None): Database file. Defaults to the configured
+				database_file, or DB_FILE.
+			shared (bool | None): Multi-client mode, see Database. Defaults
+				to the configured shared_database.
 		"""
-		self.parent = parent
+		super().__init__(parent)
 		os.makedirs(DATA_DIR, exist_ok=True)
+		if db_file is None or shared is None:
+			settings = ConfigManager().load_settings()
+			db_file = db_file or settings.database_file or DB_FILE
+			shared = settings.shared_database if shared is None else shared
+		self.db = get_database(db_file, shared)
+		if self.db.stats is None:
+			# Recording starts once stats.enabled is set, e.g. from the Debug menu
+			stats = get_query_stats()
+			stats.log_file = stats.log_file or SLOW_QUERY_LOG
+			self.db.stats = stats
+		self.week_cache = get_week_cache(self.db.path)
+		self.journal = Journal(self)
+		self.reports = ReportEngine(self.db)
 
 	def create_db(self) -> None:
-		"""Create the database and 'user_inputs' table if not existing."""
+		"""Create the database or migrate it to the current schema."""
 		try:
-			connection = sqlite3.connect(DB_FILE)
-			cursor = connection.cursor()
-			cursor.execute("""
-				  CREATE TABLE IF NOT EXISTS user_inputs (
-				  id INTEGER PRIMARY KEY AUTOINCREMENT,
-				  date TEXT NOT NULL,
-				  type TEXT,
-				  settings TEXT,
-				  text TEXT
-				  )
-			""")
-			connection.commit()
-			connection.close()
+			migrate(self.db)
 		except Exception as ex:
 			self.show_warning("E004")
 
-	def load_user_data(self, date_frame_connection: map) -> None:
+	def transaction(self):
+		"""One write transaction, see Database.transaction."""
+		return self.db.transaction()
+
+	def day_totals(self, start: dt.date, end: dt.date) -> dict[str, int]:
+		"""Day totals from the precomputed day summaries, see ReportEngine."""
+		return self.reports.day_totals(start, end)
+
+	def sync_goal(self, goal_per_worker: int) -> int:
+		return self.reports.sync_goal(goal_per_worker)
+
+	def data_version(self) -> int:
+		return self.db.data_version()
+
+	def release_thread(self) -> None:
+		self.db.release()
+
+	def iter_entries(self, start_date: dt.date | str, end_date: dt.date | str) -> Iterator[Entry]:
 		"""
-		Load user inputs from the database into connected UI frames.
+		Stream the entries of a date range in date order.
+
+		Rows are decoded one at a time, so callers can walk years of data
+		without holding it all in memory. No Qt is involved. Ranges that
+		reach back before the archive boundary also read the archive.
 
 		Args:
-			date_frame_connection (map): Maps a date string to (layout, spacer).
+			start_date (date | str): First day, as date or "dd.mm.yyyy".
+			end_date (date | str): Last day (inclusive).
+
+		Yields:
+			Entry: Decoded entries ordered by date and id.
+
+		Raises:
+			sqlite3.Error: If the database cannot be read.
 		"""
-		from team_planer.ui_elements.user_input import UserInput
-		try:
-			connection = sqlite3.connect(DB_FILE)
-			cursor = connection.cursor()
-			dates = list(date_frame_connection.keys())
-			placeholder = ",".join("?" for _ in dates)
-			query = f"""
-				SELECT date, type, settings, text
-				FROM user_inputs
-				WHERE date IN ({placeholder})
-			"""
-			cursor.execute(query, dates)			
-			rows = cursor.fetchall()
-
-			for row in rows:
-				user_input = UserInput(
-					row[0],
-					json.loads(row[3]),
-					json.loads(row[2]),
-					date_frame_connection[row[0]][0],
-					date_frame_connection[row[0]][1]
-				)
-				user_input._show_input()
+		start, end = _iso(start_date), _iso(end_date)
+		where = "e.iso_date BETWEEN ? AND ?"
+		entries = _fold_entries(self.db.execute(_entry_query("main", where), (start, end)), self.skipped)
+		if not attach_archive(self.db, start):
+			yield from entries
+			return
+		archived = _fold_entries(self.db.execute(_entry_query(ARCHIVE, where), (start, end)), self.skipped)
+		yield from _merge_entries(entries, archived)
 
-			connection.close()
-		except Exception as ex:
-			self.show_warning("E004")
+	def get_entry(self, entry_id: int) -> Entry | None:
+		"""
+		Args:
+			entry_id (int): Row id of the entry.
+
+		Returns:
+			Entry | None: The decoded entry, None if it does not exist.
+
+		Raises:
+			sqlite3.Error: If the database cannot be read.
+		"""
+		cursor = self.db.execute(_entry_query("main", "e.id = ?"), (entry_id,))
+		return next(_fold_entries(cursor), None)
+
+	def _restore_archived(self, entry_id: int) -> None:
+		"""
+		Copy an archived entry back before it is changed. Call inside a transaction.
+
+		The archive is read-only here; its copy stays hidden through
+		archive_shadow until the next archive run replaces or drops it.
+		"""
+		if not self.db.is_attached(ARCHIVE):
+			return
+		if self.db.execute("SELECT 1 FROM user_inputs WHERE id = ?", (entry_id,)).fetchone():
+			return
+		cursor = self.db.execute(_entry_query(ARCHIVE, "e.id = ?"), (entry_id,))
+		entry = next(_fold_entries(cursor), None)
+		if entry is None:
+			return
+		self.insert_entry(entry.date, entry.text_memory, entry.settings, entry_id=entry_id, journal=False)
+		self.db.execute("INSERT OR IGNORE INTO archive_shadow (entry_id) VALUES (?)", (entry_id,))
+
+	def _type_id(self, settings: list[str]) -> int:
+		"""
+		Id of the input type version with exactly these settings, added as
+		the next version of its type if new. Call inside a transaction.
+		"""
+		key = json.dumps(settings)
+		row = self.db.execute("SELECT id FROM input_types WHERE settings = ?", (key,)).fetchone()
+		if row:
+			return row[0]
+		return self.db.execute("""
+			INSERT INTO input_types (name, version, settings)
+			SELECT ?, COALESCE(MAX(version), 0) + 1, ? FROM input_types WHERE name = ?
+		""", (settings[0], key, settings[0])).lastrowid
 
-	def store_user_input(self, date: str, text_memory: list[list[str]], settings: list[str]) -> None:
+	def restyle_input_type(self, type_id: int, settings: list[str]) -> int:
 		"""
-		Store a user input entry.
+		Change the settings of one input type version for all its entries,
+		e.g. new colors. The name stays, entries in the archive keep theirs.
+
+		If another version already has these settings, the entries move
+		over to it and this version is dropped.
+
+		Args:
+			type_id (int): Id of the version in input_types.
+			settings (list[str]): New settings with the same name.
+
+		Returns:
+			int: Number of restyled entries.
+
+		Raises:
+			ValueError: If the version does not exist or the name differs.
+			sqlite3.Error: If the database cannot be written.
+		"""
+		key = json.dumps(settings)
+		with self.db.transaction():
+			row = self.db.execute("SELECT name FROM input_types WHERE id = ?", (type_id,)).fetchone()
+			if row is None or row[0] != settings[0]:
+				raise ValueError(f"no input type version {type_id} named {settings[0]!r}")
+			other = self.db.execute(
+				"SELECT id FROM input_types WHERE settings = ? AND id != ?", (key, type_id)
+			).fetchone()
+			if other:
+				count = self.db.execute(
+					"UPDATE user_inputs SET type_id = ? WHERE type_id = ?", (other[0], type_id)
+				).rowcount
+				self.db.execute("DELETE FROM input_types WHERE id = ?", (type_id,))
+			else:
+				count = self.db.execute(
+					"SELECT COUNT(*) FROM user_inputs WHERE type_id = ?", (type_id,)
+				).fetchone()[0]
+				self.db.execute("UPDATE input_types SET settings = ? WHERE id = ?", (key, type_id))
+			self._log_change(None)
+		self.week_cache.clear()
+		return count
+
+	def insert_entry(self, date: str, text_memory: list[list[str]], settings: list[str],
+					 entry_id: int | None = None, journal: bool = True) -> int:
+		"""
+		Insert an entry with its blocks. Joins the caller's transaction, if any.
 
 		Args:
-			date (str): Input date.
+			date (str): Date as "dd.mm.yyyy".
 			text_memory (list[list[str]]): Input content.
 			settings (list[str]): Input metadata.
+			entry_id (int | None, optional): Row id to reuse, e.g. when undoing
+				a delete. A new id is assigned by default.
+			journal (bool, optional): Record the change for undo.
+
+		Returns:
+			int: Row id of the new entry.
+
+		Raises:
+			sqlite3.Error: If the entry cannot be written.
 		"""
-		try:
-			connection = sqlite3.connect(DB_FILE)
-			cursor = connection.cursor()
-			cursor.execute("""
-				  INSERT INTO user_inputs (date, type, settings, text)
-				  VALUES (?, ?, ?, ?)
+		iso_date = DateManager.to_iso_date(date)
+		with self.db.transaction():
+			entry_id = self.db.execute("""
+				  INSERT INTO user_inputs (id, date, iso_date, type, type_id)
+				  VALUES (?, ?, ?, ?, ?)
 			""", (
+				entry_id,
 				date,
+				iso_date,
 				settings[0],
-				json.dumps(settings),
-				json.dumps(text_memory)
-			))
-			connection.commit()
-			connection.close()
-		except Exception as ex:
-			self.show_warning("E004")
+				self._type_id(settings)
+			)).lastrowid
+			blocks = blocks_from_text_memory(text_memory)
+			insert_blocks(self.db, entry_id, blocks)
+			index_entry(self.db, entry_id, settings[0], blocks)
+			write_facts(self.db, entry_id, iso_date, blocks)
+			self._log_change(iso_date)
+			if journal:
+				self.journal.record(
+					"insert", entry_id, None, entry_image(date, settings, text_memory_from_blocks(blocks))
+				)
+		return entry_id
 
-	def delete_db(self) -> None:
-		"""Delete all entries form the database."""
-		try:
-			connection = sqlite3.connect(DB_FILE)
-			cursor = connection.cursor()
-			cursor.execute("DELETE FROM user_inputs")
-			connection.commit()
-			connection.close()
-		except Exception as ex:
-			self.show_warning("E004")
-	
-	def delete_user_input(self, date: str, text_memory: list[list[str]]) -> None:
+	def update_entry(self, entry_id: int, text_memory: list[list[str]], settings: list[str],
+					 journal: bool = True) -> str | None:
+		"""
+		Replace the content of an entry. Joins the caller's transaction, if any.
+
+		With `journal`, the old content is recorded so the change can be undone.
+
+		Returns:
+			str | None: ISO date of the updated entry, None if it does not exist.
+
+		Raises:
+			sqlite3.Error: If the entry cannot be written.
+		"""
+		with self.db.transaction():
+			self._restore_archived(entry_id)
+			before = self.get_entry(entry_id) if journal else None
+			rows = self.db.execute("""
+				  UPDATE user_inputs
+				  SET type = ?, type_id = ?
+				  WHERE id = ?
+				  RETURNING iso_date, date
+			""", (
+				settings[0],
+				self._type_id(settings),
+				entry_id
+			)).fetchall()
+			if not rows:
+				return None
+			# Items go with their blocks (ON DELETE CASCADE)
+			self.db.execute("DELETE FROM entry_blocks WHERE entry_id = ?", (entry_id,))
+			blocks = blocks_from_text_memory(text_memory)
+			insert_blocks(self.db, entry_id, blocks)
+			index_entry(self.db, entry_id, settings[0], blocks)
+			write_facts(self.db, entry_id, rows[0][0], blocks)
+			self._log_change(rows[0][0])
+			if journal:
+				self.journal.record(
+					"update", entry_id,
+					entry_image(before.date, before.settings, before.text_memory),
+					entry_image(rows[0][1], settings, text_memory_from_blocks(blocks))
+				)
+		return rows[0][0]
+
+	def delete_entry(self, entry_id: int, journal: bool = True) -> str | None:
+		"""
+		Delete an entry and its blocks. Joins the caller's transaction, if any.
+
+		With `journal`, the deleted content is recorded so it can be restored.
+
+		Returns:
+			str | None: ISO date of the deleted entry, None if it did not exist.
+
+		Raises:
+			sqlite3.Error: If the entry cannot be deleted.
+		"""
+		with self.db.transaction():
+			self._restore_archived(entry_id)
+			before = self.get_entry(entry_id) if journal else None
+			# fetchall() steps the statement to completion before any COMMIT
+			rows = self.db.execute("DELETE FROM user_inputs WHERE id = ? RETURNING iso_date", (entry_id,)).fetchall()
+			self.db.execute("DELETE FROM entry_search WHERE rowid = ?", (entry_id,))
+			if rows:
+				self._log_change(rows[0][0])
+			if rows and journal:
+				self.journal.record(
+					"delete", entry_id, entry_image(before.date, before.settings, before.text_memory), None
+				)
+		return rows[0][0] if rows else None
+
+	def _log_change(self, iso_date: str | None) -> None:
+		"""Tell other clients a day changed; None means all days. Call inside a transaction."""
+		self.db.execute("INSERT INTO entry_changes (client, iso_date) VALUES (?, ?)", (CLIENT_ID, iso_date))
+
+	def last_change(self) -> int:
+		"""
+		Returns:
+			int: Newest change log sequence number, 0 for none.
+		"""
+		return self.db.execute("SELECT COALESCE(MAX(seq), 0) FROM entry_changes").fetchone()[0]
+
+	def changes_since(self, seq: int) -> tuple[int, set[str] | None]:
 		"""
-		Delete a specific user input.
+		Days changed by other clients after a change log position.
 
 		Args:
-			date (str): Date of the entry.
-			text_memory (list[list[str]]): Input content to match.
+			seq (int): Position returned by the previous call or last_change().
+
+		Returns:
+			tuple[int, set[str] | None]: The new position and the changed ISO
+				days; None if every day has to be reloaded because all entries
+				were deleted or the log was pruned past `seq`.
+
+		Raises:
+			sqlite3.Error: If the log cannot be read.
 		"""
-		try:
-			connection = sqlite3.connect(DB_FILE)
-			cursor = connection.cursor()
-			json_text = json.dumps(text_memory)
-			cursor.execute("""
-				  DELETE FROM user_inputs
-				  WHERE date = ? AND text = ?
-			""", (date, json_text))			
-			connection.commit()
-			connection.close()
-		except Exception as ex:
-			self.show_warning("E004")
-	
-	def show_warning(self, error_code: str) -> None:
+		first, last = self.db.execute("SELECT MIN(seq), MAX(seq) FROM entry_changes").fetchone()
+		if last is None or last <= seq:
+			return seq, set()
+		if first > seq + 1:
+			return last, None
+		dates = set()
+		for (iso_date,) in self.db.execute("""
+			SELECT iso_date FROM entry_changes
+			WHERE seq > ? AND seq <= ? AND client != ?
+		""", (seq, last, CLIENT_ID)):
+			if iso_date is None:
+				return last, None
+			dates.add(iso_date)
+		return last, dates
+
+	def prune_changes(self, keep: int = CHANGE_LOG_KEEP) -> int:
+		"""
+		Drop old change log rows. Clients behind the pruned range reload everything.
+
+		Returns:
+			int: Number of deleted rows.
+		"""
+		with self.db.transaction():
+			return self.db.execute("""
+				DELETE FROM entry_changes
+				WHERE seq <= (SELECT COALESCE(MAX(seq), 0) FROM entry_changes) - ?
+			""", (keep,)).rowcount
+
+	def restore_snapshot(self, path: str, backups: object) -> str:
+		"""
+		Replace all entries with the content of a snapshot.
+
+		The change log continues after its current position, so other
+		clients notice the restore and reload everything.
+
+		Args:
+			path (str): Snapshot file.
+			backups (Backups): Snapshot set of this database.
+
+		Returns:
+			str: Snapshot of the state before the restore.
+
+		Raises:
+			sqlite3.Error: If the snapshot cannot be restored.
+		"""
+		last = self.last_change()
+		before = backups.restore(path)
+		with self.db.transaction():
+			self.db.execute("""
+				INSERT INTO entry_changes (seq, client, iso_date)
+				SELECT MAX(COALESCE(MAX(seq), 0), ?) + 1, ?, NULL FROM entry_changes
+			""", (last, CLIENT_ID))
+		self.week_cache.clear()
+		return before
+
+	def search(self, text: str, limit: int = 50) -> list[SearchHit]:
 		"""
-		Display an error window.
+		Full-text search over all entries.
+
+		Every word of `text` has to match a word in the entry, the last one
+		as a prefix (case and diacritics are ignored). Best matches among the
+		newest RANK_WINDOW hits come first, newer dates first among equals.
+		Archived entries fill up the hits if the current ones run short.
 
 		Args:
-			error_code (str): Error code to display.
+			text (str): Search input as typed.
+			limit (int, optional): Maximum number of hits.
+
+		Returns:
+			list[SearchHit]: Ranked hits, empty for an empty query.
+
+		Raises:
+			sqlite3.Error: If the index cannot be read.
 		"""
-		error_window = PopupWindow("error", error_code, self.parent)
-		error_window.exec()
+		query = _fts_query(text)
+		if not query:
+			return []
+		hits = self._search("main", query, limit)
+		if len(hits) < limit and attach_archive(self.db):
+			seen = {hit.id for hit in hits}
+			archived = [hit for hit in self._search(ARCHIVE, query, limit) if hit.id not in seen]
+			hits += archived[:limit - len(hits)]
+		return hits
+
+	def _search(self, schema: str, query: str, limit: int) -> list[SearchHit]:
+		shadow = "AND e.id NOT IN (SELECT entry_id FROM main.archive_shadow)" if schema == ARCHIVE else ""
+		# Only the newest RANK_WINDOW matches are ranked, which keeps broad
+		# queries like a single common word within the typing budget
+		rows = self.db.execute(f"""
+			WITH recent AS (
+				SELECT rowid FROM {schema}.entry_search
+				WHERE entry_search MATCH :query
+				ORDER BY rowid DESC
+				LIMIT :window
+			)
+			SELECT e.id, e.date, e.iso_date, e.type,
+				snippet(entry_search, 0, '[', ']', '…', 8)
+			FROM {schema}.entry_search
+			JOIN {schema}.user_inputs AS e ON e.id = entry_search.rowid
+			WHERE entry_search MATCH :query
+			AND entry_search.rowid >= (SELECT MIN(rowid) FROM recent)
+			{shadow}
+			ORDER BY entry_search.rank, e.iso_date DESC
+			LIMIT :limit
+		""", {"query": query, "window": RANK_WINDOW, "limit": limit}).fetchall()
+		return [SearchHit(*row) for row in rows]
+
+	def delete_all_entries(self) -> None:
+		"""Delete every entry, the undo journal and the archive."""
+		with self.db.transaction():
+			self.db.execute("DELETE FROM user_inputs")
+			self.db.execute("DELETE FROM input_types")
+			self.db.execute("DELETE FROM entry_search")
+			self.db.execute("DELETE FROM archive_shadow")
+			self.journal.clear()
+			self._log_change(None)
+		Archiver(self.db).clear()
 
 
 if __name__ == "__main__":
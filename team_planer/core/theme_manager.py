@@ -0,0 +1,191 @@
+import re
+from PySide6.QtCore import QObject, Qt
+from PySide6.QtWidgets import QApplication
+from team_planer.core.config_manager import ConfigManager
+from team_planer.core.config_schema import AppConfig
+from team_planer.core.config_watcher import get_config_watcher
+
+STYLE_PREFIXES = ("display-window_", "user-input_", "edit-window_", "input-window_")
+
+
+class ThemeManager(QObject):
+	"""Compiles the style keys of the config into one application stylesheet."""
+
+	def __init__(self, parent=None):
+		super().__init__(parent)
+		self.config_manager = ConfigManager()
+		self.colors = {}
+		self.stylesheet = ""
+
+		get_config_watcher().configChanged.connect(self._on_config_changed)
+
+	def _on_config_changed(self, changed: frozenset) -> None:
+		if any(key.startswith(STYLE_PREFIXES) for key in changed):
+			self.apply()
+
+	def color_key(self, color: str) -> str:
+		"""
+		Get the property value that selects a border color.
+
+		Unknown colors are added to the stylesheet on first use.
+
+		Args:
+			color (str): CSS color (e.g. "#0000FF").
+
+		Returns:
+			str: Value for the 'borderColor' dynamic property.
+		"""
+		key = self._key_name(color)
+		if key not in self.colors:
+			self.colors[key] = color
+			if self.stylesheet:
+				self.apply()
+		return key
+
+	def _register_type_colors(self, settings: AppConfig) -> None:
+		"""Pre-register the colors of all configured input types."""
+		for input_type in settings.input_window.input_types.values():
+			for color in (input_type.inner_color, input_type.outer_color):
+				self.colors.setdefault(self._key_name(color), color)
+
+	@staticmethod
+	def _key_name(color: str) -> str:
+		return "c" + re.sub(r"[^0-9a-zA-Z]", "", color).lower()
+
+	@staticmethod
+	def _weight(weight: str) -> str:
+		return "bold" if weight == "Bold" else "normal"
+
+	def compile(self, settings: AppConfig) -> str:
+		"""
+		Build the application stylesheet.
+
+		Args:
+			settings (AppConfig): Current configuration.
+
+		Returns:
+			str: The compiled QSS.
+		"""
+		self._register_type_colors(settings)
+		d = settings.display
+		u = settings.user_input
+		i = settings.input_window
+		e = settings.edit_window
+		rules = [
+			f"""
+			QFrame#DayFrame {{
+				border: {d.content_frame_border_width}px solid;
+				border-radius: {d.content_frame_border_radius}px;
+				border-color: {d.content_frame_border_color};
+			}}
+			QFrame#DayFrame[today="true"] {{
+				border-color: {d.tday_content_frame_border_color};
+			}}
+			QLabel#DayHeader {{
+				padding: {d.header_frame_padding}px;
+				border: {d.header_frame_border_width}px solid;
+				border-radius: {d.header_frame_border_radius}px;
+				border-color: {d.header_frame_border_color};
+			}}
+			QLabel#DayHeader[today="true"] {{
+				border-color: {d.tday_header_frame_border_color};
+			}}
+			QFrame#EntryFrame {{
+				border: {u.outer_border_width}px solid;
+				border-radius: {u.outer_border_radius}px;
+				border-color: {u.outer_border_color};
+			}}
+			QLabel#EntryLabel {{
+				font-size: {u.font_size}px;
+				font-family: {u.font_family};
+				font-weight: {self._weight(u.font_weight)};
+				border: {u.inner_border_width}px solid;
+				border-radius: {u.inner_border_radius}px;
+				border-color: {u.inner_border_color};
+			}}
+			QFrame#InputFrame {{
+				border: {i.outer_border_width}px solid;
+				border-radius: {i.outer_border_radius}px;
+				border-color: {i.outer_border_color};
+			}}
+			QLabel#InputLabel {{
+				border: {i.inner_border_width}px solid;
+				border-radius: {i.inner_border_radius}px;
+				border-color: {i.inner_border_color};
+			}}
+			QLabel#InputLabel[focused="true"] {{
+				border-color: {i.focus_color};
+			}}
+			#InputField {{
+				background-color: #121212;
+			}}
+			QFrame#EditFrame {{
+				border: {e.outer_border_width}px solid;
+				border-radius: {e.outer_border_radius}px;
+				border-color: {e.outer_border_color};
+			}}
+			QLabel#EditLabel {{
+				border: {e.inner_border_width}px solid;
+				border-radius: {e.inner_border_radius}px;
+				border-color: {e.inner_border_color};
+			}}
+			QLabel#EditLabel[focused="true"] {{
+				border-color: {e.focus_color};
+			}}
+			"""
+		]
+		for key, color in self.colors.items():
+			rules.append(
+				f'QFrame#EntryFrame[borderColor="{key}"], '
+				f'QLabel#EntryLabel[borderColor="{key}"] {{ border-color: {color}; }}\n'
+			)
+		# Calculation results win over the type color
+		rules.append(
+			f'QFrame#EntryFrame[calc="true"] {{ border-color: {u.calc_true_color}; }}\n'
+			f'QFrame#EntryFrame[calc="false"] {{ border-color: {u.calc_false_color}; }}\n'
+		)
+		return "".join(rules)
+
+	def apply(self) -> None:
+		"""Compile the current config and install it on the application."""
+		self.stylesheet = self.compile(self.config_manager.load_settings())
+		app = QApplication.instance()
+		if app is not None:
+			app.setStyleSheet(self.stylesheet)
+
+
+_theme = None
+
+
+def get_theme_manager() -> ThemeManager:
+	"""
+	Returns:
+		ThemeManager: The process-wide theme, applied on first use.
+	"""
+	global _theme
+	if _theme is None:
+		_theme = ThemeManager()
+		_theme.apply()
+	return _theme
+
+
+def set_style_property(widget: object, name: str, value: str) -> None:
+	"""
+	Set a dynamic style property and re-polish only if it changed.
+
+	Args:
+		widget (QWidget): Widget styled by the application stylesheet.
+		name (str): Property name used in the stylesheet selectors.
+		value (str): New property value.
+	"""
+	if widget.property(name) == value:
+		return
+	widget.setProperty(name, value)
+	if widget.testAttribute(Qt.WA_WState_Polished):
+		style = widget.style()
+		style.unpolish(widget)
+		style.polish(widget)
+
+
+if __name__ == "__main__":
+	pass
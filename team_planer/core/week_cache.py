@@ -0,0 +1,153 @@
+import datetime as dt
+import threading
+from collections import OrderedDict
+
+CACHE_WEEKS = 12     # decoded weeks kept per database
+PREFETCH_WEEKS = 1   # weeks loaded ahead on each side of the visible range
+
+
+class WeekCache:
+	"""
+	LRU cache of decoded entries, one slot per calendar week.
+
+	Weeks are keyed by the ISO date of their Monday, so the keys stay valid
+	when "today" moves on. Safe to use from the loader threads.
+	"""
+
+	def __init__(self, max_weeks: int = CACHE_WEEKS):
+		"""
+		Args:
+			max_weeks (int, optional): Number of weeks kept before the least
+				recently used one is dropped.
+		"""
+		self.max_weeks = max_weeks
+		self.weeks = OrderedDict()
+		self.lock = threading.Lock()
+		self.version = 0
+		self.hits = 0
+		self.misses = 0
+
+	@staticmethod
+	def week_of(iso_date: str) -> str:
+		"""
+		Returns:
+			str: ISO date of the Monday of the week containing iso_date.
+		"""
+		date = dt.date.fromisoformat(iso_date)
+		return (date - dt.timedelta(date.weekday())).isoformat()
+
+	@classmethod
+	def week_range(cls, start: str, end: str) -> list[str]:
+		"""
+		Returns:
+			list[str]: Mondays of all weeks touching [start, end].
+		"""
+		week = dt.date.fromisoformat(cls.week_of(start))
+		last = dt.date.fromisoformat(end)
+		weeks = []
+		while week <= last:
+			weeks.append(week.isoformat())
+			week += dt.timedelta(7)
+		return weeks
+
+	@staticmethod
+	def shift(week: str, weeks: int) -> str:
+		"""Monday `weeks` weeks away from the given Monday."""
+		return (dt.date.fromisoformat(week) + dt.timedelta(weeks * 7)).isoformat()
+
+	def get(self, week: str) -> list | None:
+		"""
+		Args:
+			week (str): Monday of the week.
+
+		Returns:
+			list[Entry] | None: Cached entries, None on a miss.
+		"""
+		with self.lock:
+			entries = self.weeks.get(week)
+			if entries is None:
+				self.misses += 1
+				return None
+			self.weeks.move_to_end(week)
+			self.hits += 1
+			return entries
+
+	def contains(self, week: str) -> bool:
+		"""Check for a week without touching the counters or LRU order."""
+		with self.lock:
+			return week in self.weeks
+
+	def put(self, week: str, entries: list, version: int) -> bool:
+		"""
+		Store the entries of a week read at cache `version`.
+
+		Results read before the last invalidation are refused, so a load
+		racing a write can never cache the old state.
+
+		Returns:
+			bool: True if the week was stored.
+		"""
+		with self.lock:
+			if version != self.version:
+				return False
+			self.weeks[week] = entries
+			self.weeks.move_to_end(week)
+			while len(self.weeks) > self.max_weeks:
+				self.weeks.popitem(last=False)
+			return True
+
+	def invalidate(self, iso_dates) -> None:
+		"""
+		Drop the weeks containing the given dates.
+
+		Args:
+			iso_dates (Iterable[str]): Dates ("yyyy-mm-dd") that were written.
+		"""
+		weeks = {self.week_of(iso_date) for iso_date in iso_dates if iso_date}
+		with self.lock:
+			self.version += 1
+			for week in weeks:
+				self.weeks.pop(week, None)
+
+	def clear(self) -> None:
+		"""Drop every cached week."""
+		with self.lock:
+			self.version += 1
+			self.weeks.clear()
+
+	def info(self) -> dict:
+		"""
+		Returns:
+			dict: Hit/miss counters and fill level, for tuning PREFETCH_WEEKS.
+		"""
+		with self.lock:
+			return {
+				"hits": self.hits,
+				"misses": self.misses,
+				"weeks": len(self.weeks),
+				"max_weeks": self.max_weeks
+			}
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_week_cache(path: str) -> WeekCache:
+	"""
+	Args:
+		path (str): Database file the cache belongs to.
+
+	Returns:
+		WeekCache: Shared cache for that database.
+	"""
+	with _caches_lock:
+		cache = _caches.get(path)
+		if cache is None:
+			cache = WeekCache()
+			_caches[path] = cache
+		return cache
+
+
+if __name__ == "__main__":
+	pass
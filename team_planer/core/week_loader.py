@@ -0,0 +1,200 @@
+import time
+import datetime as dt
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+from team_planer.core.date_manager import DateManager
+from team_planer.core.storage_backend import StorageBackend
+from team_planer.core.week_cache import WeekCache, PREFETCH_WEEKS
+from team_planer.core.query_stats import get_query_stats
+
+
+class _LoadTask(QRunnable):
+	"""Fetches, decodes and caches whole weeks on a pool thread."""
+
+	def __init__(self, loader: "WeekLoader", generation: int, weeks: list[str], cached: dict | None = None,
+				 start: str = "", end: str = "", request: object = None):
+		"""
+		Args:
+			loader (WeekLoader): Owner of the pool and the cache.
+			generation (int): Loader generation at request time.
+			weeks (list[str]): Mondays of the weeks to fetch.
+			cached (dict | None): Weeks already taken from the cache; None
+				marks a prefetch that delivers nothing.
+			start, end (str): Requested ISO range.
+			request (object): Passed back unchanged with the result.
+		"""
+		super().__init__()
+		self.loader = loader
+		self.generation = generation
+		self.weeks = weeks
+		self.cached = cached
+		self.start = start
+		self.end = end
+		self.request = request
+
+	def run(self) -> None:
+		prefetch = self.cached is None
+		if not prefetch and self.loader.is_stale(self.generation):
+			return
+		try:
+			weeks = self.loader._fetch(self.weeks, None if prefetch else self.generation)
+		except Exception as ex:
+			if not prefetch:
+				self.loader._failed.emit(self.generation, ex)
+			return
+		finally:
+			# The pool retires idle threads; a connection left behind would
+			# stay open until exit, one more for every replacement thread
+			self.loader.storage_manager.release_thread()
+		if prefetch or weeks is None:
+			return
+		weeks.update(self.cached)
+		entries = WeekLoader._select(weeks, self.start, self.end)
+		self.loader._finished.emit(self.generation, self.request, entries)
+
+
+class WeekLoader(QObject):
+	"""
+	Loads entries off the GUI thread and hands them back through a signal.
+
+	Decoded weeks are kept in the storage's WeekCache and the weeks next to
+	each request are prefetched, so week navigation is usually served from
+	memory without touching the pool. Results of requests issued before the
+	last cancel() are dropped, so quick week changes only ever show the data
+	of the current week.
+	"""
+
+	entriesLoaded = Signal(object, object)
+	loadFailed = Signal(object)
+
+	# Emitted from the pool thread, delivered queued on the GUI thread
+	_finished = Signal(int, object, object)
+	_failed = Signal(int, object)
+
+	def __init__(self, storage_manager: StorageBackend, parent=None):
+		"""
+		Args:
+			storage_manager (StorageBackend): Source of the entries.
+			parent (QObject, optional): Qt parent.
+		"""
+		super().__init__(parent)
+		self.storage_manager = storage_manager
+		self.cache = storage_manager.week_cache
+		self.generation = 0
+		# One worker per loader, so requests run in order and clear() only
+		# drops this loader's queued work
+		self.pool = QThreadPool(self)
+		self.pool.setMaxThreadCount(1)
+
+		self._finished.connect(self._on_finished)
+		self._failed.connect(self._on_failed)
+
+	def request(self, start_date: str, end_date: str, request: object = None) -> None:
+		"""
+		Load a date range, from the cache if possible.
+
+		A fully cached range is delivered before this returns; otherwise
+		the missing weeks are queued on the pool.
+
+		Args:
+			start_date (str): First day as "dd.mm.yyyy".
+			end_date (str): Last day (inclusive).
+			request (object, optional): Passed back unchanged with the result.
+		"""
+		start = DateManager.to_iso_date(start_date)
+		end = DateManager.to_iso_date(end_date)
+		weeks = WeekCache.week_range(start, end)
+		cached = {}
+		for week in weeks:
+			entries = self.cache.get(week)
+			if entries is not None:
+				cached[week] = entries
+		missing = [week for week in weeks if week not in cached]
+		if missing:
+			self.pool.start(_LoadTask(self, self.generation, missing, cached, start, end, request))
+		else:
+			self.entriesLoaded.emit(request, self._select(cached, start, end))
+		self.prefetch(weeks)
+
+	def prefetch(self, weeks: list[str], depth: int = PREFETCH_WEEKS) -> None:
+		"""
+		Queue the uncached weeks around a range at low priority.
+
+		Args:
+			weeks (list[str]): Mondays of the visible range.
+			depth (int, optional): Weeks to load on each side.
+		"""
+		around = [WeekCache.shift(weeks[0], -i) for i in range(1, depth + 1)]
+		around += [WeekCache.shift(weeks[-1], i) for i in range(1, depth + 1)]
+		missing = sorted(week for week in around if not self.cache.contains(week))
+		if missing:
+			self.pool.start(_LoadTask(self, self.generation, missing), -1)
+
+	def cancel(self) -> None:
+		"""Drop all pending and running requests."""
+		self.generation += 1
+		self.pool.clear()
+
+	def is_stale(self, generation: int) -> bool:
+		return generation != self.generation
+
+	def wait(self, msecs: int = -1) -> bool:
+		"""
+		Block until all queued loads are done. Results still arrive through
+		the event loop.
+
+		Args:
+			msecs (int, optional): Timeout, -1 waits forever.
+
+		Returns:
+			bool: True if the pool ran dry in time.
+		"""
+		return self.pool.waitForDone(msecs)
+
+	def _fetch(self, weeks: list[str], generation: int | None) -> dict | None:
+		"""
+		Read whole weeks with one range query and cache them.
+
+		Runs on the pool thread. Returns None if the request went stale.
+		The whole fetch, SQL and decoding, is recorded as "[week load]".
+		"""
+		started = time.perf_counter()
+		count = 0
+		version = self.cache.version
+		loaded = {week: [] for week in weeks}
+		first = dt.date.fromisoformat(weeks[0])
+		last = dt.date.fromisoformat(weeks[-1]) + dt.timedelta(6)
+		for entry in self.storage_manager.iter_entries(first, last):
+			if generation is not None and self.is_stale(generation):
+				return None
+			bucket = loaded.get(WeekCache.week_of(entry.iso_date))
+			if bucket is not None:
+				bucket.append(entry)
+				count += 1
+		for week, entries in loaded.items():
+			self.cache.put(week, entries, version)
+		stats = get_query_stats()
+		if stats.enabled:
+			stats.record("[week load]", time.perf_counter() - started, count)
+		return loaded
+
+	@staticmethod
+	def _select(weeks: dict, start: str, end: str) -> list:
+		"""Entries of [start, end] from per-week lists, in date order."""
+		return [
+			entry
+			for week in sorted(weeks)
+			for entry in weeks[week]
+			if start <= entry.iso_date <= end
+		]
+
+	def _on_finished(self, generation: int, request: object, entries: list) -> None:
+		if not self.is_stale(generation):
+			self.entriesLoaded.emit(request, entries)
+
+	def _on_failed(self, generation: int, error: Exception) -> None:
+		if not self.is_stale(generation):
+			self.loadFailed.emit(error)
+
+
+if __name__ == "__main__":
+	pass
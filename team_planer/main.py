@@ -1,19 +1,30 @@
 import sys
+import sqlite3
+import threading
 from PySide6.QtWidgets import QApplication
 from PySide6.QtGui import QPalette, QColor
 from PySide6.QtCore import Qt
 from team_planer.windows.main_window import MainWindow
-from team_planer.core.storage_manager import StorageManager
+from team_planer.core.storage_backend import create_storage
 from team_planer.core.config_manager import ConfigManager
+from team_planer.core.theme_manager import get_theme_manager
+from team_planer.core.database import close_databases
+from team_planer.core.entry_writer import close_entry_writer
+from team_planer.core.change_watcher import get_change_watcher
+from team_planer.core.archive import Archiver
+from team_planer.core.backup import get_backup_service
+from team_planer.windows.warning_window import PopupWindow
 
 class App:
 	"""Main application controller."""
 
 	def __init__(self):
-		self.storage_manager = StorageManager()
+		self.storage_manager = create_storage()
 		self.config_manager = ConfigManager()
 
 		self.app = QApplication(sys.argv)
+		self.app.aboutToQuit.connect(close_entry_writer)
+		self.app.aboutToQuit.connect(close_databases)
 
 	def _setup_dark_mode(self) -> None:
 		"""Apply a dark theme palette to the application."""
@@ -43,15 +54,51 @@ class App:
 
 		self.app.setPalette(palette)
 
+	def _show_config_errors(self, errors: tuple) -> None:
+		"""
+		Report all config problems in a single popup.
+
+		Args:
+			errors (tuple): Validation messages; defaults are used instead.
+		"""
+		error_window = PopupWindow("error", "E005")
+		error_window.setDetailedText("\n".join(errors))
+		error_window.exec()
+
+	def _archive(self, keep_days: int) -> None:
+		"""Apply the retention policy; runs on its own thread at startup."""
+		try:
+			Archiver(self.storage_manager.db).run(keep_days)
+		except sqlite3.Error:
+			# Retried on the next start, nothing is lost
+			pass
+		finally:
+			self.storage_manager.db.release()
+
 	def run(self) -> None:
 		"""Starts the application event loop."""
 		self._setup_dark_mode()
-		config = self.config_manager.load_config()
-		self.main_window = MainWindow(config["weeks_shown"])
+		get_theme_manager()
+		settings = self.config_manager.load_settings()
+		if settings.errors:
+			self._show_config_errors(settings.errors)
+		self.main_window = MainWindow(settings.weeks_shown)
 		self.storage_manager.create_db()
-		self.storage_manager.load_user_data(
-			self.main_window.get_date_frame_connection()
-		)
+		try:
+			self.storage_manager.sync_goal(settings.input_goal_per_worker)
+			self.storage_manager.journal.compact()
+			self.storage_manager.prune_changes()
+		except sqlite3.Error:
+			# create_db() has already reported the database problem
+			pass
+		self.main_window.load_entries()
+		get_change_watcher().start()
+		if self.storage_manager.db is not None:
+			get_backup_service().start()
+		if settings.archive_after_days and self.storage_manager.db is not None:
+			threading.Thread(
+				target=self._archive, args=(settings.archive_after_days,), name="Archiver", daemon=True
+			).start()
 		self.main_window.showMaximized()
 		sys.exit(self.app.exec())
 
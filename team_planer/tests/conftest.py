@@ -0,0 +1,9 @@
+import pytest
+from team_planer.core.storage_manager import StorageManager
+
+@pytest.fixture
+def sm(tmp_path):
+	"""Empty StorageManager on a temporary database, outside the configured one."""
+	storage = StorageManager(db_file=str(tmp_path / "test.db"), shared=False)
+	storage.create_db()
+	return storage
@@ -0,0 +1,64 @@
+import os
+import datetime as dt
+import pytest
+from team_planer.core.reports import ReportEngine
+from team_planer.core.archive import Archiver, archive_path
+
+SETTINGS = ["Tour", 1, "#ccc", "#ccc"]
+
+@pytest.fixture
+def sm(sm):
+	"""The shared StorageManager with two old and one recent entry."""
+	sm.insert_entry("02.01.2023", [["text", "alt"], ["calc", "*Aufträge", "A#100"]], SETTINGS)
+	sm.insert_entry("03.01.2023", [["text", "uralt"]], SETTINGS)
+	sm.insert_entry("02.01.2025", [["text", "neu"], ["calc", "*Aufträge", "B#50"]], SETTINGS)
+	return sm
+
+def _texts(sm, start="01.01.2023", end="31.12.2025"):
+	return [entry.text_memory[0][1] for entry in sm.iter_entries(start, end)]
+
+def test_archive_moves_old_entries_and_keeps_them_reachable(sm):
+	"""Old entries leave the main file but still show up in weeks, search and reports."""
+	# Startup migrations leave the full VACUUM to the first archive run
+	assert sm.db.execute("PRAGMA main.auto_vacuum").fetchone()[0] == 0
+	assert Archiver(sm.db).run(365, today=dt.date(2024, 6, 1)) == 2
+	assert os.path.exists(archive_path(sm.db.path))
+	assert sm.db.execute("SELECT COUNT(*) FROM main.user_inputs").fetchone()[0] == 1
+	assert sm.db.execute("PRAGMA main.auto_vacuum").fetchone()[0] == 2
+
+	assert _texts(sm) == ["alt", "uralt", "neu"]
+	assert _texts(sm, "01.01.2025") == ["neu"]
+	assert [hit.id for hit in sm.search("alt")] == [1]
+	totals = ReportEngine(sm.db).day_totals(dt.date(2023, 1, 1), dt.date(2025, 12, 31))
+	assert totals == {"2023-01-02": 10000, "2023-01-03": 0, "2025-01-02": 5000}
+
+	# Running again is a no-op
+	assert Archiver(sm.db).archive("2023-06-01") == 0
+
+def test_archived_entries_can_be_changed_and_deleted(sm):
+	"""A change brings the entry back; the next run replaces or drops the archived copy."""
+	Archiver(sm.db).archive("2024-01-01")
+	list(sm.iter_entries("01.01.2023", "31.01.2023"))
+	sm.update_entry(1, [["text", "geändert"]], SETTINGS)
+	sm.delete_entry(2)
+	assert _texts(sm) == ["geändert", "neu"]
+	assert sm.journal.undo().op == "insert"
+	assert _texts(sm) == ["geändert", "uralt", "neu"]
+	sm.delete_entry(2)
+
+	assert Archiver(sm.db).archive("2024-01-01") == 1
+	assert _texts(sm) == ["geändert", "neu"]
+	assert sm.db.execute("SELECT COUNT(*) FROM archive_shadow").fetchone()[0] == 0
+	assert sm.db.execute("SELECT COUNT(*) FROM archive.user_inputs").fetchone()[0] == 1
+
+def test_archive_runs_again_after_block_ids_were_reused(sm):
+	"""Archived rows do not collide with block and item ids main hands out again."""
+	Archiver(sm.db).archive("2024-01-01")
+	# Without the newest entry, main starts block and item ids over at 1
+	sm.delete_entry(3)
+	sm.insert_entry("04.01.2023", [["text", "nachgetragen"], ["calc", "*Aufträge", "D#7"]], SETTINGS)
+
+	assert Archiver(sm.db).archive("2024-01-01") == 1
+	assert _texts(sm) == ["alt", "uralt", "nachgetragen"]
+	totals = ReportEngine(sm.db).day_totals(dt.date(2023, 1, 1), dt.date(2023, 12, 31))
+	assert totals == {"2023-01-02": 10000, "2023-01-03": 0, "2023-01-04": 700}
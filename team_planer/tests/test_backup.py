@@ -0,0 +1,104 @@
+import os
+import sqlite3
+import threading
+import datetime as dt
+import pytest
+from team_planer.core import backup
+from team_planer.core.backup import Backups, snapshot_time
+
+SETTINGS = ["Tour", 1, "#ccc", "#ccc"]
+
+@pytest.fixture
+def sm(sm):
+	"""The shared StorageManager with one entry."""
+	sm.insert_entry("02.01.2025", [["text", "erster"]], SETTINGS)
+	return sm
+
+def _count(path):
+	connection = sqlite3.connect(path)
+	try:
+		assert connection.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+		assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+		return connection.execute("SELECT COUNT(*) FROM user_inputs").fetchone()[0]
+	finally:
+		connection.close()
+
+def test_snapshots_are_consistent_and_rotated(sm, tmp_path):
+	"""Snapshots taken during writes are complete files; only the newest are kept."""
+	backups = Backups(sm.db, str(tmp_path / "snapshots"), keep=2)
+	assert backups.is_due(24)
+
+	stop = threading.Event()
+	def write():
+		while not stop.is_set():
+			sm.insert_entry("03.01.2025", [["text", "während"]], SETTINGS)
+	writer = threading.Thread(target=write)
+	writer.start()
+	try:
+		start = dt.datetime(2025, 1, 1, 8)
+		paths = [backups.create(now=start + dt.timedelta(hours=hour)) for hour in range(3)]
+	finally:
+		stop.set()
+		writer.join()
+
+	assert all(_count(path) >= 1 for path in paths)
+	assert not backups.is_due(24, now=start + dt.timedelta(hours=3))
+	assert backups.is_due(24, now=start + dt.timedelta(hours=26))
+	assert backups.rotate() == [paths[0]]
+	assert backups.snapshots() == paths[:0:-1]
+	assert snapshot_time(paths[2]) == start + dt.timedelta(hours=2)
+
+def test_restore_replaces_entries_and_notifies_clients(sm, tmp_path):
+	"""A restore brings back the snapshot and keeps the replaced state as a snapshot."""
+	backups = Backups(sm.db, str(tmp_path / "snapshots"))
+	snapshot = backups.create(now=dt.datetime(2025, 1, 1))
+	sm.insert_entry("03.01.2025", [["text", "zweiter"]], SETTINGS)
+	seq = sm.last_change()
+
+	before = sm.restore_snapshot(snapshot, backups)
+	assert [entry.text_memory[0][1] for entry in sm.iter_entries("01.01.2025", "31.01.2025")] == ["erster"]
+	assert _count(before) == 2
+	assert sm.last_change() == seq + 1
+	assert sm.changes_since(seq) == (seq + 1, set())
+
+def _restarting(sm, writes):
+	"""Progress callback that writes from another connection during the first `writes` steps."""
+	other = sqlite3.connect(sm.db.path)
+	steps = []
+
+	def write(remaining, total):
+		steps.append(remaining)
+		if len(steps) <= writes:
+			other.execute("UPDATE user_inputs SET type = ? WHERE id = 1", (f"Tour {len(steps)}",))
+			other.commit()
+	return other, steps, write
+
+def test_restarted_copy_retries_with_bigger_steps(sm, tmp_path, monkeypatch):
+	"""Writes during a snapshot restart it with more pages per step, until it finishes."""
+	monkeypatch.setattr(backup, "BACKUP_PAGES", 1)
+	for day in range(10, 30):
+		sm.insert_entry(f"{day}.01.2025", [["text", "x" * 2000]], SETTINGS)
+	other, steps, write = _restarting(sm, 3)
+	try:
+		path = Backups(sm.db, str(tmp_path / "snapshots")).create(write)
+	finally:
+		other.close()
+
+	assert _count(path) == 21
+	assert steps[-1] == 0
+
+def test_snapshot_gives_up_while_writes_never_stop(sm, tmp_path, monkeypatch):
+	"""Constant writes make the snapshot fail and leave no file, instead of locking writers out."""
+	monkeypatch.setattr(backup, "BACKUP_PAGES", 1)
+	for day in range(10, 30):
+		sm.insert_entry(f"{day}.01.2025", [["text", "x" * 2000]], SETTINGS)
+	backups = Backups(sm.db, str(tmp_path / "snapshots"))
+	other, steps, write = _restarting(sm, 10 ** 6)
+	try:
+		with pytest.raises(backup.BackupBusy):
+			backups.create(write)
+	finally:
+		other.close()
+
+	assert os.listdir(backups.directory) == []
+	assert backups.is_due(24)
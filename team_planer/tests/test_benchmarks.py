@@ -0,0 +1,33 @@
+import datetime as dt
+from team_planer.core.storage_manager import StorageManager
+from team_planer.benchmarks.generator import generate
+from team_planer.benchmarks.run import Suite, compare
+
+def test_generator_is_reproducible(sm, tmp_path):
+	"""The same seed gives the same entries on workdays only."""
+	count = generate(sm, 0.15, dt.date(2025, 3, 31), seed=7, per_day=(2, 4))
+	other = StorageManager(db_file=str(tmp_path / "other.db"), shared=False)
+	other.create_db()
+	assert generate(other, 0.15, dt.date(2025, 3, 31), seed=7, per_day=(2, 4)) == count
+	entries = list(sm.iter_entries("01.01.2025", "31.03.2025"))
+	assert len(entries) == count and 2 * 35 <= count <= 4 * 45
+	assert {entry.settings[0] for entry in entries} == {"Tour", "Termin", "Lieferung"}
+	assert all(dt.date.fromisoformat(entry.iso_date).weekday() < 5 for entry in entries)
+	assert [entry.text_memory for entry in entries] == [
+		entry.text_memory for entry in other.iter_entries("01.01.2025", "31.03.2025")
+	]
+
+def test_suite_results_compare(sm, tmp_path):
+	"""Every benchmark reports timings; only clear slowdowns count as regressions."""
+	count = generate(sm, 0.15, dt.date(2025, 3, 31), per_day=(2, 4))
+	results = Suite(sm, str(tmp_path)).run(["range_week", "week_navigation", "export_csv", "delete"])
+	assert list(results) == ["range_week", "week_navigation", "export_csv", "store", "delete"]
+	assert all(result["p50_ms"] <= result["p95_ms"] <= result["max_ms"] for result in results.values())
+	assert results["export_csv"]["items"] == count
+	assert sm.db.execute("SELECT COUNT(*) FROM user_inputs").fetchone()[0] == count
+
+	before = {"results": {"a": {"p50_ms": 1.0}, "b": {"p50_ms": 0.01}, "c": {"p50_ms": 5.0}}}
+	after = {"results": {"a": {"p50_ms": 1.5}, "b": {"p50_ms": 0.03}, "d": {"p50_ms": 1.0}}}
+	rows = {row["name"]: row for row in compare(before, after)}
+	assert set(rows) == {"a", "b"}
+	assert rows["a"]["regression"] and not rows["b"]["regression"]
@@ -0,0 +1,63 @@
+import os, sys, subprocess
+import pytest
+from PySide6.QtCore import QCoreApplication
+from team_planer.core.storage_manager import StorageManager
+from team_planer.core.change_watcher import ChangeWatcher
+
+SETTINGS = ["type", 1, "#ccc", "#ccc"]
+
+# A separate client: writes `count` entries on `date` to the shared file
+CLIENT = """
+import sys
+from team_planer.core.storage_manager import StorageManager
+path, date, count = sys.argv[1], sys.argv[2], int(sys.argv[3])
+sm = StorageManager(db_file=path, shared=True)
+sm.create_db()
+for i in range(count):
+	sm.insert_entry(date, [["text", str(i)]], ["type", 1, "#ccc", "#ccc"])
+"""
+
+def _run_clients(path, dates, count):
+	env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+	clients = [
+		subprocess.Popen([sys.executable, "-c", CLIENT, path, date, str(count)], env=env, stderr=subprocess.PIPE)
+		for date in dates
+	]
+	for client in clients:
+		_, stderr = client.communicate(timeout=120)
+		assert client.returncode == 0, stderr.decode()
+
+@pytest.fixture
+def shared(tmp_path):
+	"""StorageManager in multi-client mode on a temporary file."""
+	app = QCoreApplication.instance() or QCoreApplication([])
+	path = str(tmp_path / "shared.db")
+	sm = StorageManager(db_file=path, shared=True)
+	sm.create_db()
+	return app, path, sm
+
+def test_concurrent_clients_lose_no_writes(shared):
+	"""Several processes writing at once wait for each other instead of failing."""
+	app, path, sm = shared
+	assert sm.db.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+	_run_clients(path, ["01.01.2025", "02.01.2025", "03.01.2025", "04.01.2025"], 50)
+
+	assert sm.db.execute("SELECT COUNT(*) FROM user_inputs").fetchone()[0] == 200
+	assert sm.db.execute("SELECT SUM(entries) FROM day_summary").fetchone()[0] == 200
+
+def test_watcher_reports_only_foreign_days(shared):
+	"""Changes of another process are reported per day, own changes are not."""
+	app, path, sm = shared
+	watcher = ChangeWatcher(sm)
+	changed = []
+	watcher.datesChanged.connect(changed.append)
+	watcher.start()
+	assert not watcher.poll()
+
+	sm.insert_entry("05.01.2025", [["text", "own"]], SETTINGS)
+	assert not watcher.poll()
+
+	_run_clients(path, ["02.01.2025", "03.01.2025"], 1)
+	assert watcher.poll()
+	assert changed == [{"2025-01-02", "2025-01-03"}]
+	assert not watcher.poll()
@@ -1,4 +1,4 @@
-import json, os, pytest
+import json, os, time, pytest
 from team_planer.core.config_manager import ConfigManager, CONFIG_FILE, DEFAULT_CONFIG
 
 @pytest.fixture
@@ -34,8 +34,49 @@ def test_save_config_overwrites_file(temp_config_dir):
 	cm = ConfigManager()
 	cm.config["language"] = "en"
 	cm.save_config()
+	cm.flush()
 
 	with open(temp_config_dir, "r") as f:
 		saved = json.load(f)
 
-	assert saved["language"] == "en"
\ No newline at end of file
+	assert saved["language"] == "en"
+
+def test_load_config_uses_cache_until_file_changes(temp_config_dir):
+	"""Repeated loads hit the cache; a rewritten file is parsed again."""
+	cm = ConfigManager()
+	before = ConfigManager.cache_info()
+	first = cm.load_config()
+	second = ConfigManager().load_config()
+	after = ConfigManager.cache_info()
+
+	assert first is second
+	assert after["hits"] >= before["hits"] + 2
+	with pytest.raises(TypeError):
+		first["language"] = "en"
+
+	time.sleep(0.01)
+	with open(temp_config_dir, "w") as f:
+		json.dump({"language": "en"}, f)
+	assert cm.load_config()["language"] == "en"
+	assert ConfigManager.cache_info()["misses"] == after["misses"] + 1
+
+def test_diff_config_reports_changed_keys():
+	"""Only added, removed and modified keys are reported."""
+	old = {"weeks_shown": 2, "language": "de", "weekday_list": ["Montag"]}
+	new = {"weeks_shown": 3, "language": "de", "weekday_list": ["Montag"], "window_shown": 1}
+
+	assert ConfigManager.diff_config(old, new) == {"weeks_shown", "window_shown"}
+	assert ConfigManager.diff_config(new, new) == frozenset()
+
+def test_save_config_writes_only_overrides_once(temp_config_dir):
+	"""A burst of saves is visible at once and lands as one small file."""
+	cm = ConfigManager()
+	for weeks in (3, 4, 5):
+		cm.config["weeks_shown"] = weeks
+		cm.save_config(delay=60)
+	assert cm.load_config()["weeks_shown"] == 5
+
+	cm.flush()
+	with open(temp_config_dir, "r") as f:
+		assert json.load(f) == {"weeks_shown": 5}
+	assert not os.path.exists(f"{temp_config_dir}.tmp")
@@ -0,0 +1,39 @@
+import json, pytest
+from team_planer.core.config_manager import DEFAULT_CONFIG
+from team_planer.core.config_schema import compile_config, ConfigError
+
+def test_defaults_compile_into_frozen_sections():
+	"""The default config is valid and compiles into read-only sections."""
+	settings = compile_config(DEFAULT_CONFIG, DEFAULT_CONFIG)
+
+	assert settings.errors == ()
+	assert settings.display.frame_content_margin == (8, 8, 8, 8)
+	assert settings.input_window.input_types["Tour"].settings == ("Tour", 1, "#ccc", "#ccc")
+	with pytest.raises(AttributeError):
+		settings.display.font_size = 20
+	with pytest.raises(AttributeError):
+		settings.display.unknown = 1
+
+def test_json_round_trip_is_normalized():
+	"""Lists from JSON become tuples and message codes become ints again."""
+	raw = json.loads(json.dumps(DEFAULT_CONFIG))
+	
+	assert compile_config(raw, DEFAULT_CONFIG) == compile_config(DEFAULT_CONFIG, DEFAULT_CONFIG)
+	assert compile_config(raw, DEFAULT_CONFIG).error_messages[0][0] == "Verbotene Eingabeform"
+
+def test_all_errors_are_reported_at_once():
+	"""Every invalid key is reported; non-strict mode falls back to defaults."""
+	raw = dict(DEFAULT_CONFIG)
+	raw["display-window_font-weight"] = "Heavy"
+	raw["weeks_shown"] = "2"
+	raw["input-window_first-input-type"] = "Missing"
+
+	with pytest.raises(ConfigError) as info:
+		compile_config(raw, DEFAULT_CONFIG)
+	assert len(info.value.errors) == 3
+
+	settings = compile_config(raw, DEFAULT_CONFIG, strict=False)
+	assert settings.display.font_weight == "Bold"
+	assert settings.weeks_shown == 2
+	assert settings.input_window.first_input_type == "Tour"
+	assert len(settings.errors) == 3
@@ -0,0 +1,42 @@
+import pytest
+from team_planer.core.entries import (
+	Block, Item, parse_cents, format_cents, blocks_from_text_memory, text_memory_from_blocks, check_amounts
+)
+
+def test_parse_cents_is_exact():
+	"""Amounts become integer cents without float rounding."""
+	assert parse_cents("123") == 12300
+	assert parse_cents("0.1") == 10
+	assert parse_cents("19,99") == 1999
+	assert format_cents(1999) == "19.99"
+	with pytest.raises(ValueError):
+		parse_cents("12.3.4")
+
+def test_parse_cents_takes_signs_and_rounds():
+	"""Credits and amounts with more than two decimals keep their value."""
+	assert parse_cents("-12.5") == -1250
+	assert parse_cents("+3") == 300
+	assert parse_cents("0.125") == 13
+	assert parse_cents("1,999") == 200
+	assert parse_cents(",5") == 50
+	assert format_cents(-1250) == "-12.50"
+	assert format_cents(-5) == "-0.05"
+
+def test_unreadable_amounts_are_refused():
+	"""A calc line that would be stored without an amount is not written."""
+	check_amounts([["calc#1000", "*Aufträge", "K#-12.5"], ["text", "frei"]])
+	with pytest.raises(ValueError, match="K#zwölf"):
+		check_amounts([["calc#1000", "*Aufträge", "K#zwölf", "ohne Betrag"]])
+
+def test_text_memory_round_trip():
+	"""Editor lists map to typed blocks and back."""
+	text_memory = [
+		["text", "*Info", "line"],
+		["worker", "*Monteure", "x", "y"],
+		["calc#1000", "*Aufträge", "K#600.00", "L#5.50"],
+	]
+	blocks = blocks_from_text_memory(text_memory)
+
+	assert blocks[2] == Block("calc", 100000, "Aufträge", [Item("K", 60000), Item("L", 550)])
+	assert blocks[1].items == [Item("x"), Item("y")]
+	assert text_memory_from_blocks(blocks) == text_memory
@@ -0,0 +1,94 @@
+import pytest
+from PySide6.QtCore import QCoreApplication
+from team_planer.core import entry_writer as ew_mod
+from team_planer.core.entry_writer import EntryWriter
+
+SETTINGS = ["type", 1, "#ccc", "#ccc"]
+
+@pytest.fixture
+def writer(sm):
+	"""EntryWriter on a temporary database, recording its signals."""
+	app = QCoreApplication.instance() or QCoreApplication([])
+	entry_writer = EntryWriter(sm)
+	done, failed = [], []
+	entry_writer.writeDone.connect(done.append)
+	entry_writer.writeFailed.connect(lambda ticket, ex: failed.append(ticket))
+	yield app, entry_writer, done, failed
+	entry_writer.close()
+
+def _texts(sm):
+	return [entry.text_memory for entry in sm.iter_entries("01.01.2025", "31.01.2025")]
+
+def test_burst_is_committed_in_one_transaction(writer, monkeypatch):
+	"""Writes arriving close together share a single commit."""
+	app, entry_writer, done, failed = writer
+	monkeypatch.setattr(ew_mod, "GROUP_WINDOW", 0.5)
+	db = entry_writer.storage_manager.db
+	statements = []
+	connect = db._connect
+
+	def traced_connect():
+		connection = connect()
+		connection.set_trace_callback(statements.append)
+		return connection
+	# The writer thread opens its own connection on its first batch
+	monkeypatch.setattr(db, "_connect", traced_connect)
+	for i in range(5):
+		entry_writer.insert("01.01.2025", [["text", str(i)]], SETTINGS)
+	entry_writer.flush()
+	app.processEvents()
+
+	assert statements.count("BEGIN IMMEDIATE") == 1
+	assert len(done) == 5 and not failed
+	assert len(_texts(entry_writer.storage_manager)) == 5
+
+def test_update_and_delete_follow_pending_insert(writer):
+	"""Later writes can target an insert whose row id is not known yet."""
+	app, entry_writer, done, failed = writer
+	kept = entry_writer.insert("01.01.2025", [["text", "a"]], SETTINGS)
+	dropped = entry_writer.insert("01.01.2025", [["text", "b"]], SETTINGS)
+	entry_writer.update(kept, [["text", "changed"]], SETTINGS)
+	entry_writer.delete(dropped)
+	entry_writer.flush()
+
+	assert kept.entry_id is not None
+	assert _texts(entry_writer.storage_manager) == [[["text", "changed"]]]
+
+def test_failed_write_does_not_roll_back_batch(writer, monkeypatch):
+	"""A failing write is reported alone, the others are committed."""
+	app, entry_writer, done, failed = writer
+	monkeypatch.setattr(ew_mod, "GROUP_WINDOW", 0.5)
+	entry_writer.insert("01.01.2025", [["text", "a"]], SETTINGS)
+	bad = entry_writer.insert("01.01.2025", [["text", "b"]], [])
+	entry_writer.insert("02.01.2025", [["text", "c"]], SETTINGS)
+	entry_writer.flush()
+	app.processEvents()
+
+	assert failed == [bad]
+	assert len(done) == 2
+	assert len(_texts(entry_writer.storage_manager)) == 2
+
+def test_commit_invalidates_cached_week(writer):
+	"""Committed writes drop exactly the cached week they touched."""
+	app, entry_writer, done, failed = writer
+	cache = entry_writer.storage_manager.week_cache
+	cache.put("2024-12-30", [], cache.version)
+	cache.put("2025-01-06", [], cache.version)
+	entry_writer.insert("01.01.2025", [["text", "a"]], SETTINGS)
+	entry_writer.flush()
+
+	assert not cache.contains("2024-12-30")
+	assert cache.contains("2025-01-06")
+
+def test_undo_runs_in_queue_order(writer):
+	"""An undo queued after a pending insert reverts exactly that insert."""
+	app, entry_writer, done, failed = writer
+	entry_writer.insert("01.01.2025", [["text", "a"]], SETTINGS)
+	ticket = entry_writer.insert("01.01.2025", [["text", "b"]], SETTINGS)
+	undo = entry_writer.undo()
+	entry_writer.flush()
+	app.processEvents()
+
+	assert undo.result.op == "delete" and undo.entry_id == ticket.entry_id
+	assert undo in done and not failed
+	assert _texts(entry_writer.storage_manager) == [[["text", "a"]]]
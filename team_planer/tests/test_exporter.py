@@ -0,0 +1,54 @@
+import csv, json
+import datetime as dt
+import pytest
+from team_planer.core.exporter import export, ics_lines, main
+
+@pytest.fixture
+def sm(sm):
+	"""The shared StorageManager with a tour and an appointment."""
+	sm.insert_entry("02.01.2025", [
+		["text", "Tour Nord"], ["worker", "*Monteure", "Anna"], ["calc#1000", "*Aufträge", "Müller#123.5", "Meier#10"]
+	], ["Tour", 1, "#ccc", "#ccc"])
+	sm.insert_entry("03.01.2025", [
+		["text", "Kunde; Besuch, lang " + "x" * 80], ["text", "*Zeit", "14:00"]
+	], ["Termin", 2, "#ccc", "#ccc"])
+	sm.insert_entry("03.02.2025", [["text", "outside"]], ["Termin", 2, "#ccc", "#ccc"])
+	return sm
+
+def test_export_csv_and_jsonl(sm, tmp_path):
+	"""One CSV row per line with decimal comma amounts, one JSON record per entry."""
+	path = tmp_path / "out.csv"
+	assert export(sm, "01.01.2025", "31.01.2025", str(path)) == 2
+	with open(path, encoding="utf-8-sig", newline="") as f:
+		rows = list(csv.reader(f, delimiter=";"))
+	assert rows[0] == ["id", "date", "type", "field", "kind", "label", "amount"]
+	assert rows[3:5] == [
+		["1", "2025-01-02", "Tour", "Aufträge", "calc", "Müller", "123,50"],
+		["1", "2025-01-02", "Tour", "Aufträge", "calc", "Meier", "10,00"]
+	]
+	assert len(rows) == 1 + 4 + 2
+
+	path = tmp_path / "out.jsonl"
+	assert export(sm, dt.date(2025, 1, 1), dt.date(2025, 12, 31), str(path)) == 3
+	records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+	assert [record["date"] for record in records] == ["2025-01-02", "2025-01-03", "2025-02-03"]
+	assert records[0]["revenue_cents"] == 13350 and records[0]["workers"] == 1
+
+def test_ics_has_folded_escaped_appointments(sm):
+	"""Only appointments become events; long lines are folded, special characters escaped."""
+	entries = sm.iter_entries("01.01.2025", "31.01.2025")
+	text = "".join(ics_lines(entries, stamp=dt.datetime(2025, 1, 1)))
+	lines = text.split("\r\n")
+	assert text.count("BEGIN:VEVENT") == 1
+	assert "DTSTART;VALUE=DATE:20250103" in lines
+	assert all(len(line.encode()) <= 75 for line in lines)
+	unfolded = text.replace("\r\n ", "")
+	assert "SUMMARY:Kunde\\; Besuch\\, lang x" in unfolded
+	assert "\\nZeit: 14:00\r\n" in unfolded
+
+def test_cli_exports_range(sm, tmp_path, capsys):
+	"""The command line uses the configured database unless --db is given."""
+	path = tmp_path / "plans.ics"
+	assert main(["--from", "2025-01-01", "--to", "31.12.2025", "--db", sm.db.path, str(path)]) == 0
+	assert path.read_text(encoding="utf-8").count("BEGIN:VEVENT") == 2
+	assert "3 entries written" in capsys.readouterr().out
@@ -0,0 +1,67 @@
+import json
+from team_planer.core import integrity
+from team_planer.core.integrity import IntegrityScanner, date_problem, settings_problem
+
+TOUR = ["Tour", 1, "#ccc", "#ccc"]
+
+def _break_settings(sm, entry_id, text):
+	"""Point an entry at a new input type row with the given raw settings."""
+	type_id = sm.db.execute(
+		"INSERT INTO input_types (name, version, settings) VALUES ('Kaputt', 1, ?)", (text,)
+	).lastrowid
+	sm.db.execute("UPDATE user_inputs SET type_id = ? WHERE id = ?", (type_id, entry_id))
+
+def test_broken_rows_do_not_blank_the_week(sm):
+	"""Entries with unusable settings are skipped, the rest of the range loads."""
+	first = sm.insert_entry("06.01.2025", [["text", "eins"]], TOUR)
+	broken = sm.insert_entry("07.01.2025", [["text", "kaputt"]], TOUR)
+	last = sm.insert_entry("08.01.2025", [["calc", "*Aufträge", "a#1"]], TOUR)
+	_break_settings(sm, broken, "{not json")
+
+	entries = list(sm.iter_entries("06.01.2025", "12.01.2025"))
+	assert [entry.id for entry in entries] == [first, last]
+	assert entries[1].blocks[0].items[0].amount_cents == 100
+	assert sm.skipped == {broken}
+	assert sm.get_entry(first).settings == TOUR
+
+def test_scanner_quarantines_and_summarizes(sm, monkeypatch):
+	"""Broken rows move to quarantine with their content; good rows stay."""
+	monkeypatch.setattr(integrity, "SCAN_BATCH", 2)
+	ids = [sm.insert_entry(f"0{day}.01.2025", [["text", f"Tag {day}"]], TOUR) for day in range(1, 6)]
+	_break_settings(sm, ids[1], '["Kaputt"]')
+	sm.db.execute("UPDATE user_inputs SET date = '31.02.2025' WHERE id = ?", (ids[3],))
+	progress = []
+
+	report = IntegrityScanner(sm).scan(progress.append)
+
+	assert (report.scanned, report.quarantined) == (5, 2)
+	assert progress == [2, 4, 5]
+	assert dict(report.reasons) == {
+		"settings are not a list of name, priority and two colors": 1, "date does not exist": 1
+	}
+	assert "2 moved to quarantine" in report.summary()
+	rows = sm.db.execute("SELECT entry_id, date, settings, content FROM quarantine ORDER BY entry_id").fetchall()
+	assert [row[0] for row in rows] == [ids[1], ids[3]]
+	assert rows[0][2] == '["Kaputt"]' and json.loads(rows[1][3]) == [["text", "Tag 4"]]
+	assert [entry.id for entry in sm.iter_entries("01.01.2025", "31.12.2025")] == [ids[0], ids[2], ids[4]]
+	assert sm.search("Tag 2") == []
+	assert IntegrityScanner(sm).scan().summary() == "3 entries checked, no problems found."
+
+def test_checks():
+	"""The single checks accept what the app writes and nothing less."""
+	assert settings_problem(TOUR) is None
+	assert settings_problem(["Tour", 1, None, "#ccc"])
+	assert settings_problem({"name": "Tour"})
+	assert date_problem("02.01.2025", "2025-01-02") is None
+	assert date_problem("2.1.2025", "2025-01-02")
+	assert date_problem("02.01.2025", None)
+
+def test_scanner_reports_unreadable_amounts(sm):
+	"""Calc lines without an amount are listed, the entry itself stays."""
+	entry_id = sm.insert_entry("06.01.2025", [["calc", "*Aufträge", "K#1", "L#zwei"]], TOUR)
+
+	report = IntegrityScanner(sm).scan()
+
+	assert (report.quarantined, report.unreadable) == (0, 1)
+	assert f"#{entry_id} 06.01.2025: 1 lines" in report.summary()
+	assert sm.get_entry(entry_id) is not None
@@ -0,0 +1,73 @@
+from team_planer.core import journal as journal_mod
+from team_planer.core.storage_manager import StorageManager
+
+SETTINGS = ["type", 1, "#ccc", "#ccc"]
+
+def _texts(sm):
+	return [entry.text_memory for entry in sm.iter_entries("01.01.2025", "31.01.2025")]
+
+def test_undo_and_redo_walk_the_journal(sm):
+	"""Undo reverts insert, update and delete in reverse order; redo re-applies them."""
+	entry_id = sm.insert_entry("02.01.2025", [["text", "a"]], SETTINGS)
+	sm.update_entry(entry_id, [["text", "b"]], SETTINGS)
+	sm.delete_entry(entry_id)
+	assert _texts(sm) == []
+
+	step = sm.journal.undo()
+	assert (step.op, step.entry_id, step.iso_date) == ("insert", entry_id, "2025-01-02")
+	assert _texts(sm) == [[["text", "b"]]]
+	assert sm.search("b")[0].id == entry_id
+	assert sm.journal.undo().op == "update"
+	assert _texts(sm) == [[["text", "a"]]]
+	assert sm.journal.undo().op == "delete"
+	assert _texts(sm) == []
+	assert sm.journal.undo() is None
+
+	assert sm.journal.redo().image["text_memory"] == [["text", "a"]]
+	assert sm.journal.redo().op == "update"
+	assert _texts(sm) == [[["text", "b"]]]
+
+	# A new change ends the redo history
+	sm.insert_entry("03.01.2025", [["text", "c"]], SETTINGS)
+	assert sm.journal.redo() is None
+	assert sm.journal.undo().entry_id != entry_id
+
+def test_compact_keeps_only_reachable_records(sm, monkeypatch):
+	"""Dropped records and records beyond the undo limit are removed."""
+	monkeypatch.setattr(journal_mod, "UNDO_LIMIT", 3)
+	for i in range(5):
+		sm.insert_entry("02.01.2025", [["text", str(i)]], SETTINGS)
+	sm.journal.undo()
+	sm.insert_entry("02.01.2025", [["text", "new"]], SETTINGS)
+
+	# Records 1-3 are too old, the undone record 5 was dropped by the new insert
+	assert sm.journal.compact(keep=3) == 4
+	rows = sm.db.execute("SELECT seq, state FROM entry_journal").fetchall()
+	assert rows == [(4, 0), (6, 0)]
+	for _ in range(2):
+		assert sm.journal.undo() is not None
+	assert sm.journal.undo() is None
+	assert [text[0][1] for text in _texts(sm)] == ["0", "1", "2"]
+
+def test_clients_undo_only_their_own_changes(sm):
+	"""On a shared database undo, redo and new changes leave other clients' records alone."""
+	other = StorageManager(db_file=sm.db.path, shared=False)
+	other.journal = journal_mod.Journal(other, client="other-pc/1")
+	mine = sm.insert_entry("02.01.2025", [["text", "mine"]], SETTINGS)
+	sm.update_entry(mine, [["text", "mine 2"]], SETTINGS)
+	theirs = other.insert_entry("03.01.2025", [["text", "theirs"]], SETTINGS)
+
+	assert sm.journal.undo().entry_id == mine
+	assert other.journal.undo().entry_id == theirs
+	# A new change by the other client must not drop this client's redo
+	other.insert_entry("04.01.2025", [["text", "more"]], SETTINGS)
+	assert sm.journal.redo().image["text_memory"] == [["text", "mine 2"]]
+	assert other.journal.redo() is None
+	assert sm.journal.undo().entry_id == mine
+	assert sm.journal.undo().op == "delete"
+	assert sm.journal.undo() is None
+	assert [text[0][1] for text in _texts(sm)] == ["more"]
+
+	sm.db.execute("UPDATE entry_journal SET created = datetime('now', '-30 days') WHERE client = ?", ("other-pc/1",))
+	sm.journal.compact()
+	assert {row[0] for row in sm.db.execute("SELECT DISTINCT client FROM entry_journal")} == {sm.journal.client}
@@ -0,0 +1,164 @@
+import json, sqlite3, pytest
+from team_planer.core.database import Database
+from team_planer.core.migrations import migrate, get_version, LATEST_VERSION
+from team_planer.core.entries import blocks_from_text_memory, entry_facts
+
+@pytest.fixture
+def legacy_db(tmp_path):
+	"""A database as written by the first releases (no user_version)."""
+	path = tmp_path / "legacy.db"
+	connection = sqlite3.connect(path)
+	connection.execute("""
+		CREATE TABLE user_inputs (
+		id INTEGER PRIMARY KEY AUTOINCREMENT,
+		date TEXT NOT NULL, type TEXT, settings TEXT, text TEXT)
+	""")
+	connection.executemany(
+		"INSERT INTO user_inputs (date, type, settings, text) VALUES (?, 'Tour', '[]', '[]')",
+		[("01.02.2023",), ("31.12.2024",), ("broken",)]
+	)
+	connection.commit()
+	connection.close()
+	db = Database(str(path))
+	yield db
+	db.close()
+
+def test_migrate_backfills_iso_dates_and_index(legacy_db):
+	"""Old rows get an ISO date and week loads use the index."""
+	assert migrate(legacy_db) == LATEST_VERSION
+
+	rows = legacy_db.execute("SELECT date, iso_date FROM user_inputs ORDER BY id").fetchall()
+	assert rows == [
+		("01.02.2023", "2023-02-01"), ("31.12.2024", "2024-12-31"), ("broken", None)
+	]
+	plan = legacy_db.execute("""
+		EXPLAIN QUERY PLAN SELECT * FROM user_inputs WHERE iso_date BETWEEN ? AND ?
+	""", ("2023-01-01", "2023-01-07")).fetchall()
+	assert "idx_user_inputs_iso_date" in " ".join(row[-1] for row in plan)
+
+def test_migrate_resumes_and_is_idempotent(legacy_db):
+	"""A run interrupted after the column was added completes on restart."""
+	legacy_db.execute("ALTER TABLE user_inputs ADD COLUMN iso_date TEXT")
+	legacy_db.execute("PRAGMA user_version = 1")
+
+	assert migrate(legacy_db) == LATEST_VERSION
+	assert migrate(legacy_db) == LATEST_VERSION
+	assert get_version(legacy_db) == LATEST_VERSION
+	assert legacy_db.execute("SELECT COUNT(*) FROM user_inputs WHERE iso_date IS NOT NULL").fetchone()[0] == 2
+
+def test_migrate_moves_text_blobs_into_blocks(legacy_db):
+	"""Old JSON content becomes blocks and items with amounts in cents."""
+	legacy_db.execute("""
+		INSERT INTO user_inputs (date, type, settings, text) VALUES ('02.02.2023', 'Tour', '[]', ?)
+	""", ('[["calc#1000", "*Auftr\u00e4ge", "K#600", "L#12,5"]]',))
+
+	migrate(legacy_db)
+
+	columns = {row[1] for row in legacy_db.execute("PRAGMA table_info(user_inputs)")}
+	assert "text" not in columns
+	rows = legacy_db.execute("""
+		SELECT b.kind, b.goal_cents, b.header, i.label, i.amount_cents
+		FROM entry_blocks AS b JOIN entry_items AS i ON i.block_id = b.id
+		ORDER BY i.position
+	""").fetchall()
+	assert rows == [
+		("calc", 100000, "Aufträge", "K", 60000), ("calc", 100000, "Aufträge", "L", 1250)
+	]
+
+def test_migrate_indexes_existing_entries_for_search(legacy_db):
+	"""Entries written before the search index existed can be found."""
+	legacy_db.execute("""
+		INSERT INTO user_inputs (date, type, settings, text) VALUES ('02.02.2023', 'Tour', '[]', ?)
+	""", ('[["text", "*Fahrzeug", "Sprinter"]]',))
+
+	migrate(legacy_db)
+
+	rows = legacy_db.execute("""
+		SELECT rowid, body FROM entry_search WHERE entry_search MATCH 'sprinter'
+	""").fetchall()
+	assert rows == [(4, "Tour\nFahrzeug\nSprinter")]
+
+def test_migrate_builds_report_summaries(legacy_db):
+	"""Existing entries are summarized; their goal is set by sync_goal."""
+	legacy_db.execute("""
+		INSERT INTO user_inputs (date, type, settings, text) VALUES ('02.02.2023', 'Tour', '[]', ?)
+	""", ('[["worker", "*Monteure", "a", "b"], ["calc#1000", "*Auftr\u00e4ge", "K#600", "L#12,5"]]',))
+
+	migrate(legacy_db)
+
+	assert legacy_db.execute("""
+		SELECT key, revenue_cents, entries, tours, worker_days FROM day_summary
+		WHERE key = '2023-02-02'
+	""").fetchall() == [("2023-02-02", 61250, 1, 1, 2)]
+	assert legacy_db.execute("""
+		SELECT entries FROM week_summary WHERE key = '2023-01-30'
+	""").fetchall() == [(2,)]
+
+def test_migrate_reads_amounts_the_old_parser_missed(legacy_db):
+	"""Negative amounts and extra decimals stored as text count again."""
+	legacy_db.execute("""
+		INSERT INTO user_inputs (date, type, settings, text) VALUES ('02.02.2023', 'Tour', '[]', ?)
+	""", ('[["calc#1000", "*Auftr\u00e4ge", "K#600", "L#1"]]',))
+	migrate(legacy_db)
+	# As the parser before version 13 stored them
+	legacy_db.execute("UPDATE entry_items SET label = 'K#-12.5', amount_cents = NULL WHERE label = 'K'")
+	legacy_db.execute("UPDATE entry_items SET label = 'L#0.125', amount_cents = NULL WHERE label = 'L'")
+	legacy_db.execute("UPDATE entry_facts SET revenue_cents = 0")
+	legacy_db.execute("PRAGMA user_version = 12")
+
+	migrate(legacy_db)
+
+	assert legacy_db.execute("SELECT label, amount_cents FROM entry_items ORDER BY position").fetchall() == [
+		("K", -1250), ("L", 13)
+	]
+	assert legacy_db.execute("SELECT revenue_cents FROM entry_facts WHERE entry_id = 4").fetchall() == [(-1237,)]
+	assert legacy_db.execute("""
+		SELECT revenue_cents FROM day_summary WHERE key = '2023-02-02'
+	""").fetchall() == [(-1237,)]
+
+def test_legacy_credits_are_read_by_the_later_step(legacy_db):
+	"""Step 3 keeps its original parser; step 13 then reads the amounts it could not."""
+	legacy_db.execute("""
+		INSERT INTO user_inputs (date, type, settings, text) VALUES ('02.02.2023', 'Tour', '[]', ?)
+	""", ('[["calc#1000", "*Auftr\u00e4ge", "K#600", "G#-5", "X#?"]]',))
+
+	migrate(legacy_db)
+
+	assert legacy_db.execute("SELECT label, amount_cents FROM entry_items ORDER BY position").fetchall() == [
+		("K", 60000), ("G", -500), ("X#?", None)
+	]
+	assert legacy_db.execute("SELECT revenue_cents FROM entry_facts WHERE entry_id = 4").fetchone() == (59500,)
+
+def test_migrated_facts_match_live_writes(legacy_db):
+	"""Backfilled facts are computed like a live write, whatever the block order."""
+	# Workers listed after the calc block do not make it a tour
+	text_memory = [["calc#1000", "*Auftr\u00e4ge", "K#600"], ["worker", "*Monteure", "a", "b"]]
+	legacy_db.execute("""
+		INSERT INTO user_inputs (date, type, settings, text) VALUES ('02.02.2023', 'Tour', '[]', ?)
+	""", (json.dumps(text_memory),))
+	expected = entry_facts(blocks_from_text_memory(text_memory))
+
+	migrate(legacy_db)
+	facts = legacy_db.execute("SELECT revenue_cents, workers, tour FROM entry_facts WHERE entry_id = 4").fetchone()
+	assert facts == (expected[0], expected[1], int(expected[2])) == (60000, 2, 0)
+
+	# Rows written by the SQL backfill before version 14 are corrected
+	legacy_db.execute("UPDATE entry_facts SET tour = 1 WHERE entry_id = 4")
+	legacy_db.execute("PRAGMA user_version = 13")
+	migrate(legacy_db)
+	assert legacy_db.execute("SELECT workers, tour FROM entry_facts WHERE entry_id = 4").fetchone() == (2, 0)
+
+def test_migrate_moves_settings_into_input_types(legacy_db):
+	"""Each distinct settings list becomes one type version; rows keep an id only."""
+	legacy_db.execute("""
+		INSERT INTO user_inputs (date, type, settings, text) VALUES ('02.02.2023', 'Tour', ?, '[]')
+	""", ('["Tour", 1, "#fff", "#000"]',))
+
+	migrate(legacy_db)
+
+	columns = {row[1] for row in legacy_db.execute("PRAGMA table_info(user_inputs)")}
+	assert "settings" not in columns
+	assert legacy_db.execute("SELECT name, version, settings FROM input_types ORDER BY id").fetchall() == [
+		("Tour", 1, "[]"), ("Tour", 2, '["Tour", 1, "#fff", "#000"]')
+	]
+	assert legacy_db.execute("SELECT type_id FROM user_inputs ORDER BY id").fetchall() == [(1,), (1,), (1,), (2,)]
@@ -0,0 +1,74 @@
+import json
+import pytest
+from team_planer.core.storage_manager import _entry_query
+from team_planer.core.database import Database
+from team_planer.core.query_stats import QueryStats, explain, full_scans
+
+TOUR = ["Tour", 1, "#ccc", "#ccc"]
+
+@pytest.fixture
+def sm(sm):
+	"""The shared StorageManager with one entry."""
+	sm.insert_entry("02.01.2025", [["calc", "*Aufträge", "a#1", "b#2"]], TOUR)
+	return sm
+
+def assert_indexed(db, sql, params=()):
+	"""Fail if the statement reads a whole table instead of using an index."""
+	plan = explain(db, sql, params)
+	assert not full_scans(plan), plan
+
+def test_statements_are_counted_timed_and_logged(tmp_path):
+	"""Calls, rows and slow statements are recorded however the rows are fetched."""
+	log = tmp_path / "slow.log"
+	stats = QueryStats(slow_ms=0, log_file=str(log))
+	db = Database(str(tmp_path / "stats.db"))
+	db.stats = stats
+	db.execute("CREATE TABLE t (n INTEGER)")
+	for n in range(3):
+		db.execute("INSERT INTO t (n) VALUES (?)", (n,))
+	assert [row[0] for row in db.execute("SELECT n FROM t ORDER BY n")] == [0, 1, 2]
+	assert db.execute("SELECT n FROM t WHERE n > ?", (0,)).fetchall() == [(1,), (2,)]
+	assert db.execute("UPDATE t SET n = n + 1").rowcount == 3
+
+	statements = {statement["sql"]: statement for statement in stats.snapshot()["statements"]}
+	assert statements["INSERT INTO t (n) VALUES (?)"]["calls"] == 3
+	assert statements["SELECT n FROM t ORDER BY n"]["rows"] == 3
+	assert statements["UPDATE t SET n = n + 1"]["rows"] == 3
+	assert all(statement["p95_ms"] <= statement["max_ms"] for statement in statements.values())
+	assert stats.snapshot()["slow"] == [] and not log.exists()
+
+	stats.slow_ms = 0.000001
+	db.execute("SELECT COUNT(*) FROM t").fetchone()
+	assert stats.snapshot()["slow"][-1]["sql"] == "SELECT COUNT(*) FROM t"
+	assert "SELECT COUNT(*) FROM t" in log.read_text(encoding="utf-8")
+
+	stats.dump(str(tmp_path / "stats.json"))
+	dumped = json.loads((tmp_path / "stats.json").read_text(encoding="utf-8"))
+	assert {statement["sql"] for statement in dumped["statements"]} == set(statements) | {"SELECT COUNT(*) FROM t"}
+	stats.reset()
+	assert stats.snapshot()["statements"] == []
+
+	stats.enabled = False
+	assert db.execute("SELECT n FROM t").fetchall() == [(1,), (2,), (3,)]
+	assert stats.snapshot()["statements"] == []
+	db.close()
+
+def test_week_load_and_delete_use_indexes(sm):
+	"""
+	The hot reads and the deletes look rows up by index. EXPLAIN does not
+	show foreign key actions, so the lookups that ON DELETE CASCADE and
+	the type reference check run are planned on their own.
+	"""
+	db = sm.db
+	assert_indexed(db, _entry_query("main", "e.iso_date BETWEEN ? AND ?"), ("2025-01-01", "2025-01-07"))
+	assert_indexed(db, _entry_query("main", "e.id = ?"), (1,))
+	assert_indexed(db, "DELETE FROM user_inputs WHERE id = ?", (1,))
+	assert_indexed(db, "DELETE FROM entry_blocks WHERE entry_id = ?", (1,))
+	assert_indexed(db, "DELETE FROM input_types WHERE id = ?", (1,))
+	# Cascades of deleting an entry and its blocks
+	assert_indexed(db, "DELETE FROM entry_items WHERE block_id = ?", (1,))
+	assert_indexed(db, "DELETE FROM entry_facts WHERE entry_id = ?", (1,))
+	# Referencing entries looked up when an input type is deleted
+	assert_indexed(db, "SELECT 1 FROM user_inputs WHERE type_id = ?", (1,))
+	assert_indexed(db, "DELETE FROM main.entry_journal WHERE entry_id IN (SELECT value FROM json_each(?))", ("[1]",))
+	assert full_scans(explain(db, "SELECT * FROM entry_journal WHERE op = ?", ("insert",)))
@@ -0,0 +1,57 @@
+import datetime as dt
+import pytest
+from team_planer.core.reports import ReportEngine
+
+SETTINGS = ["Tour", 1, "#ccc", "#ccc"]
+
+def _tour(workers: int, *amounts: str) -> list[list[str]]:
+	return [
+		["worker", "*Monteure", *[f"w{i}" for i in range(workers)]],
+		["calc#1000", "*Aufträge", *[f"K#{amount}" for amount in amounts]],
+	]
+
+@pytest.fixture
+def reports(sm):
+	"""StorageManager and ReportEngine on a temporary database."""
+	engine = ReportEngine(sm.db)
+	engine.sync_goal(500)
+	return sm, engine
+
+def _figures(summaries):
+	return [
+		(s.key, s.revenue_cents, s.entries, s.tours, s.worker_days, s.goal_met, s.goal_missed)
+		for s in summaries
+	]
+
+def test_summaries_follow_writes(reports):
+	"""Day, week and month rows are updated incrementally on every write."""
+	sm, engine = reports
+	met = sm.store_user_input("06.01.2025", _tour(2, "600", "450,50"), SETTINGS)
+	missed = sm.store_user_input("07.01.2025", _tour(1, "100"), SETTINGS)
+	sm.store_user_input("07.01.2025", [["text", "*Info", "note"]], SETTINGS)
+	start, end = dt.date(2025, 1, 1), dt.date(2025, 1, 31)
+
+	assert _figures(engine.days(start, end)) == [
+		("2025-01-06", 105050, 1, 1, 2, 1, 0),
+		("2025-01-07", 10000, 2, 1, 1, 0, 1),
+	]
+	assert _figures(engine.weeks(start, end)) == [("2025-01-06", 115050, 3, 2, 3, 1, 1)]
+
+	sm.update_user_input(missed, _tour(1, "600"), SETTINGS)
+	sm.delete_user_input(met)
+
+	assert _figures(engine.months(start, end)) == [("2025-01", 60000, 2, 1, 1, 1, 0)]
+	assert engine.day_totals(start, end) == {"2025-01-07": 60000}
+
+def test_sync_goal_reevaluates_tours(reports):
+	"""A new goal moves tours between met and missed; rebuild agrees."""
+	sm, engine = reports
+	sm.store_user_input("06.01.2025", _tour(2, "900"), SETTINGS)
+	start = end = dt.date(2025, 1, 6)
+
+	assert engine.sync_goal(400) == 1
+	assert _figures(engine.days(start, end))[0][5:] == (1, 0)
+	assert engine.sync_goal(400) == 0
+
+	engine.rebuild()
+	assert _figures(engine.days(start, end)) == [("2025-01-06", 90000, 1, 1, 2, 1, 0)]
@@ -0,0 +1,78 @@
+import datetime as dt
+import pytest
+from PySide6.QtCore import QCoreApplication
+from team_planer.core.storage_manager import StorageManager
+from team_planer.core.memory_storage import MemoryStorage, drop_memory_data
+from team_planer.core.storage_backend import create_storage
+from team_planer.core.entry_writer import EntryWriter
+
+TOUR = ["Tour", 1, "#ccc", "#ccc"]
+TERMIN = ["Termin", 2, "#ccc", "#ccc"]
+
+@pytest.fixture(params=["sqlite", "memory"])
+def storage(request, tmp_path):
+	"""Each backend on fresh, empty storage."""
+	if request.param == "sqlite":
+		storage = StorageManager(db_file=str(tmp_path / "test_backend.db"), shared=False)
+	else:
+		storage = MemoryStorage(name=str(tmp_path))
+		request.addfinalizer(lambda: drop_memory_data(str(tmp_path)))
+	storage.create_db()
+	return storage
+
+def _texts(storage, start="01.01.2025", end="31.12.2025"):
+	return [entry.text_memory[0][1] for entry in storage.iter_entries(start, end)]
+
+def test_entries_round_trip(storage):
+	"""Both backends store, order, change and delete entries alike."""
+	second = storage.insert_entry("03.01.2025", [["text", "zwei"]], TERMIN)
+	first = storage.insert_entry("02.01.2025", [["text", "eins"], ["calc", "*Aufträge", "Müller#12.5"]], TOUR)
+	third = storage.insert_entry("03.01.2025", [["text", "drei"]], TERMIN)
+	assert _texts(storage) == ["eins", "zwei", "drei"]
+	assert _texts(storage, dt.date(2025, 1, 3), dt.date(2025, 1, 3)) == ["zwei", "drei"]
+	assert storage.get_entry(first).settings == TOUR
+
+	assert storage.update_entry(second, [["text", "neu"]], TOUR) == "2025-01-03"
+	assert storage.delete_entry(third) == "2025-01-03"
+	assert storage.update_entry(third, [["text", "x"]], TOUR) is None
+	assert storage.delete_entry(third) is None
+	assert _texts(storage) == ["eins", "neu"]
+	assert storage.day_totals(dt.date(2025, 1, 1), dt.date(2025, 1, 31)) == {"2025-01-02": 1250, "2025-01-03": 0}
+
+	hits = storage.search("mul")
+	assert [hit.id for hit in hits] == [first] and "[Müller" in hits[0].snippet
+	assert storage.search("") == []
+
+def test_transactions_undo_and_writer(storage):
+	"""A failed transaction leaves nothing behind; undo and the writer work on any backend."""
+	with pytest.raises(RuntimeError):
+		with storage.transaction():
+			storage.insert_entry("02.01.2025", [["text", "weg"]], TOUR)
+			raise RuntimeError
+	assert _texts(storage) == []
+
+	entry_id = storage.insert_entry("02.01.2025", [["text", "alt"]], TOUR)
+	storage.update_entry(entry_id, [["text", "neu"]], TOUR)
+	assert storage.journal.undo().image["text_memory"] == [["text", "alt"]]
+	assert _texts(storage) == ["alt"]
+	assert storage.journal.redo().op == "update"
+	assert _texts(storage) == ["neu"]
+
+	app = QCoreApplication.instance() or QCoreApplication([])
+	writer = EntryWriter(storage)
+	ticket = writer.insert("03.01.2025", [["text", "später"]], TERMIN)
+	writer.delete(entry_id)
+	writer.close()
+	assert ticket.error is None and _texts(storage) == ["später"]
+
+def test_create_storage_selects_backend(tmp_path):
+	"""Memory storages share their data; unknown backends are rejected."""
+	storage = create_storage(backend="memory")
+	try:
+		storage.insert_entry("02.01.2025", [["text", "geteilt"]], TOUR)
+		assert _texts(create_storage(backend="memory")) == ["geteilt"]
+		assert storage.db is None
+	finally:
+		drop_memory_data("default")
+	with pytest.raises(ValueError):
+		create_storage(backend="csv")
@@ -1,20 +1,17 @@
-import sqlite3, json, pytest
-from unittest.mock import patch, MagicMock
-from team_planer.core import storage_manager as sm_mod
+import sqlite3, json, types, pytest
+import datetime as dt
 from team_planer.core.storage_manager import StorageManager
 
 @pytest.fixture
-def temp_db(tmp_path, monkeypatch):
+def temp_db(tmp_path):
 	"""Creates temporary SQLite DB and initialize schema."""
-	test_db = tmp_path / "test_storage.db"
-	monkeypatch.setattr(sm_mod, "DB_FILE", str(test_db))
-	sm = StorageManager()
+	sm = StorageManager(db_file=str(tmp_path / "test_storage.db"), shared=False)
 	sm.create_db()
 	return sm
 
-def test_create_db_creates_table():
+def test_create_db_creates_table(temp_db):
 	"""Ensure 'user_inputs' table is created."""
-	connection = sqlite3.connect(sm_mod.DB_FILE)
+	connection = sqlite3.connect(temp_db.db.path)
 	cursor = connection.cursor()
 	cursor.execute("""
 				SELECT name FROM sqlite_master
@@ -35,18 +32,22 @@ def test_store_and_load_user_input(temp_db):
 		date, text_memory, settings
 	)
 
-	connection = sqlite3.connect(sm_mod.DB_FILE)
+	connection = sqlite3.connect(sm.db.path)
 	cursor = connection.cursor()
 	cursor.execute("""
-		SELECT date, settings, text
-		FROM user_inputs WHERE date=?""",
+		SELECT e.date, t.settings, b.kind, i.label
+		FROM user_inputs AS e
+		JOIN input_types AS t ON t.id = e.type_id
+		JOIN entry_blocks AS b ON b.entry_id = e.id
+		JOIN entry_items AS i ON i.block_id = b.id
+		WHERE e.date=?""",
 		(date,))
 	row = cursor.fetchone()
 	
 	assert row is not None
 	assert row[0] == date
 	assert json.loads(row[1]) == settings
-	assert json.loads(row[2]) == text_memory
+	assert row[2:] == ("text", "test_header")
 
 	connection.close()
 
@@ -57,14 +58,12 @@ def test_delete_user_input(temp_db):
 	settings = ["set_1", "set_2", "set_3", "set_4"]
 	
 	sm = temp_db
-	sm.store_user_input(
+	entry_id = sm.store_user_input(
 		date, text_memory, settings
 	)
-	sm.delete_user_input(
-		date, text_memory
-	)
+	sm.delete_user_input(entry_id)
 
-	connection = sqlite3.connect(sm_mod.DB_FILE)
+	connection = sqlite3.connect(sm.db.path)
 	cursor = connection.cursor()
 	cursor.execute("""
 			SELECT * FROM user_inputs WHERE date=?""",
@@ -75,30 +74,109 @@ def test_delete_user_input(temp_db):
 
 	connection.close()
 
-def test_load_user_date_creates_user_input(temp_db, monkeypatch):
-	"""Verify loading user data instantiates UserInput and calls '_show_input'."""
+def test_delete_and_update_by_id_keep_duplicates(temp_db):
+	"""Identical entries on one day are separate rows; only the addressed one changes."""
 	date = "01.01.2025"
 	text_memory = [["text", "test_header"]]
 	settings = ["set_1", "set_2", "set_3", "set_4"]
-	dummy_layout = object()
-	dummy_spacer = object()
-	dfc = {"01.01.2025": (dummy_layout, dummy_spacer)}
 
 	sm = temp_db
-	sm.store_user_input(
-		date, text_memory, settings
-	)
+	first = sm.store_user_input(date, text_memory, settings)
+	second = sm.store_user_input(date, text_memory, settings)
+	third = sm.store_user_input(date, text_memory, settings)
+	sm.delete_user_input(first)
+	assert sm.update_user_input(second, [["text", "changed"]], settings)
 
-	test_user_input = MagicMock()
-	monkeypatch.setattr("team_planer.ui_elements.clickable_widgets.UserInput", test_user_input)
-	
-	sm.load_user_data(dfc)
-
-	test_user_input.assert_called_once_with(
-		date,
-		text_memory,
-		settings,
-		dummy_layout,
-		dummy_spacer
-	)
-	test_user_input.return_value._show_input.assert_called_once()
\ No newline at end of file
+	entries = list(sm.iter_entries(date, date))
+	assert [(e.id, e.text_memory) for e in entries] == [
+		(second, [["text", "changed"]]), (third, text_memory)
+	]
+	assert sm.db.execute("SELECT COUNT(*) FROM entry_blocks").fetchone()[0] == 2
+
+def test_iter_entries_streams_decoded_entries(temp_db):
+	"""Range reads yield decoded entries in date order without any widgets."""
+	settings = ["set_1", "set_2", "set_3", "set_4"]
+	sm = temp_db
+	late = sm.store_user_input("03.01.2025", [["text", "late"]], settings)
+	early = sm.store_user_input("01.01.2025", [["text", "early"]], settings)
+	sm.store_user_input("05.01.2025", [["text", "outside"]], settings)
+
+	entries = sm.iter_entries("01.01.2025", dt.date(2025, 1, 4))
+
+	assert isinstance(entries, types.GeneratorType)
+	entries = list(entries)
+	assert [e.id for e in entries] == [early, late]
+	assert entries[0].text_memory == [["text", "early"]]
+	assert entries[0].settings == settings
+	assert entries[1].iso_date == "2025-01-03"
+
+def test_connection_is_shared_and_uses_wal(temp_db):
+	"""All managers of one file share a tuned, long-lived connection."""
+	other = StorageManager(db_file=temp_db.db.path, shared=False)
+
+	assert other.db is temp_db.db
+	assert temp_db.db.connection() is other.db.connection()
+	assert temp_db.db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+	assert temp_db.db.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+def test_worker_threads_release_their_connection(temp_db):
+	"""A finished worker thread leaves no connection behind."""
+	import threading
+	db = temp_db.db
+	before = len(db.connections)
+	during = []
+
+	def work():
+		try:
+			db.execute("SELECT COUNT(*) FROM user_inputs").fetchone()
+			during.append(len(db.connections))
+		finally:
+			db.release()
+	thread = threading.Thread(target=work)
+	thread.start()
+	thread.join()
+	assert during == [before + 1] and len(db.connections) == before
+	db.release()
+	assert db.execute("SELECT 1").fetchone() == (1,)
+
+def test_search_follows_store_update_and_delete(temp_db):
+	"""The full-text index is kept in sync with every write."""
+	settings = ["Tour", 1, "#ccc", "#ccc"]
+	sm = temp_db
+	first = sm.store_user_input("01.01.2025", [["worker", "*Monteure", "Müller"]], settings)
+	second = sm.store_user_input("08.01.2025", [["text", "*Fahrzeug", "M-AB 12"]], settings)
+
+	assert [hit.id for hit in sm.search("mull")] == [first]
+	assert [hit.id for hit in sm.search("Fahrzeug m ab 12")] == [second]
+	# Too short for a prefix: only the exact word "M" matches, not "Müller"
+	assert [hit.id for hit in sm.search("m")] == [second]
+
+	sm.update_user_input(first, [["worker", "*Monteure", "Schmidt"]], settings)
+	sm.delete_user_input(second)
+
+	assert sm.search("Müller") == []
+	assert sm.search("M-AB") == []
+	hits = sm.search("schmidt")
+	assert [(hit.id, hit.date) for hit in hits] == [(first, "01.01.2025")]
+	assert "[Schmidt]" in hits[0].snippet
+
+def test_input_types_are_versioned_and_restyled(temp_db):
+	"""Entries share one row per settings; a restyle changes all of them at once."""
+	sm = temp_db
+	old = ["Tour", 1, "#fff", "#000"]
+	new = ["Tour", 1, "#f00", "#000"]
+	first = sm.insert_entry("01.01.2025", [["text", "a"]], old)
+	second = sm.insert_entry("02.01.2025", [["text", "b"]], old)
+	third = sm.insert_entry("03.01.2025", [["text", "c"]], new)
+	assert sm.db.execute("SELECT name, version FROM input_types ORDER BY id").fetchall() == [("Tour", 1), ("Tour", 2)]
+	entries = list(sm.iter_entries("01.01.2025", "03.01.2025"))
+	assert entries[0].settings is entries[1].settings and entries[2].settings == new
+
+	type_id = sm.db.execute("SELECT type_id FROM user_inputs WHERE id = ?", (first,)).fetchone()[0]
+	assert sm.restyle_input_type(type_id, ["Tour", 1, "#0f0", "#000"]) == 2
+	assert sm.get_entry(second).settings == ["Tour", 1, "#0f0", "#000"]
+	assert sm.restyle_input_type(type_id, new) == 2
+	assert {sm.get_entry(entry_id).settings[2] for entry_id in (first, second, third)} == {"#f00"}
+	assert sm.db.execute("SELECT COUNT(*) FROM input_types").fetchone()[0] == 1
+	with pytest.raises(ValueError):
+		sm.restyle_input_type(type_id, new)
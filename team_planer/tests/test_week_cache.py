@@ -0,0 +1,31 @@
+from team_planer.core.week_cache import WeekCache
+
+def test_least_recently_used_week_is_evicted():
+	"""The cache keeps at most max_weeks, dropping the oldest access."""
+	cache = WeekCache(max_weeks=2)
+	cache.put("2025-01-06", ["a"], cache.version)
+	cache.put("2025-01-13", ["b"], cache.version)
+	cache.get("2025-01-06")
+	cache.put("2025-01-20", ["c"], cache.version)
+
+	assert cache.get("2025-01-13") is None
+	assert cache.get("2025-01-06") == ["a"]
+	assert cache.info()["hits"] == 2 and cache.info()["misses"] == 1
+
+def test_invalidate_drops_only_written_weeks():
+	"""A write invalidates its own week and refuses results read before it."""
+	cache = WeekCache()
+	cache.put("2025-01-06", ["a"], cache.version)
+	cache.put("2025-01-13", ["b"], cache.version)
+	version = cache.version
+	cache.invalidate(["2025-01-08"])
+
+	assert not cache.contains("2025-01-06")
+	assert cache.contains("2025-01-13")
+	assert cache.put("2025-01-06", ["old"], version) is False
+
+def test_week_range_covers_partial_weeks():
+	"""Ranges map to the Mondays of every week they touch."""
+	assert WeekCache.week_range("2025-01-08", "2025-01-20") == [
+		"2025-01-06", "2025-01-13", "2025-01-20"
+	]
@@ -0,0 +1,66 @@
+import pytest
+from PySide6.QtCore import QCoreApplication
+from team_planer.core.week_loader import WeekLoader
+
+@pytest.fixture
+def loader(sm):
+	"""WeekLoader on a temporary database with two entries."""
+	app = QCoreApplication.instance() or QCoreApplication([])
+	sm.store_user_input("01.01.2025", [["text", "a"]], ["type", 1, "#ccc", "#ccc"])
+	sm.store_user_input("02.01.2025", [["text", "b"]], ["type", 1, "#ccc", "#ccc"])
+	loader = WeekLoader(sm)
+	results = []
+	loader.entriesLoaded.connect(lambda request, entries: results.append((request, entries)))
+	yield app, loader, results
+	loader.wait()
+
+def test_entries_are_delivered_through_signal(loader):
+	"""Loaded entries arrive on the GUI thread with the request tag."""
+	app, week_loader, results = loader
+	week_loader.request("01.01.2025", "07.01.2025", "week")
+	week_loader.wait()
+	app.processEvents()
+
+	assert len(results) == 1
+	request, entries = results[0]
+	assert request == "week"
+	assert [e.text_memory for e in entries] == [[["text", "a"]], [["text", "b"]]]
+
+def test_cancel_drops_stale_results(loader):
+	"""Only requests issued after the last cancel are delivered."""
+	app, week_loader, results = loader
+	week_loader.request("01.01.2025", "01.01.2025", "old")
+	week_loader.cancel()
+	week_loader.request("02.01.2025", "02.01.2025", "new")
+	week_loader.wait()
+	app.processEvents()
+
+	assert [request for request, _ in results] == ["new"]
+
+def test_cached_weeks_are_served_without_the_pool(loader):
+	"""After a load and its prefetch, neighbouring weeks are cache hits."""
+	app, week_loader, results = loader
+	week_loader.request("30.12.2024", "05.01.2025", "first")
+	week_loader.wait()
+	app.processEvents()
+	hits = week_loader.cache.info()["hits"]
+
+	week_loader.request("06.01.2025", "12.01.2025", "next")
+
+	assert [request for request, _ in results] == ["first", "next"]
+	assert week_loader.cache.info()["hits"] == hits + 1
+
+def test_pool_threads_do_not_keep_connections(loader):
+	"""Every load closes its thread's connection, so retired pool threads leave none behind."""
+	app, week_loader, results = loader
+	db = week_loader.storage_manager.db
+	before = len(db.connections)
+	for month in range(1, 10):
+		# A fresh thread for every load, as after the pool's idle expiry
+		week_loader.pool.setExpiryTimeout(0)
+		week_loader.request(f"01.0{month}.2025", f"07.0{month}.2025", month)
+		week_loader.wait()
+		app.processEvents()
+
+	assert len(results) == 9
+	assert len(db.connections) <= before
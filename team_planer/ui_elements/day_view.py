@@ -5,9 +5,11 @@ from PySide6.QtGui import QFont
 from team_planer.core.date_manager import DateManager
 from team_planer.core.config_manager import ConfigManager
 from team_planer.core.time_manager import TimeManager
+from team_planer.core.config_watcher import get_config_watcher
+from team_planer.core.theme_manager import get_theme_manager, set_style_property
+from team_planer.core.reports import format_money
 from team_planer.ui_elements.clickable_widgets import ClickableLabel
 from team_planer.windows.input_window import InputWindow
-from team_planer.windows.warning_window import PopupWindow
 
 class DayView(QWidget):
 	"""Represents a single day in the weekly calender view."""
@@ -22,10 +24,12 @@ class DayView(QWidget):
 		self.config_manager = ConfigManager()
 		self.date_manager = DateManager()
 		self.time_manager = TimeManager()
+		get_theme_manager()
 
 		self.day = day
 		self.date = date
 		self.tday = self.date_manager.get_date_str()
+		self.total_cents = 0
 
 		self._setup_logic()
 		self._load_config()
@@ -35,97 +39,65 @@ class DayView(QWidget):
 
 
 	def _setup_logic(self) -> None:
-		self.time_manager.signal.connect(self._setup_frame)
+		self.time_manager.signal.connect(self._update_today)
+		get_config_watcher().configChanged.connect(self._on_config_changed)
 
 
-	def _load_config(self) -> None:
-		"""Loads the config values"""
-		config = self.config_manager.load_config()
-
-		self.font_size = config["display-window_font-size"]
-		self.font_family = config["display-window_font-family"]
-		self.font_weight = config["display-window_font-weight"]
+	def _on_config_changed(self, changed: frozenset) -> None:
+		"""
+		Restyle the day in place after a config change.
 
-		self.content_frame_border_width = config["display-window_content-frame_border-width"]
-		self.content_frame_border_radius = config["display-window_content-frame_border-radius"]
-		self.content_frame_border_color = config["display-window_content-frame_border-color"]
-		self.tday_content_frame_border_color = config["display-window_tday-content-frame_border-color"]
+		Args:
+			changed (frozenset): Config keys that changed.
+		"""
+		if not any(key.startswith("display-window_") for key in changed):
+			return
+		self._load_config()
+		self._apply_header_font()
+		self._apply_margins()
 
-		self.header_frame_border_width = config["display-window_header-frame_border-width"]
-		self.header_frame_border_radius = config["display-window_header-frame_border-radius"]
-		self.header_frame_border_color = config["display-window_header-frame_border-color"]
-		self.tday_header_frame_border_color = config["display-window_tday-header-frame_border-color"]
-		self.header_frame_padding = config["display-window_header-frame_padding"]
 
-		self.header_to_content_margin = config["display-window_header-content_margin"]
-		self.frame_to_content_margin = config["display-window_frame-content_margin"]
-		self.content_to_content_margin = config["display-window_content-content_margin"]
+	def _load_config(self) -> None:
+		"""Loads the config values"""
+		self.display = self.config_manager.load_settings().display
 
 
 	def _setup_layout(self) -> None:
 		"""Configure main and padding"""
-		left = self.frame_to_content_margin[0]
-		top = self.frame_to_content_margin[1]
-		right = self.frame_to_content_margin[2]
-		bottom = self.frame_to_content_margin[3]
-
 		self.frame_layout = QVBoxLayout(self.frame)
-		self.frame_layout.setContentsMargins(left, top, right, bottom)
-		self.frame_layout.setSpacing(self.content_to_content_margin)
 
 		main_layout = QVBoxLayout(self)
 		main_layout.addWidget(self.frame)
 
 		self.padding_layout = QVBoxLayout()
-		self.padding_layout.setContentsMargins(0, 0, 0, self.header_to_content_margin)
+		self._apply_margins()
+
+
+	def _apply_margins(self) -> None:
+		"""Apply the configured frame and header margins."""
+		left, top, right, bottom = self.display.frame_content_margin
+
+		self.frame_layout.setContentsMargins(left, top, right, bottom)
+		self.frame_layout.setSpacing(self.display.content_content_margin)
+		self.padding_layout.setContentsMargins(0, 0, 0, self.display.header_content_margin)
 
 
 	def _setup_frame(self) -> None:
-		"""Create and style main frame; highlight if today."""
+		"""Create main frame, styled by the application stylesheet."""
 		self.frame = QFrame(self)
+		self.frame.setObjectName("DayFrame")
 		self.frame.setFrameShape(QFrame.Box)
 
-		if self.tday == self.date:
-			color = self.tday_content_frame_border_color
-		else:
-			color = self.content_frame_border_color
-
-		self.frame.setStyleSheet(f"""
-						   border: {self.content_frame_border_width}px solid;
-						   border-radius: {self.content_frame_border_radius}px;
-						   border-color: {color};
-		""")
-
 
 	def _setup_header(self) -> None:
 		"""Create clickable header with weekday and date."""
-		family = self.font_family
-		size = self.font_size
-		weight = QFont.Normal
-		if self.font_weight == "Bold":
-			weight = QFont.Bold
-		elif self.font_weight == "Regular" or self.font_weight == "Normal":
-			pass
-		else:
-			self._show_warning(error_code="E005")
-		
 		label = ClickableLabel(f"{self.day}\n{self.date}")
+		label.setObjectName("DayHeader")
 		label.setAlignment(Qt.AlignCenter)
-		label.setFont(QFont(family, size, weight))
-
-		if self.tday == self.date:
-			color = self.tday_header_frame_border_color
-		else:
-			color = self.header_frame_border_color
-
-		label.setStyleSheet(f"""
-					  padding: {self.header_frame_padding}px;
-					  border: {self.header_frame_border_width}px solid;
-					  border-radius: {self.header_frame_border_radius}px;
-					  border-color: {color};
-		""")
-		
 		label.clicked.connect(self._label_clicked)
+		self.header_label = label
+		self._apply_header_font()
+		self._update_today()
 
 		self.spacer = QSpacerItem(
 			20, 40, QSizePolicy.Minimum, QSizePolicy.Expanding
@@ -136,6 +108,38 @@ class DayView(QWidget):
 		self.frame_layout.addLayout(self.padding_layout)
 
 
+	def set_total(self, cents: int) -> None:
+		"""
+		Show the day's revenue below the date; nothing while it is zero.
+
+		Args:
+			cents (int): Revenue of the day in cents.
+		"""
+		if cents == self.total_cents:
+			return
+		self.total_cents = cents
+		text = f"{self.day}\n{self.date}"
+		if cents:
+			text += f"\n{format_money(cents)}"
+		self.header_label.setText(text)
+
+
+	def _apply_header_font(self) -> None:
+		"""Apply the configured font to the header label."""
+		weight = QFont.Bold if self.display.font_weight == "Bold" else QFont.Normal
+		self.header_label.setFont(
+			QFont(self.display.font_family, self.display.font_size, weight)
+		)
+
+
+	def _update_today(self) -> None:
+		"""Flag frame and header as today; the stylesheet picks the color."""
+		self.tday = self.date_manager.get_date_str()
+		today = "true" if self.tday == self.date else "false"
+		set_style_property(self.frame, "today", today)
+		set_style_property(self.header_label, "today", today)
+
+
 	def _label_clicked(self) -> None:
 		"""Open input window for this day."""
 		input_window = InputWindow(
@@ -153,16 +157,6 @@ class DayView(QWidget):
 			list: [date (str), frame_layout (QVBoxLayout), spacer (QSpacerItem)]
 		"""
 		return [self.date, self.frame_layout, self.spacer]
-	
-	def _show_warning(self, error_code: str) -> None:
-		"""
-		Show an error popup.
-
-		Args:
-			error_code (str): Error code identifier.
-		"""
-		error_window = PopupWindow("error", error_code, self)
-		error_window.exec()
   
 
 if __name__ == "__main__":
@@ -1,10 +1,15 @@
-import re
 from PySide6.QtWidgets import QLabel, QVBoxLayout
 from PySide6.QtCore import Qt
 from team_planer.ui_elements.clickable_widgets import ClickableFrame
 from team_planer.core.config_manager import ConfigManager
+from team_planer.core.config_watcher import get_config_watcher
+from team_planer.core.theme_manager import get_theme_manager, set_style_property
+from team_planer.core.entries import blocks_from_text_memory, text_memory_from_blocks
 from team_planer.windows.edit_window import EditWindow
 
+# Entries currently shown in any window, for in-place undo/redo
+_live_inputs = set()
+
 
 class UserInput:
 	"""Creates a clickable frame showing stored user input or calcultions."""
@@ -15,7 +20,9 @@ class UserInput:
 			text_memory: list[list[str]],
 			settings: list[str],
 			layout: object,
-			spacer: object
+			spacer: object,
+			entry_id: object = None,
+			blocks: list | None = None
 	):
 		"""
 		Args:
@@ -24,19 +31,22 @@ class UserInput:
 			settings (list[str]): Input configuration (color, type info).
 			layout (object): Target layout where the frame is added.
 			spacer (object): Spacer item from parent layout.
+			entry_id (int | WriteTicket | None): Database row id of the entry,
+				or the ticket of its pending insert.
+			blocks (list[Block] | None): Decoded content; text_memory may be
+				None when given.
 		"""
-
-		print(text_memory)
-
 		self.config_manager = ConfigManager()
 
 		self.date = date
-		self.text_memory = text_memory
+		self.entry_id = entry_id
+		self._text_memory = text_memory
+		self.blocks = blocks if blocks is not None else blocks_from_text_memory(text_memory)
 		self.setting = settings
 		self.layout = layout
 		self.spacer = spacer
 		self.label_memory = []
-		self.income_sum = 0
+		self.income_cents = 0
 		self.worker_sum = 0
 		self.income_goal_per_worker = 0
 		# type(goal) == str: means there is no calc_input to handle
@@ -47,118 +57,129 @@ class UserInput:
 		self._setup_frame()
 		self._setup_input_content()
 		self._setup_style()
-	
-	def _load_config(self) -> None:
-		config = self.config_manager.load_config()
+		self._setup_logic()
+		_live_inputs.add(self)
 
-		self.font_size = config["user-input_font-size"]
-		self.font_family = config["user-input_font-family"]
-		self.font_weight = config["user-input_font-weight"]
+	@staticmethod
+	def find(entry_id: int) -> list["UserInput"]:
+		"""
+		Args:
+			entry_id (int): Database row id.
+
+		Returns:
+			list[UserInput]: Shown entries with that id, including ones whose
+				pending insert has been written since.
+		"""
+		return [user_input for user_input in _live_inputs if user_input.row_id == entry_id]
 
-		self.inner_border_width = config["user-input_inner-border-width"]
-		self.inner_border_radius = config["user-input_inner-border-radius"]
-		self.inner_border_color = config["user-input_inner-border-color"]
+	@staticmethod
+	def shown_in(layout: object) -> list["UserInput"]:
+		"""
+		Args:
+			layout (object): Layout of a day.
 
-		self.outer_border_width = config["user-input_outer-border-width"]
-		self.outer_border_radius = config["user-input_outer-border-radius"]
-		self.outer_border_color = config["user-input_outer-border-color"]
+		Returns:
+			list[UserInput]: Entries shown in that day.
+		"""
+		return [user_input for user_input in _live_inputs if user_input.layout is layout]
+
+	@property
+	def row_id(self) -> int | None:
+		"""Database row id, None while the insert is still queued."""
+		return getattr(self.entry_id, "entry_id", self.entry_id)
+
+	def remove(self) -> None:
+		"""Take the entry off its day."""
+		_live_inputs.discard(self)
+		if self.layout:
+			self.layout.removeWidget(self.frame)
+		self.frame.setParent(None)
+		self.frame.deleteLater()
+		padding = getattr(self, "padding_layout", None)
+		if padding is not None:
+			if self.layout:
+				self.layout.removeItem(padding)
+			padding.deleteLater()
+
+	def _setup_logic(self) -> None:
+		"""Follow config changes for as long as the frame exists."""
+		watcher = get_config_watcher()
+		watcher.configChanged.connect(self._on_config_changed)
+
+		def disconnect():
+			_live_inputs.discard(self)
+			try:
+				watcher.configChanged.disconnect(self._on_config_changed)
+			except (RuntimeError, TypeError):
+				pass
+		self.frame.destroyed.connect(disconnect)
+
+	def _on_config_changed(self, changed: frozenset) -> None:
+		"""
+		Restyle the entry in place after a config change.
 
-		self.calc_true_color = config["user-input_calc-true-color"]
-		self.calc_false_color = config["user-input_calc-false-color"]
+		Args:
+			changed (frozenset): Config keys that changed.
+		"""
+		if "input_goal_per_worker" not in changed:
+			return
+		self._load_config()
+		if isinstance(self.goal, int):
+			self.goal = self.income_goal_per_worker * self.worker_sum
+		self._setup_style()
+	
+	def _load_config(self) -> None:
+		settings = self.config_manager.load_settings()
 
-		self.income_goal_per_worker = config["input_goal_per_worker"]
+		self.income_goal_per_worker = settings.input_goal_per_worker
 		
 
 	def _setup_frame(self) -> None:
 		"""Create clickable frame and connect click signal."""
 		self.frame = ClickableFrame()
 		self.frame_layout = QVBoxLayout(self.frame)
+		self.frame.setObjectName("EntryFrame")
 		self.frame.clicked.connect(lambda: self._click())
-		self.frame.setStyleSheet(f"""
-			border: {self.outer_border_width}px solid;
-			border-radius: {self.outer_border_radius}px;
-			border-color: {self.outer_border_color};
-		""")
+
+	@property
+	def text_memory(self) -> list[list[str]]:
+		"""Content in the editor's nested list form, built on first use."""
+		if self._text_memory is None:
+			self._text_memory = text_memory_from_blocks(self.blocks)
+		return self._text_memory
 
 	def _setup_input_content(self) -> None:
 		"""Add labels for text or numeric input data."""
-		for idx_block in range(len(self.text_memory)):
+		for block in self.blocks:
 			label = QLabel()
+			label.setObjectName("EntryLabel")
+			label.setAlignment(Qt.AlignCenter)
 			self.label_memory.append(label)
 			self.frame_layout.addWidget(label)
 
-			for idx_text in range(1, len(self.text_memory[idx_block])):
-				if self.text_memory[idx_block][idx_text].startswith("*"):
-					add_text = self.text_memory[idx_block][idx_text][1:]
-				else:
-					add_text = self.text_memory[idx_block][idx_text]
-
-				cur_text = label.text()
-
-				if re.match(r"text$", self.text_memory[idx_block][0]):
-					if idx_text == 1:
-						label.setText(add_text)
-					else:
-						label.setText(cur_text + "\n" + add_text)
-
-				if re.match(r"worker$", self.text_memory[idx_block][0]):
-					# counts amount of workers by removing the input_type and header
-					self.worker_sum = len(self.text_memory[idx_block]) - 2
-					if idx_text == 1:
-						label.setText(add_text)
-					else:
-						label.setText(cur_text + "\n" + add_text)
-
-				elif re.match(r"calc#", self.text_memory[idx_block][0]):
-					if self.worker_sum > 0:
-						self.goal = self.income_goal_per_worker * self.worker_sum
-#					self.goal = int(self.text_memory[idx_block][0].split("#")[1])
-					if idx_text == 1:
-						label.setText(add_text)
-					else:
-						text_num = self.text_memory[idx_block][idx_text].split("#")
-						add_text = text_num[0]
-						str_num = text_num[1]
-						if "," in str_num:
-							str_num = str_num.replace(",", ".")
-						num = float(str_num)
-						label.setText(cur_text + "\n" + add_text)
-						self.income_sum += num
-
-				label.setStyleSheet(f"""
-					font-size: {self.font_size}px;
-					border: {self.inner_border_width}px solid;
-					border-radius: {self.inner_border_radius}px;
-					border-color: {self.inner_border_color};
-				""")
-				label.setAlignment(Qt.AlignCenter)
+			lines = [item.label for item in block.items]
+			if block.header is not None:
+				lines.insert(0, block.header)
+			label.setText("\n".join(lines))
+
+			if block.kind == "worker":
+				self.worker_sum = len(block.items)
+			elif block.kind == "calc":
+				if self.worker_sum > 0:
+					self.goal = self.income_goal_per_worker * self.worker_sum
+				self.income_cents += sum(item.amount_cents or 0 for item in block.items)
 		
 	def _setup_style(self) -> None:
 		"""Apply color styling based on settings and calc results."""
+		theme = get_theme_manager()
 		if isinstance(self.goal, int):
-			if self.income_sum >= self.goal:
-				outer_color = self.calc_true_color
-			elif self.income_sum < self.goal:
-				outer_color = self.calc_false_color
+			set_style_property(self.frame, "calc", str(self.income_cents >= self.goal * 100).lower())
 		elif isinstance(self.goal, str):
-			outer_color = self.setting[3]
-
-		self.frame.setStyleSheet(f"""
-			border: {self.outer_border_width}px solid;
-			border-color: {outer_color};
-			border-radius: {self.outer_border_radius}px;
-		""")
+			set_style_property(self.frame, "borderColor", theme.color_key(self.setting[3]))
 
-		inner_color = self.setting[2]
+		inner_color = theme.color_key(self.setting[2])
 		for label in self.label_memory:
-			label.setStyleSheet(f"""
-				font-size: {self.font_size}px;
-				font-family: {self.font_family};
-				font-weight: {self.font_weight};
-				border: {self.inner_border_width}px solid;
-				border-color: {inner_color};
-				border-radius: {self.inner_border_radius}px;
-			""")
+			set_style_property(label, "borderColor", inner_color)
 
 	def _show_input(self) -> None:
 		"""Insert the frame into the layout, keeping spacer order."""
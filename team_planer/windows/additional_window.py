@@ -12,8 +12,7 @@ class AdditionalWindow(MainWindow):
 			start_week (int): Starting week index for this window.
 		"""
 		config_manager = ConfigManager()
-		config = config_manager.load_config()
-		weeks_shown = config["weeks_shown"]
+		weeks_shown = config_manager.load_settings().weeks_shown
 
 		super().__init__(weeks_shown, is_main_window=False, start_week=start_week+2)
 
@@ -8,8 +8,11 @@ from PySide6.QtCore import Qt
 from PySide6.QtGui import QShortcut, QKeySequence
 from team_planer.ui_elements.custom_input_bind import CustomLineEdit
 from team_planer.ui_elements.clickable_widgets import OutputLable
-from team_planer.core.storage_manager import StorageManager
+from team_planer.core.entry_writer import get_entry_writer
+from team_planer.core.entries import parse_calc_line
 from team_planer.core.config_manager import ConfigManager
+from team_planer.core.config_watcher import get_config_watcher
+from team_planer.core.theme_manager import get_theme_manager, set_style_property
 from team_planer.windows.warning_window import PopupWindow
 
 class EditWindow(QWidget):
@@ -36,12 +39,13 @@ class EditWindow(QWidget):
 			padding (object): Padding layout of the input frame.
 		"""
 		super().__init__()
-		self.storage_manager = StorageManager(self)
 		self.config_manager = ConfigManager()
+		get_theme_manager()
 
 		self.user_input = user_input
 		self.date = date
-		self.text_memory = text_memory
+		# Edited on a copy, the shown (and cached) entry only changes on save
+		self.text_memory = copy.deepcopy(text_memory)
 		self.past_text_memory = copy.deepcopy(text_memory)
 		self.settings = settings
 		self.layout = layout
@@ -68,26 +72,44 @@ class EditWindow(QWidget):
 		self._setup_display_content()
 		self._setup_edit_content()
 		self._setup_style_sheet(obj=self.dispay_label_memory[0], focused=True)
+		self._setup_logic()
 
 
-	def _load_configs(self):
-		config = self.config_manager.load_config()
+	def _setup_logic(self) -> None:
+		"""Follow config changes until the window is closed or destroyed."""
+		watcher = get_config_watcher()
+		watcher.configChanged.connect(self._on_config_changed)
+
+		def disconnect():
+			try:
+				watcher.configChanged.disconnect(self._on_config_changed)
+			except (RuntimeError, TypeError):
+				pass
+		self._disconnect_config = disconnect
+		self.destroyed.connect(disconnect)
 
-		self.font_size = config["edit-window_font-size"]
-		self.font_family = config["edit-window_font-family"]
-		self.font_weight = config["edit-window_font-weight"]
+	def _on_config_changed(self, changed: frozenset) -> None:
+		"""
+		Restyle the window in place after a config change.
 
-		self.inner_border_width = config["edit-window_inner-border-width"]
-		self.inner_border_radius = config["edit-window_inner-border-radius"]
-		self.inner_border_color = config["edit-window_inner-border-color"]
+		Args:
+			changed (frozenset): Config keys that changed.
+		"""
+		if not any(key.startswith("edit-window_") for key in changed):
+			return
+		self._load_configs()
+		left, top, right, bottom = self.content_margin
+		for label in self.dispay_label_memory + self.edit_label_memory:
+			label.setContentsMargins(left, top, right, bottom)
 
-		self.outer_border_width = config["edit-window_outer-border-width"]
-		self.outer_border_radius = config["edit-window_outer-border-radius"]
-		self.outer_border_color = config["edit-window_outer-border-color"]
+	def _load_configs(self):
+		settings = self.config_manager.load_settings().edit_window
 
-		self.focus_color = config["edit-window_focused-content-color"]
+		self.font_size = settings.font_size
+		self.font_family = settings.font_family
+		self.font_weight = settings.font_weight
 
-		self.content_margin = config["edit-window_content-margin"]
+		self.content_margin = settings.content_margin
 
 
 	def _setup_window(self) -> None:
@@ -183,33 +205,27 @@ class EditWindow(QWidget):
 
 
 	def _setup_style_sheet(self, obj: object, focused: bool = False, inner: bool = True) -> None:
+		"""
+		Tag obj for the application stylesheet.
+
+		Args:
+			obj (QWidget): Frame or label to style.
+			focused (bool, optional): Highlight as the focused label.
+			inner (bool, optional): Inner label (True) or outer frame (False).
+		"""
 		if inner:
-			if focused:
-				color = self.focus_color
-			else:
-				color = self.inner_border_color
-			obj.setStyleSheet(f"""
-				border: {self.inner_border_width}px solid;
-				border-radius: {self.inner_border_radius}px;
-				border-color: {color};
-			""")
+			obj.setObjectName("EditLabel")
+			set_style_property(obj, "focused", "true" if focused else "false")
 		else:
-			obj.setStyleSheet(f"""
-				border: {self.outer_border_width}px solid;
-				border-radius: {self.outer_border_radius}px;
-				border-color: {self.outer_border_color};
-			""")
+			obj.setObjectName("EditFrame")
 
 
 	def _delete_user_input(self) -> None:
 		"""Delete input from storage and remove from UI."""
 		result = self._show_warning("warning", 0)
 		if result:
-			self.storage_manager.delete_user_input(self.date, self.text_memory)
-			if self.user_input.layout:
-				self.user_input.layout.removeWidget(self.user_input.frame)
-			self.user_input.frame.setParent(None)
-			self.user_input.frame.deleteLater()
+			get_entry_writer().delete(self.user_input.entry_id)
+			self.user_input.remove()
 			self.close()
 
 
@@ -219,25 +235,22 @@ class EditWindow(QWidget):
 		for i in range(len(self.text_memory)):
 			if re.match(r"calc", self.text_memory[i][0]):
 				for k in range(2, len(self.text_memory[i])):
-					pattern = r".*#\d+(?:[,.]\d{2})?$"
-					if not re.match(pattern, self.text_memory[i][k]):
+					try:
+						parse_calc_line(self.text_memory[i][k])
+					except ValueError:
 						self._show_warning(popup_type="error", text_code=1)
 						return
-		self.storage_manager.delete_user_input(self.date, self.past_text_memory)
-		if self.user_input.layout:
-			self.user_input.layout.removeWidget(self.user_input.frame)
-		self.user_input.frame.setParent(None)
-		self.user_input.frame.deleteLater()
-		self.padding.deleteLater()
+		get_entry_writer().update(self.user_input.entry_id, self.text_memory, self.settings)
+		self.user_input.remove()
 		changed_user_input = UserInput(
 			self.date,
 			self.text_memory,
 			self.settings,
 			self.layout,
-			self.spacer
+			self.spacer,
+			entry_id=self.user_input.entry_id
 		)
 		changed_user_input._show_input()
-		self.storage_manager.store_user_input(self.date, self.text_memory, self.settings)
 		self.close()
 
 
@@ -421,9 +434,12 @@ class EditWindow(QWidget):
 			if not re.match(r"\S", text):
 				self._show_warning(popup_type="error", text_code=2)
 				return
-			if re.match(r"calc", self.text_memory[self.display_focus][0]) and not re.match(r".*#\d+(?:[,.]\d{2})?$", text):
-				self._show_warning(popup_type="error", text_code=1)
-				return
+			if re.match(r"calc", self.text_memory[self.display_focus][0]):
+				try:
+					parse_calc_line(text)
+				except ValueError:
+					self._show_warning(popup_type="error", text_code=1)
+					return
 			label.setText(text)
 			self.text_memory[self.display_focus][self.edit_focus+1] = text
 			self._delete_cur_input_view()
@@ -457,6 +473,7 @@ class EditWindow(QWidget):
 	def closeEvent(self, event) -> None:
 		"""Clean up on close."""
 		self.text_memory = self.past_text_memory
+		self._disconnect_config()
 		del self
 		event.accept()
 
@@ -0,0 +1,109 @@
+import threading
+import datetime as dt
+from PySide6.QtWidgets import (
+	QWidget, QFormLayout, QDateEdit, QComboBox, QPushButton, QLabel, QFileDialog
+)
+from PySide6.QtCore import Qt, QDate, Signal
+from team_planer.core.theme_manager import get_theme_manager
+from team_planer.core.exporter import export
+
+# (label, format, file filter) in menu order
+EXPORT_CHOICES = (
+	("CSV", "csv", "CSV (*.csv)"),
+	("JSON Lines", "jsonl", "JSON Lines (*.jsonl)"),
+	("iCalendar (Termine)", "ics", "iCalendar (*.ics)"),
+)
+
+
+class ExportWindow(QWidget):
+	"""Exports a date range to a file on a background thread."""
+
+	_finished = Signal(int, str)
+	_failed = Signal(object)
+
+	def __init__(self, main_window: object):
+		"""
+		Args:
+			main_window (MainWindow): Window whose storage is exported.
+		"""
+		super().__init__()
+		get_theme_manager()
+		self.storage_manager = main_window.storage_manager
+		self.thread = None
+
+		self._setup_window()
+		self._setup_layout()
+		self._finished.connect(self._on_finished)
+		self._failed.connect(self._on_failed)
+
+	def _setup_window(self) -> None:
+		"""Configure size, title, and always-on-top behavior."""
+		self.resize(360, 180)
+		self.setWindowFlags(Qt.WindowStaysOnTopHint)
+		self.setWindowTitle("Export")
+
+	def _setup_layout(self) -> None:
+		"""Date range and format above the export button."""
+		layout = QFormLayout(self)
+		today = QDate.currentDate()
+
+		self.start_input = QDateEdit(QDate(today.year(), 1, 1))
+		self.start_input.setCalendarPopup(True)
+		layout.addRow("From", self.start_input)
+
+		self.end_input = QDateEdit(today)
+		self.end_input.setCalendarPopup(True)
+		layout.addRow("To", self.end_input)
+
+		self.format_input = QComboBox()
+		for label, export_format, file_filter in EXPORT_CHOICES:
+			self.format_input.addItem(label, export_format)
+		layout.addRow("Format", self.format_input)
+
+		self.export_button = QPushButton("Export…")
+		self.export_button.clicked.connect(self._on_export)
+		layout.addRow(self.export_button)
+
+		self.status_label = QLabel()
+		layout.addRow(self.status_label)
+
+	def _on_export(self) -> None:
+		"""Ask for the target file and start the export."""
+		label, export_format, file_filter = EXPORT_CHOICES[self.format_input.currentIndex()]
+		start = self.start_input.date().toPython()
+		end = self.end_input.date().toPython()
+		path, _ = QFileDialog.getSaveFileName(
+			self, "Export", f"teamplaner_{start:%Y%m%d}-{end:%Y%m%d}.{export_format}", file_filter
+		)
+		if not path:
+			return
+		self.export_button.setEnabled(False)
+		self.status_label.setText("Exporting…")
+		self.thread = threading.Thread(
+			target=self._run, args=(start, end, path, export_format), name="Export", daemon=True
+		)
+		self.thread.start()
+
+	def _run(self, start: dt.date, end: dt.date, path: str, export_format: str) -> None:
+		try:
+			count = export(self.storage_manager, start, end, path, export_format)
+		except Exception as ex:
+			self._failed.emit(ex)
+			return
+		finally:
+			# This thread ends here; its connection would stay open otherwise
+			if self.storage_manager.db is not None:
+				self.storage_manager.db.release()
+		self._finished.emit(count, path)
+
+	def _on_finished(self, count: int, path: str) -> None:
+		self.export_button.setEnabled(True)
+		self.status_label.setText(f"{count} entries exported to {path}")
+
+	def _on_failed(self, error: Exception) -> None:
+		self.export_button.setEnabled(True)
+		self.status_label.setText(f"Export failed: {error}")
+
+
+if __name__ == "__main__":
+	pass
@@ -9,8 +9,11 @@ from team_planer.windows.warning_window import PopupWindow
 from team_planer.ui_elements.custom_input_bind import CustomLineEdit
 from team_planer.ui_elements.user_input import UserInput
 from team_planer.ui_elements.clickable_widgets import OutputLable
-from team_planer.core.storage_manager import StorageManager
+from team_planer.core.entry_writer import get_entry_writer
+from team_planer.core.entries import parse_calc_line, format_cents
 from team_planer.core.config_manager import ConfigManager
+from team_planer.core.config_watcher import get_config_watcher
+from team_planer.core.theme_manager import get_theme_manager, set_style_property
 
 class InputWindow(QWidget):
 	"""Popup for entering and managing user input from specific day."""
@@ -31,7 +34,7 @@ class InputWindow(QWidget):
 		"""
 		super().__init__()
 		self.config_manager = ConfigManager()
-		self.storage_manager = StorageManager(self)
+		get_theme_manager()
 
 		self.day = day
 		self.date = date
@@ -52,46 +55,68 @@ class InputWindow(QWidget):
 		self._setup_spacer()
 		self._setup_shortcuts()
 		self._setup_input_view([""])
+		self._setup_logic()
+
+	def _setup_logic(self) -> None:
+		"""Follow config changes until the window is closed or destroyed."""
+		watcher = get_config_watcher()
+		watcher.configChanged.connect(self._on_config_changed)
+
+		def disconnect():
+			try:
+				watcher.configChanged.disconnect(self._on_config_changed)
+			except (RuntimeError, TypeError):
+				pass
+		self._disconnect_config = disconnect
+		self.destroyed.connect(disconnect)
+
+	def _on_config_changed(self, changed: frozenset) -> None:
+		"""
+		Restyle the window in place after a config change.
+
+		Args:
+			changed (frozenset): Config keys that changed.
+		"""
+		if not any(key.startswith("input-window_") for key in changed):
+			return
+		self._load_configs()
+		if "input-window_input-types" in changed:
+			self.drop_bar.blockSignals(True)
+			current = self.drop_bar.currentText()
+			self.drop_bar.clear()
+			self.drop_bar.addItems(list(self.input_types))
+			self.drop_bar.setCurrentText(current)
+			self.drop_bar.blockSignals(False)
+		left, top, right, bottom = self.content_margin
+		for label in self.label_memory:
+			label.setContentsMargins(left, top, right, bottom)
 	
 	def _load_configs(self):
-		config = self.config_manager.load_config()
-
-		self.input_types = config["input-window_input-types"]
-		self.first_input_type = config["input-window_first-input-type"]
-
-		self.font_size = config["input-window_font-size"]
-		self.font_family = config["input-window_font-family"]
-		self.font_weight = config["input-window_font-weight"]
-
-		self.inner_border_width = config["input-window_inner-border-width"]
-		self.inner_border_radius = config["input-window_inner-border-radius"]
-		self.inner_border_color = config["input-window_inner-border-color"]
+		settings = self.config_manager.load_settings().input_window
 
-		self.outer_border_width = config["input-window_outer-border-width"]
-		self.outer_border_radius = config["input-window_outer-border-radius"]
-		self.outer_border_color = config["input-window_outer-border-color"]
+		self.input_types = settings.input_types
+		self.first_input_type = settings.first_input_type
 
-		self.focus_color = config["input-window_focus-content-color"]
+		self.font_size = settings.font_size
+		self.font_family = settings.font_family
+		self.font_weight = settings.font_weight
 
-		self.content_margin = config["input-window_content-margin"]
+		self.content_margin = settings.content_margin
 
 	def _setup_style_sheet(self, obj: object, focused: bool = False, inner: bool = True):
+		"""
+		Tag obj for the application stylesheet.
+
+		Args:
+			obj (QWidget): Frame or label to style.
+			focused (bool, optional): Highlight as the focused label.
+			inner (bool, optional): Inner label (True) or outer frame (False).
+		"""
 		if inner:
-			if focused:
-				color = self.focus_color
-			else:
-				color = self.inner_border_color
-			obj.setStyleSheet(f"""
-				border: {self.inner_border_width}px solid;
-				border-radius: {self.inner_border_radius}px;
-				border-color: {color};
-			""")
+			obj.setObjectName("InputLabel")
+			set_style_property(obj, "focused", "true" if focused else "false")
 		else:
-			obj.setStyleSheet(f"""
-				border: {self.outer_border_width}px solid;
-				border-radius: {self.outer_border_radius}px;
-				border-color: {self.outer_border_color};
-			""")
+			obj.setObjectName("InputFrame")
 
 	def _setup_window(self) -> None:
 		"""Configure size, title, and always-on-top behavior."""
@@ -124,9 +149,7 @@ class InputWindow(QWidget):
 	def _setup_text_input(self) -> None:
 		"""Add main text input with Enter/Delete signals."""
 		self.text_input = CustomLineEdit()
-		self.text_input.setStyleSheet("""
-			background-color: #121212;
-		""")
+		self.text_input.setObjectName("InputField")
 		self.text_input.returnPressed.connect(self._on_return)
 		self.text_input.deletePressed.connect(self._on_delete)
 		self.row2.addWidget(self.text_input)
@@ -134,10 +157,8 @@ class InputWindow(QWidget):
 	def _setup_drop_bar(self) -> None:
 		"""Add dropdown for selecting input types."""
 		self.drop_bar = QComboBox()
-		self.drop_bar.addItems(self.input_types)
-		self.drop_bar.setStyleSheet("""
-			background-color: #121212;
-		""")
+		self.drop_bar.addItems(list(self.input_types))
+		self.drop_bar.setObjectName("InputField")
 		self.drop_bar.currentTextChanged.connect(self._setup_input_view)
 		self.row2.addWidget(self.drop_bar)
 
@@ -168,14 +189,15 @@ class InputWindow(QWidget):
 		"""
 		if input_type == [""]:
 			input_type = self.first_input_type
-		self.cur_input_struct = self.input_types[input_type]
+		self.cur_input_type = self.input_types[input_type]
 		self._clear_content()
-		label_count = len(self.cur_input_struct) - 1
+		label_count = len(self.cur_input_type.fields)
 		self.label_pointer = [0, label_count]
 
 		for i in range(label_count):
-			self.text_memory.append([self.cur_input_struct[i+1][1]])
-			cur_header = self.cur_input_struct[i+1][0]
+			field = self.cur_input_type.fields[i]
+			self.text_memory.append([field.kind])
+			cur_header = field.header
 			if cur_header == "_":
 				label = OutputLable(output=i)
 				label.outputEmitted.connect(self._on_label_pressed)
@@ -216,37 +238,21 @@ class InputWindow(QWidget):
 				label.setText(entry_text)
 			self.text_memory[self.label_pointer[0]].append(entry_text)
 		elif re.match(r"calc", entry_type):
-			pattern = r".*#\d+(?:[,.]\d{1,2})?$"
-			if re.match(pattern, entry_text):
-				text_num_list = entry_text.split("#")
-				text = text_num_list[0]
-				num = text_num_list[1]
-				if "," in num:
-					num = num.replace(",", ".")				
-				pre_calc_len = len(str(self.calc)) + 1			
-				self.calc += float(num)
-				self.calc = round(self.calc, 2)
-				calc_str = str(num)
-				if re.match(r"\d+\.\d{2}$", calc_str):
-					pass
-				elif re.match(r"\d+\.\d{1}$", calc_str):
-					calc_str = calc_str + "0"
-				elif re.match(r"\d+", calc_str):
-					calc_str = calc_str + ".00"
-				if re.match(r"\d+\.\d{2}$", num):
-					disp_num = num.replace(".", ",") + "€"
-				elif re.match(r"\d+\.\d{1}$", num):
-					disp_num = num.replace(".", ",") + "0€"
-				elif re.match(r"\d+$", num):
-					disp_num = num + ",00€"
-				if len(self.text_memory[self.label_pointer[0]]) > 1:
-					label.setText(cur_text + "\n" + text + " -> " + disp_num)
-				else:
-					label.setText(text + " -> " + num)
-				self.text_memory[self.label_pointer[0]].append(text + "#" + calc_str)
-			else:
+			try:
+				item = parse_calc_line(entry_text)
+			except ValueError:
 				self._show_warning(popup_type="error", error_code=3)
 				return
+			text = item.label
+			calc_str = format_cents(item.amount_cents)
+			self.calc += item.amount_cents / 100
+			self.calc = round(self.calc, 2)
+			disp_num = calc_str.replace(".", ",") + "€"
+			if len(self.text_memory[self.label_pointer[0]]) > 1:
+				label.setText(cur_text + "\n" + text + " -> " + disp_num)
+			else:
+				label.setText(text + " -> " + calc_str)
+			self.text_memory[self.label_pointer[0]].append(text + "#" + calc_str)
 		self.text_input.clear()
 
 	def _on_delete(self) -> None:
@@ -258,7 +264,7 @@ class InputWindow(QWidget):
 			del_text_len = len(del_text)			
 			if re.match(r"calc", self.text_memory[self.label_pointer[0]][0]):				
 				del_text_len += 4
-				self.calc -= float(del_text.split("#")[1])
+				self.calc -= parse_calc_line(del_text).amount_cents / 100
 				self.calc = round(self.calc, 2)
 			if len(self.text_memory[self.label_pointer[0]]) > 1:
 				label.setText(cur_text[:len(cur_text)-del_text_len-1])
@@ -271,21 +277,20 @@ class InputWindow(QWidget):
 			if len(l) <= 1:
 				self._show_warning(popup_type="error", error_code=4)
 				return
-		settings = self.cur_input_struct[0]
+		settings = list(self.cur_input_type.settings)
+		# Shown right away; the writer commits in the background and reports
+		# failures to the main window
+		ticket = get_entry_writer().insert(self.date, self.text_memory, settings)
 		user_input = UserInput(
 						 self.date,
 						 self.text_memory,
 						 settings,
 						 self.target_layout,
-						 self.target_spacer
+						 self.target_spacer,
+						 entry_id=ticket
 						 )
 		user_input._show_input()
-		self.storage_manager.store_user_input(
-										settings=settings,
-										text_memory=self.text_memory,
-										date=self.date
-										)
-		self._setup_input_view(self.cur_input_struct[0][0])
+		self._setup_input_view(self.cur_input_type.name)
 		
 	def _clear_memory(self, same_type: bool) -> None:
 		"""
@@ -357,6 +362,11 @@ class InputWindow(QWidget):
 		error_window = PopupWindow(popup_type, error_code, self)
 		error_window.exec()
 
+	def closeEvent(self, event) -> None:
+		"""Stop following config changes once closed."""
+		self._disconnect_config()
+		event.accept()
+
 
 if __name__ == "__main__":
 	pass
\ No newline at end of file
@@ -1,14 +1,29 @@
-from PySide6.QtWidgets import QMainWindow, QHBoxLayout, QWidget
-from PySide6.QtGui import QKeySequence, QShortcut, Qt
+import time
+import sqlite3
+import threading
+import datetime as dt
+from PySide6.QtWidgets import QMainWindow, QHBoxLayout, QWidget, QFileDialog, QMessageBox
+from PySide6.QtGui import QKeySequence, QShortcut, QAction, Qt
+from PySide6.QtCore import Signal
 from team_planer.ui_elements.day_view import DayView
+from team_planer.ui_elements.user_input import UserInput
 from team_planer.core.date_manager import DateManager
-from team_planer.core.storage_manager import StorageManager
+from team_planer.core.storage_backend import create_storage
+from team_planer.core.week_loader import WeekLoader
+from team_planer.core.entry_writer import get_entry_writer
+from team_planer.core.change_watcher import get_change_watcher
+from team_planer.core.backup import get_backup_service
+from team_planer.core.query_stats import get_query_stats
 from team_planer.core.config_manager import ConfigManager
+from team_planer.core.config_watcher import get_config_watcher
 
 
 class MainWindow(QMainWindow):
 	"""Main calendar window showing multiple weeks and days."""
 
+	_integrity_checked = Signal(object)
+	_integrity_failed = Signal(object)
+
 	def __init__(self, weeks_shown: int, is_main_window: bool = True, start_week: int = 0):
 		"""
 		Args:
@@ -17,9 +32,12 @@ class MainWindow(QMainWindow):
 			start_week (int): Starting week offset (0 = current).
 		"""
 		super().__init__()
-		self.storage_manager = StorageManager(self)
+		self.storage_manager = create_storage(self)
 		self.config_manager = ConfigManager()
 		self.date_manager = DateManager()
+		self.week_loader = WeekLoader(self.storage_manager, self)
+		self.week_loader.entriesLoaded.connect(self._on_entries_loaded)
+		self.week_loader.loadFailed.connect(lambda ex: self.storage_manager.show_warning("E004"))
 
 		self.is_main_window = is_main_window
 		self.cur_week = start_week
@@ -31,13 +49,139 @@ class MainWindow(QMainWindow):
 		self._setup_window()
 		self._setup_layouts()
 		self._setup_shortcuts()
+		if self.is_main_window:
+			self._setup_menu()
 		self._setup_weekdays()
 		self._setup_additional_window()
+		get_config_watcher().configChanged.connect(self._on_config_changed)
+		get_entry_writer().writeDone.connect(self._on_write_done)
+		get_change_watcher().datesChanged.connect(self._on_dates_changed)
+		if self.is_main_window:
+			get_entry_writer().writeFailed.connect(self._on_write_failed)
+		if self.storage_manager.db is not None:
+			self._setup_backups()
+
+	def _setup_backups(self) -> None:
+		"""Follow snapshots and restores of the database file."""
+		get_backup_service().restoreDone.connect(self._on_restored)
+		if self.is_main_window:
+			get_backup_service().backupDone.connect(self._on_backup_done)
+			get_backup_service().failed.connect(lambda ex: self.storage_manager.show_warning("E004"))
+
+	def _on_write_done(self, ticket: object) -> None:
+		"""
+		Follow a committed write: day totals, and the entry an undo/redo touched.
+
+		Args:
+			ticket (WriteTicket): The committed write.
+		"""
+		self.refresh_totals()
+		if ticket.kind in ("undo", "redo") and ticket.result is not None:
+			self._apply_journal_step(ticket.result)
+
+	def _apply_journal_step(self, step: object) -> None:
+		"""
+		Patch the one entry changed by an undo or redo, without reloading the week.
+
+		Args:
+			step (JournalStep): Applied step with the entry after the change.
+		"""
+		for user_input in UserInput.find(step.entry_id):
+			connection = self.date_frame_connection.get(user_input.date)
+			if connection is not None and connection[0] is user_input.layout:
+				user_input.remove()
+		if step.image is None or step.image["date"] not in self.date_frame_connection:
+			return
+		layout, spacer = self.date_frame_connection[step.image["date"]]
+		user_input = UserInput(
+			step.image["date"],
+			step.image["text_memory"],
+			step.image["settings"],
+			layout,
+			spacer,
+			entry_id=step.entry_id
+		)
+		user_input._show_input()
+
+	def _on_dates_changed(self, dates: set | None) -> None:
+		"""
+		Reload the shown days another client changed.
+
+		Args:
+			dates (set[str] | None): Changed ISO days, None for all days.
+		"""
+		if dates is None:
+			self._refresh_week_view(0)
+			return
+		changed = {
+			date: frames
+			for date, frames in self.date_frame_connection.items()
+			if DateManager.to_iso_date(date) in dates
+		}
+		if changed:
+			self.load_entries(changed, replace=True)
+
+	def _on_restored(self, path: str) -> None:
+		"""Show the restored snapshot; every day may have changed."""
+		self._on_dates_changed(None)
+
+	def _on_backup_done(self, path: str) -> None:
+		self.statusBar().showMessage(f"Backup saved: {path}", 5000)
+
+	def _on_write_failed(self, ticket: object, error: Exception) -> None:
+		"""
+		Report a failed background write and show the stored state again.
+
+		Args:
+			ticket (WriteTicket): The write that was rolled back.
+			error (Exception): Reason of the failure.
+		"""
+		self.storage_manager.show_warning("E004")
+		self._week_view_change(0)
+
+	def _on_config_changed(self, changed: frozenset) -> None:
+		"""
+		Apply window level config changes without rebuilding unchanged days.
+
+		Args:
+			changed (frozenset): Config keys that changed.
+		"""
+		settings = self.config_manager.load_settings()
+		if "input_goal_per_worker" in changed and self.is_main_window:
+			self.storage_manager.sync_goal(settings.input_goal_per_worker)
+		if "window_title" in changed:
+			self.setWindowTitle(settings.window_title)
+		if "weekday_list" in changed:
+			self.weeks_shown = settings.weeks_shown
+			self._refresh_week_view(0)
+		elif "weeks_shown" in changed:
+			self._resize_week_view(settings.weeks_shown)
+
+	def _resize_week_view(self, weeks_shown: int) -> None:
+		"""
+		Add or remove trailing weeks, keeping the existing days.
+
+		Args:
+			weeks_shown (int): New number of weeks displayed at once.
+		"""
+		days_per_week = len(self.config_manager.load_settings().weekday_list)
+		if weeks_shown < self.weeks_shown:
+			keep = weeks_shown * days_per_week
+			for widget in self.cur_week_widgets[keep:]:
+				self.date_frame_connection.pop(widget.date, None)
+				widget.setParent(None)
+				widget.deleteLater()
+			del self.cur_week_widgets[keep:]
+		else:
+			new_connection = {}
+			for i in range(self.weeks_shown, weeks_shown):
+				new_connection.update(self._setup_week(i))
+			self.load_entries(new_connection)
+		self.weeks_shown = weeks_shown
 	
 	def _setup_window(self) -> None:
 		"""Set window title from config."""
-		config = self.config_manager.load_config()
-		self.setWindowTitle(config["window_title"])
+		self.setWindowTitle(self.config_manager.load_settings().window_title)
 
 	def _setup_layouts(self) -> None:
 		"""Initialize central widget and main horizontal layout."""
@@ -63,10 +207,61 @@ class MainWindow(QMainWindow):
 		shortcut_escape = QShortcut(QKeySequence(Qt.Key_Escape), self)
 		shortcut_escape.activated.connect(self._exit_fullscreen)
 
+		shortcut_search = QShortcut(QKeySequence.Find, self)
+		shortcut_search.activated.connect(self._open_search)
+
+		shortcut_undo = QShortcut(QKeySequence("Ctrl+Z"), self)
+		shortcut_undo.activated.connect(lambda: get_entry_writer().undo())
+
+		shortcut_redo = QShortcut(QKeySequence("Ctrl+Y"), self)
+		shortcut_redo.activated.connect(lambda: get_entry_writer().redo())
+
+	def _setup_menu(self) -> None:
+		"""File menu of the main window."""
+		file_menu = self.menuBar().addMenu("File")
+
+		export_action = QAction("Export…", self)
+		export_action.setShortcut(QKeySequence("Ctrl+E"))
+		export_action.triggered.connect(self._open_export)
+		file_menu.addAction(export_action)
+		if self.storage_manager.db is None:
+			# Nothing on disk to back up
+			return
+		file_menu.addSeparator()
+
+		backup_action = QAction("Backup now", self)
+		backup_action.triggered.connect(get_backup_service().backup_now)
+		file_menu.addAction(backup_action)
+
+		restore_action = QAction("Restore backup…", self)
+		restore_action.triggered.connect(self._restore_backup)
+		file_menu.addAction(restore_action)
+
+		debug_menu = self.menuBar().addMenu("Debug")
+		record_action = QAction("Record query statistics", self)
+		record_action.setCheckable(True)
+		record_action.setChecked(get_query_stats().enabled)
+		record_action.toggled.connect(self._record_query_stats)
+		debug_menu.addAction(record_action)
+
+		stats_action = QAction("Query statistics…", self)
+		stats_action.triggered.connect(self._open_query_stats)
+		debug_menu.addAction(stats_action)
+
+		dump_action = QAction("Save query statistics…", self)
+		dump_action.triggered.connect(self._save_query_stats)
+		debug_menu.addAction(dump_action)
+
+		debug_menu.addSeparator()
+		self.check_action = QAction("Check database…", self)
+		self.check_action.triggered.connect(self._check_integrity)
+		debug_menu.addAction(self.check_action)
+		self._integrity_checked.connect(self._on_integrity_checked)
+		self._integrity_failed.connect(self._on_integrity_failed)
+
 	def _setup_additional_window(self):
 		"""Open additional week display windows from config."""
-		config = self.config_manager.load_config()
-		windows = config["window_shown"]
+		windows = self.config_manager.load_settings().window_shown
 
 		for d in range(windows):
 			if d > 0 and self.is_main_window:
@@ -77,22 +272,36 @@ class MainWindow(QMainWindow):
 	
 	def _setup_weekdays(self) -> None:
 		"""Build and display all DayView widgets for current weeks."""
-		config = self.config_manager.load_config()
-		days = config["weekday_list"]
-
 		for i in range(self.weeks_shown):
-			date_list = self.date_manager.get_date_str_list(week = i + self.cur_week)
-			for j in range(len(days)):
-				date = date_list[j]
-				day_widget = DayView(days[j], date)
-				self.widget_layout.addWidget(day_widget)
-
-				day_view_elements = day_widget.get_elements() 
-				self.date_frame_connection[day_view_elements[0]] = (
-					day_view_elements[1],
-					day_view_elements[2]
-				)
-				self.cur_week_widgets.append(day_widget)
+			self._setup_week(i)
+
+	def _setup_week(self, week: int) -> dict:
+		"""
+		Build the DayView widgets of one displayed week.
+
+		Args:
+			week (int): Index of the week within the window.
+
+		Returns:
+			dict: Date-to-frame connections of the new days.
+		"""
+		days = self.config_manager.load_settings().weekday_list
+		connection = {}
+
+		date_list = self.date_manager.get_date_str_list(week = week + self.cur_week)
+		for j in range(len(days)):
+			date = date_list[j]
+			day_widget = DayView(days[j], date)
+			self.widget_layout.addWidget(day_widget)
+
+			day_view_elements = day_widget.get_elements() 
+			connection[day_view_elements[0]] = (
+				day_view_elements[1],
+				day_view_elements[2]
+			)
+			self.cur_week_widgets.append(day_widget)
+		self.date_frame_connection.update(connection)
+		return connection
 	
 	def _week_view_change(self, val: int) -> None:
 		"""
@@ -115,6 +324,8 @@ class MainWindow(QMainWindow):
 			val (int): Week offset to apply.
 		"""
 		self.cur_week += val
+		# Results for the weeks being replaced are no longer wanted
+		self.week_loader.cancel()
 
 		for widget in self.cur_week_widgets:
 			widget.setParent(None)
@@ -124,7 +335,184 @@ class MainWindow(QMainWindow):
 		self.date_frame_connection.clear()
 		
 		self._setup_weekdays()
-		self.storage_manager.load_user_data(self.date_frame_connection)
+		self.load_entries()
+
+	def load_entries(self, date_frame_connection: dict | None = None, replace: bool = False) -> None:
+		"""
+		Load the stored entries of the given days in the background.
+
+		The days stay empty until the data arrives, see _on_entries_loaded.
+
+		Args:
+			date_frame_connection (dict, optional): Maps a date string to
+				(layout, spacer). Defaults to all displayed days.
+			replace (bool, optional): Remove the entries shown in these days
+				once the new ones arrive.
+		"""
+		if date_frame_connection is None:
+			date_frame_connection = self.date_frame_connection
+		if not date_frame_connection:
+			return
+		iso_dates = {DateManager.to_iso_date(date): date for date in date_frame_connection}
+		self.refresh_totals()
+		self.week_loader.request(
+			iso_dates[min(iso_dates)],
+			iso_dates[max(iso_dates)],
+			(dict(date_frame_connection), replace)
+		)
+
+	def refresh_totals(self) -> None:
+		"""Show the day totals from the precomputed day summaries."""
+		if not self.cur_week_widgets:
+			return
+		iso_dates = [DateManager.to_iso_date(widget.date) for widget in self.cur_week_widgets]
+		try:
+			totals = self.storage_manager.day_totals(
+				dt.date.fromisoformat(min(iso_dates)), dt.date.fromisoformat(max(iso_dates))
+			)
+		except sqlite3.Error:
+			return
+		for widget, iso_date in zip(self.cur_week_widgets, iso_dates):
+			widget.set_total(totals.get(iso_date, 0))
+
+	def _on_entries_loaded(self, request: tuple, entries: list) -> None:
+		"""
+		Build the UserInput widgets of a finished load.
+
+		Args:
+			request (tuple): Days the load was requested for and the replace
+				flag, see load_entries.
+			entries (list[Entry]): Decoded entries in date order.
+		"""
+		started = time.perf_counter()
+		date_frame_connection, replace = request
+		if replace:
+			for layout, spacer in date_frame_connection.values():
+				for user_input in UserInput.shown_in(layout):
+					user_input.remove()
+		skipped = self.storage_manager.skipped
+		for entry in entries:
+			if entry.date not in date_frame_connection:
+				continue
+			layout, spacer = date_frame_connection[entry.date]
+			try:
+				user_input = UserInput(
+					entry.date,
+					None,
+					entry.settings,
+					layout,
+					spacer,
+					entry_id=entry.id,
+					blocks=entry.blocks
+				)
+			except Exception:
+				# Shown nowhere yet; the rest of the week still appears
+				skipped.add(entry.id)
+				continue
+			user_input._show_input()
+		if skipped:
+			self.statusBar().showMessage(
+				f"{len(skipped)} broken entries are not shown, see Debug → Check database…"
+			)
+		stats = get_query_stats()
+		if stats.enabled:
+			stats.record("[week widgets]", time.perf_counter() - started, len(entries))
+
+	def _open_search(self) -> None:
+		"""Show the search window, reusing an open one."""
+		from team_planer.windows.search_window import SearchWindow
+		main_window = getattr(self, "main_window", self)
+		if getattr(main_window, "search_window", None) is None:
+			main_window.search_window = SearchWindow(main_window)
+		main_window.search_window.show()
+		main_window.search_window.raise_()
+		main_window.search_window.activateWindow()
+
+	def _open_export(self) -> None:
+		"""Show the export window, reusing an open one."""
+		from team_planer.windows.export_window import ExportWindow
+		if getattr(self, "export_window", None) is None:
+			self.export_window = ExportWindow(self)
+		self.export_window.show()
+		self.export_window.raise_()
+		self.export_window.activateWindow()
+
+	def _record_query_stats(self, enabled: bool) -> None:
+		"""Turn timing of every SQL statement on or off for this session."""
+		get_query_stats().enabled = enabled
+		if getattr(self, "query_stats_window", None) is not None:
+			self.query_stats_window.refresh()
+
+	def _open_query_stats(self) -> None:
+		"""Show the SQL statistics window, reusing an open one."""
+		from team_planer.windows.query_stats_window import QueryStatsWindow
+		if getattr(self, "query_stats_window", None) is None:
+			self.query_stats_window = QueryStatsWindow()
+		self.query_stats_window.refresh()
+		self.query_stats_window.show()
+		self.query_stats_window.raise_()
+		self.query_stats_window.activateWindow()
+
+	def _save_query_stats(self) -> None:
+		"""Dump the SQL statistics to a JSON file."""
+		from team_planer.windows.query_stats_window import save_query_stats
+		path = save_query_stats(self)
+		if path:
+			self.statusBar().showMessage(f"Query statistics saved to {path}", 5000)
+
+	def _check_integrity(self) -> None:
+		"""Scan all entries on a background thread and quarantine broken ones."""
+		from team_planer.core.integrity import IntegrityScanner
+		scanner = IntegrityScanner(self.storage_manager)
+
+		def run():
+			try:
+				report = scanner.scan()
+			except Exception as ex:
+				self._integrity_failed.emit(ex)
+				return
+			finally:
+				scanner.db.release()
+			self._integrity_checked.emit(report)
+		self.check_action.setEnabled(False)
+		self.statusBar().showMessage("Checking database…")
+		threading.Thread(target=run, name="IntegrityScan", daemon=True).start()
+
+	def _on_integrity_checked(self, report: object) -> None:
+		"""Show the scan summary and redraw without the quarantined entries."""
+		self.check_action.setEnabled(True)
+		self.statusBar().clearMessage()
+		if report.quarantined or self.storage_manager.skipped:
+			# Entries still failing are counted again by the reload
+			self.storage_manager.skipped.clear()
+			self._on_dates_changed(None)
+		QMessageBox.information(self, "Check database", report.summary())
+
+	def _on_integrity_failed(self, error: Exception) -> None:
+		self.check_action.setEnabled(True)
+		self.statusBar().clearMessage()
+		self.storage_manager.show_warning("E004")
+
+	def _restore_backup(self) -> None:
+		"""Pick a snapshot and restore it after a confirmation."""
+		from team_planer.windows.warning_window import PopupWindow
+		service = get_backup_service()
+		path, _ = QFileDialog.getOpenFileName(
+			self, "Restore backup", service.backups().directory, "Backups (*.db)"
+		)
+		if not path:
+			return
+		if PopupWindow("warning", 1, self).exec() == QMessageBox.Ok:
+			service.restore(path)
+
+	def show_date(self, date: str) -> None:
+		"""
+		Move all windows so the week of a date is the first one shown here.
+
+		Args:
+			date (str): Date like "18.09.2025".
+		"""
+		self._week_view_change(DateManager.week_offset(date) - self.cur_week)
 
 	def _toogle_fullscreen(self):
 		"""Toogles between fullscreen mode."""
@@ -0,0 +1,121 @@
+import datetime as dt
+from PySide6.QtWidgets import (
+	QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QLabel,
+	QFileDialog, QHeaderView
+)
+from PySide6.QtCore import Qt
+from team_planer.core.theme_manager import get_theme_manager
+from team_planer.core.query_stats import get_query_stats
+
+# (header, key in QueryStats.snapshot()) in column order
+COLUMNS = (
+	("Statement", "sql"),
+	("Calls", "calls"),
+	("Total ms", "total_ms"),
+	("Mean ms", "mean_ms"),
+	("p95 ms", "p95_ms"),
+	("Max ms", "max_ms"),
+	("Rows", "rows"),
+)
+
+
+def save_query_stats(parent: QWidget) -> str | None:
+	"""
+	Ask for a file and dump the query statistics there as JSON.
+
+	Returns:
+		str | None: The written file, None if cancelled or not writable.
+	"""
+	path, _ = QFileDialog.getSaveFileName(
+		parent, "Save query statistics", f"query_stats_{dt.datetime.now():%Y%m%d_%H%M}.json", "JSON (*.json)"
+	)
+	if not path:
+		return None
+	try:
+		get_query_stats().dump(path)
+	except OSError:
+		return None
+	return path
+
+
+class QueryStatsWindow(QWidget):
+	"""Debug view of the per-statement SQL timings and the slow-query log."""
+
+	def __init__(self):
+		super().__init__()
+		get_theme_manager()
+		self._setup_window()
+		self._setup_layout()
+		self.refresh()
+
+	def _setup_window(self) -> None:
+		"""Configure size, title, and always-on-top behavior."""
+		self.resize(900, 500)
+		self.setWindowFlags(Qt.WindowStaysOnTopHint)
+		self.setWindowTitle("Query statistics")
+
+	def _setup_layout(self) -> None:
+		"""Statement table and slow-query list above the buttons."""
+		layout = QVBoxLayout(self)
+
+		self.summary_label = QLabel()
+		layout.addWidget(self.summary_label)
+
+		self.table = QTableWidget(0, len(COLUMNS))
+		self.table.setHorizontalHeaderLabels([header for header, key in COLUMNS])
+		self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+		self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+		layout.addWidget(self.table, 3)
+
+		layout.addWidget(QLabel("Slow statements"))
+		self.slow_table = QTableWidget(0, 4)
+		self.slow_table.setHorizontalHeaderLabels(["Time", "ms", "Rows", "Statement"])
+		self.slow_table.horizontalHeader().setSectionResizeMode(3, QHeaderView.Stretch)
+		self.slow_table.setEditTriggers(QTableWidget.NoEditTriggers)
+		layout.addWidget(self.slow_table, 1)
+
+		buttons = QHBoxLayout()
+		for label, slot in (("Refresh", self.refresh), ("Reset", self._reset), ("Save as JSON…", self._save)):
+			button = QPushButton(label)
+			button.clicked.connect(slot)
+			buttons.addWidget(button)
+		layout.addLayout(buttons)
+
+	def refresh(self) -> None:
+		"""Show the current numbers."""
+		stats = get_query_stats()
+		snapshot = stats.snapshot()
+		statements = snapshot["statements"]
+		self.table.setRowCount(len(statements))
+		for row, statement in enumerate(statements):
+			for column, (header, key) in enumerate(COLUMNS):
+				item = QTableWidgetItem(str(statement[key]))
+				if column:
+					item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+				else:
+					item.setToolTip(statement[key])
+				self.table.setItem(row, column, item)
+
+		slow = list(reversed(snapshot["slow"]))
+		self.slow_table.setRowCount(len(slow))
+		for row, entry in enumerate(slow):
+			for column, key in enumerate(("time", "ms", "rows", "sql")):
+				self.slow_table.setItem(row, column, QTableWidgetItem(str(entry[key])))
+
+		state = f"slow ≥ {stats.slow_ms} ms" if stats.slow_ms else "slow-query log off"
+		if not stats.enabled:
+			state = "recording off (Debug → Record query statistics)"
+		self.summary_label.setText(f"Since {snapshot['since']} · {len(statements)} statements · {state}")
+
+	def _reset(self) -> None:
+		get_query_stats().reset()
+		self.refresh()
+
+	def _save(self) -> None:
+		path = save_query_stats(self)
+		if path:
+			self.summary_label.setText(f"Saved to {path}")
+
+
+if __name__ == "__main__":
+	pass
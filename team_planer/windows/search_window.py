@@ -0,0 +1,79 @@
+import sqlite3
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLineEdit, QListWidget, QListWidgetItem
+from PySide6.QtCore import Qt, QTimer
+from team_planer.core.theme_manager import get_theme_manager
+
+SEARCH_DELAY_MS = 150
+
+
+class SearchWindow(QWidget):
+	"""Search-as-you-type over all entries; picking a hit shows its week."""
+
+	def __init__(self, main_window: object):
+		"""
+		Args:
+			main_window (MainWindow): Window that jumps to the picked date.
+		"""
+		super().__init__()
+		get_theme_manager()
+		self.main_window = main_window
+		self.storage_manager = main_window.storage_manager
+
+		self._setup_window()
+		self._setup_layout()
+		self._setup_timer()
+
+	def _setup_window(self) -> None:
+		"""Configure size, title, and always-on-top behavior."""
+		self.resize(500, 400)
+		self.setWindowFlags(Qt.WindowStaysOnTopHint)
+		self.setWindowTitle("Search")
+
+	def _setup_layout(self) -> None:
+		"""Search field above the result list."""
+		layout = QVBoxLayout(self)
+
+		self.text_input = QLineEdit()
+		self.text_input.setObjectName("InputField")
+		self.text_input.textChanged.connect(lambda: self.timer.start())
+		self.text_input.returnPressed.connect(self._on_return)
+		layout.addWidget(self.text_input)
+
+		self.result_list = QListWidget()
+		self.result_list.itemActivated.connect(self._on_item_activated)
+		layout.addWidget(self.result_list)
+
+	def _setup_timer(self) -> None:
+		"""Coalesce keystrokes, search once typing pauses."""
+		self.timer = QTimer(self)
+		self.timer.setSingleShot(True)
+		self.timer.setInterval(SEARCH_DELAY_MS)
+		self.timer.timeout.connect(self._search)
+
+	def _search(self) -> None:
+		"""Run the query and list the hits."""
+		self.result_list.clear()
+		try:
+			hits = self.storage_manager.search(self.text_input.text())
+		except sqlite3.Error:
+			self.storage_manager.show_warning("E004")
+			return
+		for hit in hits:
+			snippet = " · ".join(line for line in hit.snippet.splitlines() if line)
+			item = QListWidgetItem(f"{hit.date}   {snippet}")
+			item.setData(Qt.UserRole, hit.date)
+			self.result_list.addItem(item)
+
+	def _on_return(self) -> None:
+		"""Enter searches immediately and jumps to the best hit."""
+		self.timer.stop()
+		self._search()
+		if self.result_list.count():
+			self._on_item_activated(self.result_list.item(0))
+
+	def _on_item_activated(self, item: QListWidgetItem) -> None:
+		self.main_window.show_date(item.data(Qt.UserRole))
+
+
+if __name__ == "__main__":
+	pass
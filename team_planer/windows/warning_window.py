@@ -1,6 +1,6 @@
 from PySide6.QtWidgets import QMessageBox
 from PySide6.QtCore import Qt
-from team_planer.core.config_manager import ConfigManager
+from team_planer.core.config_manager import ConfigManager, DEFAULT_CONFIG
 
 
 class PopupWindow(QMessageBox):
@@ -21,15 +21,17 @@ class PopupWindow(QMessageBox):
 
 	def _setup_window(self) -> None:
 		"""Configurate window title, text, and icon from config."""
-		config = self.config_manager.load_config()
+		settings = self.config_manager.load_settings()
 		if self.popup_type == "error":
 			self.setStandardButtons(QMessageBox.Ok)
-			header = config["Error-Massages"][self.text_code][0]
-			text = config["Error-Massages"][self.text_code][1]
+			header, text = settings.error_messages[self.text_code]
 		elif self.popup_type == "warning":
 			self.setStandardButtons(QMessageBox.Ok | QMessageBox.Cancel)
-			header = config["Warning-Massages"][self.text_code][0]
-			text = config["Warning-Massages"][self.text_code][1]
+			# Config files written before a message was added lack its code
+			messages = settings.warning_messages
+			if self.text_code not in messages:
+				messages = DEFAULT_CONFIG["Warning-Massages"]
+			header, text = messages[self.text_code]
 		self.setWindowFlags(self.windowFlags() | Qt.WindowStaysOnTopHint)
 		self.setIcon(QMessageBox.Warning)
 		self.setWindowTitle(header)